@@ -0,0 +1,121 @@
+# backend/accounts/authentication.py
+# JWTAuthentication with a short-TTL cache of the authenticated user, keyed by
+# user id. simplejwt's stock class loads the user on every request; here the
+# full user (with their Bio id) comes from the cache, and only is_active and
+# the password hash are read from the database. That read runs on every hit,
+# so a deactivation or password change takes effect on the next request even
+# when it skipped signals (QuerySet.update, raw SQL). Entries are also dropped
+# by the save/delete receivers below.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from bio.models import Bio
+
+DEFAULT_USER_AUTH_CACHE_SETTINGS = {
+    "TIMEOUT": 30,  # Seconds a cached user is trusted without a DB read
+    "CACHE_ALIAS": "default",  # Use a shared backend (Redis, Memcached) across workers
+}
+
+
+def get_user_auth_cache_setting(name: str):
+    """Reads a key from settings.USER_AUTH_CACHE, falling back to the defaults above."""
+    return getattr(settings, "USER_AUTH_CACHE", {}).get(
+        name, DEFAULT_USER_AUTH_CACHE_SETTINGS[name]
+    )
+
+
+def _user_key(user_id) -> str:
+    return f"auth_user_{user_id}"
+
+
+def _cache():
+    return caches[get_user_auth_cache_setting("CACHE_ALIAS")]
+
+
+def invalidate_cached_user(user_id) -> None:
+    if user_id is not None:
+        _cache().delete(_user_key(user_id))
+
+
+def get_user_bio_id(user):
+    """
+    The user's Bio id, as loaded alongside the user by CachedJWTAuthentication,
+    or from the database for users authenticated some other way. None if the
+    user has no Bio.
+    """
+    if hasattr(user, "cached_bio_id"):
+        return user.cached_bio_id
+    return Bio.objects.filter(user_id=user.pk).values_list("id", flat=True).first()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that reads the user from the cache. Only active users are
+    ever cached; a hit costs one primary-key read of is_active and the password
+    hash, and the is_active and revoke-token checks run on every request,
+    cached or not. The user carries `cached_bio_id` (see get_user_bio_id).
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        users = self.user_model.objects.filter(**{jwt_settings.USER_ID_FIELD: user_id})
+        key = _user_key(user_id)
+        cache = _cache()
+        user = cache.get(key)
+        if user is not None:
+            # The cached copy is only trusted while these still match the row
+            state = users.values_list("is_active", "password").first()
+            if state != (user.is_active, user.password):
+                cache.delete(key)
+                user = None
+        if user is None:
+            # One query for the user and their Bio id (LEFT JOIN on the reverse one-to-one)
+            user = users.annotate(cached_bio_id=F("bio__id")).first()
+            if user is None:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            if user.is_active:
+                cache.set(key, user, get_user_auth_cache_setting("TIMEOUT"))
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if jwt_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                jwt_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
+
+
+# --- Invalidation ---
+@receiver([post_save, post_delete], sender=get_user_model())
+def invalidate_on_user_change(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+# Only the Bio id is cached, so Bio edits don't invalidate; creation and deletion do
+@receiver(post_save, sender=Bio)
+def invalidate_on_bio_create(sender, instance, created, **kwargs):
+    if created:
+        invalidate_cached_user(instance.user_id)
+
+
+@receiver(post_delete, sender=Bio)
+def invalidate_on_bio_delete(sender, instance, **kwargs):
+    invalidate_cached_user(instance.user_id)
@@ -0,0 +1,47 @@
+# backend/accounts/management/commands/sweep_expired_tokens.py
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.tokens import get_token_blacklist_setting, sweep_expired_tokens
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes expired JWT outstanding/blacklisted tokens in id-ordered batches. "
+        "A batched alternative to flushexpiredtokens; meant to run periodically from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=get_token_blacklist_setting("SWEEP_BATCH_SIZE"),
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="Seconds to sleep between batches.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        verbose = options["verbosity"] > 1
+
+        def report(stats):
+            if verbose:
+                self.stdout.write(
+                    f"Batch {stats['batches']} done: {stats['deleted']} deleted so far."
+                )
+
+        stats = sweep_expired_tokens(
+            batch_size=options["batch_size"], pause=options["pause"], on_batch=report
+        )
+        seconds = stats["seconds"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Deleted {stats['deleted']} expired tokens "
+                f"({stats['blacklisted_deleted']} blacklisted) in {stats['batches']} batches, "
+                f"{seconds:.1f}s ({stats['deleted'] / seconds if seconds else 0:.0f}/s)."
+            )
+        )
@@ -58,27 +58,10 @@ class CustomRegisterSerializer(DefaultRegisterSerializer):
 
     def save(self, request):
         user = super().save(request)
-        # After user is created by the parent's save method,
-        # we generate tokens for this user.
-        # These tokens will be available when to_representation is called.
-        # Note: The default RegisterSerializer.save() returns the user object.
-        # We need to ensure our modifications are compatible or handled correctly.
-        # Storing them on the serializer instance itself is a common way.
-
-        refresh = RefreshToken.for_user(user)
+        # No tokens are minted here: with the token blacklist installed every
+        # mint inserts an OutstandingToken row. CustomRegisterView mints the
+        # one pair per signup and hands it to to_representation via the context.
         self.instance = user  # Set the instance for to_representation
-        # We need to make these available to to_representation or modify data directly
-        # A common way is to set them as attributes on the serializer if to_representation
-        # is not overridden, or on the instance if to_representation accesses instance.
-        # For simplicity, we'll set them on the instance so UserDetailsSerializer can pick them up if customized,
-        # or to_representation can access them.
-
-        # Actually, it's better to prepare the data that will be used by to_representation
-        # or directly return the desired structure if the view uses serializer.data after save.
-        # The RegisterView calls serializer.save(), gets user, then calls get_response_data(user)
-        # which then calls self.get_serializer(user).data.
-        # So, the `to_representation` of *this* serializer (CustomRegisterSerializer) is what matters.
-
         return user  # super().save(request) already returns the user
 
     def to_representation(self, instance):
@@ -103,9 +86,10 @@ class CustomRegisterSerializer(DefaultRegisterSerializer):
         # print(f"[DEBUG] UserDetailsSerializer output (user_data): {user_data}")
         # --- End Debugging ---
 
-        # Generate tokens for the user
-        refresh = RefreshToken.for_user(instance)
-        access_token = str(refresh.access_token)
+        # Reuse the pair CustomRegisterView minted; mint only when used on its own
+        refresh = self.context.get("refresh_token") or RefreshToken.for_user(instance)
+        access = self.context.get("access_token") or refresh.access_token
+        access_token = str(access)
         refresh_token = str(refresh)
 
         return {
@@ -1,3 +1,188 @@
-from django.test import TestCase
+import time
+from datetime import timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from .authentication import CachedJWTAuthentication, _user_key
+from .models import CustomUser
+from .tokens import (
+    clear_blacklist_cache,
+    is_known_blacklisted,
+    remember_blacklisted,
+    sweep_expired_tokens,
+)
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(
+            email="ada@example.com", password="pw12345!x"
+        )
+        self.token = AccessToken.for_user(self.user)
+
+    def authenticate(self):
+        return CachedJWTAuthentication().get_user(self.token)
+
+    def assert_rejected(self):
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_cache_hit(self):
+        with self.assertNumQueries(1):  # User and Bio id
+            user = self.authenticate()
+        self.assertEqual(user.cached_bio_id, self.user.bio.id)
+        self.assertIsNotNone(cache.get(_user_key(self.user.pk)))
+        with self.assertNumQueries(1):  # is_active and password only
+            cached = self.authenticate()
+        self.assertEqual(cached.pk, self.user.pk)
+        self.assertEqual(cached.cached_bio_id, self.user.bio.id)
+
+    def test_save_invalidates(self):
+        self.authenticate()
+        self.user.first_name = "Ada"
+        self.user.save()
+        self.assertIsNone(cache.get(_user_key(self.user.pk)))
+        self.assertEqual(self.authenticate().first_name, "Ada")
+
+    def test_delete_invalidates(self):
+        self.authenticate()
+        self.user.delete()
+        self.assertIsNone(cache.get(_user_key(self.token["user_id"])))
+        self.assert_rejected()
+
+    def test_deactivation_by_save(self):
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+        self.assert_rejected()
+
+    def test_deactivation_by_queryset_update(self):
+        self.authenticate()
+        CustomUser.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertIsNotNone(cache.get(_user_key(self.user.pk)))  # No signal ran
+        self.assert_rejected()
+        self.assertIsNone(cache.get(_user_key(self.user.pk)))
+
+    def test_deactivation_by_raw_sql(self):
+        self.authenticate()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {CustomUser._meta.db_table} SET is_active = %s WHERE id = %s",
+                [
+                    False,
+                    CustomUser._meta.pk.get_db_prep_value(self.user.pk, connection),
+                ],
+            )
+        self.assert_rejected()
+
+    def test_password_change_by_queryset_update(self):
+        self.authenticate()
+        CustomUser.objects.filter(pk=self.user.pk).update(password="changed")
+        self.assertEqual(self.authenticate().password, "changed")
+
+
+class RegistrationTokenTests(TestCase):
+    def test_mints_one_stored_refresh_token(self):
+        response = APIClient().post(
+            "/api/auth/registration/",
+            {
+                "email": "ada@example.com",
+                "password1": "pw12345!x",
+                "password2": "pw12345!x",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        outstanding = OutstandingToken.objects.get()  # Exactly one
+        self.assertEqual(outstanding.user.email, "ada@example.com")
+        self.assertEqual(response.json()["refresh"], outstanding.token)
+        self.assertEqual(response.cookies["refresh-token"].value, outstanding.token)
+
+
+class TokenBlacklistTests(TestCase):
+    def setUp(self):
+        clear_blacklist_cache()
+        self.addCleanup(clear_blacklist_cache)
+        self.user = CustomUser.objects.create_user(
+            email="ada@example.com", password="pw12345!x"
+        )
+        self.client = APIClient()
+
+    def refresh(self, token):
+        return self.client.post(
+            "/api/auth/token/refresh/", {"refresh": str(token)}, format="json"
+        )
+
+    def test_blacklisted_refresh_is_rejected_from_cache(self):
+        token = RefreshToken.for_user(self.user)
+        self.assertEqual(self.refresh(token).status_code, 200)
+        self.assertTrue(
+            BlacklistedToken.objects.filter(token__jti=token["jti"]).exists()
+        )
+        clear_blacklist_cache()  # As in a process that didn't do the rotation
+        with self.assertNumQueries(1):
+            self.assertEqual(self.refresh(token).status_code, 401)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.refresh(token).status_code, 401)
+
+    def test_sweep_deletes_only_expired_rows(self):
+        now = timezone.now()
+
+        def outstanding(jti, expires_in, blacklisted=False):
+            token = OutstandingToken.objects.create(
+                user=self.user,
+                jti=jti,
+                token=jti,
+                expires_at=now + timedelta(hours=expires_in),
+            )
+            if blacklisted:
+                BlacklistedToken.objects.create(token=token)
+
+        outstanding("expired-1", -2)
+        outstanding("expired-2", -1, blacklisted=True)
+        outstanding("expired-3", -1, blacklisted=True)
+        outstanding("live-1", 1)
+        outstanding("live-2", 2, blacklisted=True)
+
+        stats = sweep_expired_tokens(batch_size=2)
+
+        self.assertEqual(stats["deleted"], 3)
+        self.assertEqual(stats["blacklisted_deleted"], 2)
+        self.assertEqual(stats["batches"], 2)
+        self.assertEqual(
+            set(OutstandingToken.objects.values_list("jti", flat=True)),
+            {"live-1", "live-2"},
+        )
+        self.assertEqual(
+            list(BlacklistedToken.objects.values_list("token__jti", flat=True)),
+            ["live-2"],
+        )
+
+    @override_settings(TOKEN_BLACKLIST={"CACHE_SIZE": 3})
+    def test_cache_size_bound(self):
+        exp = int(time.time()) + 60
+        for jti in ("a", "b", "c", "d", "e"):
+            remember_blacklisted(jti, exp)
+        self.assertEqual(
+            [jti for jti in "abcde" if is_known_blacklisted(jti)], ["c", "d", "e"]
+        )
+        remember_blacklisted("c", exp)  # Re-blacklisting moves it to the end
+        remember_blacklisted("f", exp)
+        self.assertEqual(
+            [jti for jti in "cdef" if is_known_blacklisted(jti)], ["c", "e", "f"]
+        )
+
+    def test_expired_entries_are_dropped(self):
+        remember_blacklisted("old", int(time.time()) - 1)
+        self.assertFalse(is_known_blacklisted("old"))
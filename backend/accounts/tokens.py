@@ -0,0 +1,166 @@
+# backend/accounts/tokens.py
+# Refresh-token blacklist upkeep. With ROTATE_REFRESH_TOKENS and
+# BLACKLIST_AFTER_ROTATION every refresh adds OutstandingToken/BlacklistedToken
+# rows, so expired rows are swept in batches, and refresh checks remember
+# recently blacklisted JTIs in-process to skip the database for replays.
+import threading
+import time
+from collections import OrderedDict
+
+from dj_rest_auth.jwt_auth import CookieTokenRefreshSerializer, get_refresh_view
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+DEFAULT_TOKEN_BLACKLIST_SETTINGS = {
+    "SWEEP_BATCH_SIZE": 5000,  # Outstanding tokens deleted per transaction
+    "CACHE_SIZE": 10000,  # Blacklisted JTIs remembered per process
+}
+
+
+def get_token_blacklist_setting(name: str):
+    """Reads a key from settings.TOKEN_BLACKLIST, falling back to the defaults above."""
+    return getattr(settings, "TOKEN_BLACKLIST", {}).get(
+        name, DEFAULT_TOKEN_BLACKLIST_SETTINGS[name]
+    )
+
+
+# --- In-process cache of blacklisted JTIs ---
+# Blacklisting is permanent, so a cached "blacklisted" answer never goes stale;
+# entries are dropped once the token has expired anyway, or by LRU order.
+_blacklisted_jtis = OrderedDict()  # jti -> exp (epoch seconds)
+_blacklisted_lock = threading.Lock()
+
+
+def remember_blacklisted(jti: str, exp: int) -> None:
+    with _blacklisted_lock:
+        _blacklisted_jtis[jti] = exp
+        _blacklisted_jtis.move_to_end(jti)
+        while len(_blacklisted_jtis) > get_token_blacklist_setting("CACHE_SIZE"):
+            _blacklisted_jtis.popitem(last=False)
+
+
+def is_known_blacklisted(jti: str) -> bool:
+    with _blacklisted_lock:
+        exp = _blacklisted_jtis.get(jti)
+        if exp is None:
+            return False
+        if exp < time.time():
+            del _blacklisted_jtis[jti]
+            return False
+        return True
+
+
+def clear_blacklist_cache() -> None:
+    with _blacklisted_lock:
+        _blacklisted_jtis.clear()
+
+
+class CachedBlacklistRefreshToken(RefreshToken):
+    """
+    RefreshToken whose blacklist check consults the JTI cache first, then reads
+    the outstanding row and its blacklist entry in one query. blacklist() reuses
+    that answer and inserts directly instead of running two get_or_creates.
+    """
+
+    _checked = False  # check_blacklist() ran and found the token not blacklisted
+    _outstanding_id = None
+
+    def check_blacklist(self) -> None:
+        jti = self.payload[jwt_settings.JTI_CLAIM]
+        if is_known_blacklisted(jti):
+            raise TokenError(_("Token is blacklisted"))
+        row = (
+            OutstandingToken.objects.filter(jti=jti)
+            .values("id", "blacklistedtoken__id")
+            .first()
+        )
+        if row is not None and row["blacklistedtoken__id"] is not None:
+            remember_blacklisted(jti, self.payload["exp"])
+            raise TokenError(_("Token is blacklisted"))
+        self._checked = True
+        self._outstanding_id = row["id"] if row else None
+
+    def blacklist(self):
+        jti = self.payload[jwt_settings.JTI_CLAIM]
+        if not self._checked:
+            result = super().blacklist()
+        else:
+            try:
+                with transaction.atomic():
+                    outstanding_id = self._outstanding_id
+                    if (
+                        outstanding_id is None
+                    ):  # Rotated tokens aren't recorded until now
+                        outstanding_id = OutstandingToken.objects.create(
+                            jti=jti,
+                            token=str(self),
+                            expires_at=datetime_from_epoch(self.payload["exp"]),
+                        ).id
+                    result = (
+                        BlacklistedToken.objects.create(token_id=outstanding_id),
+                        True,
+                    )
+            except IntegrityError:
+                result = super().blacklist()  # Lost a race with a concurrent refresh
+        remember_blacklisted(jti, self.payload["exp"])
+        return result
+
+
+class CachedBlacklistTokenRefreshSerializer(CookieTokenRefreshSerializer):
+    token_class = CachedBlacklistRefreshToken
+
+
+class CachedBlacklistTokenRefreshView(get_refresh_view()):
+    """dj-rest-auth's cookie-aware refresh view, using CachedBlacklistRefreshToken."""
+
+    serializer_class = CachedBlacklistTokenRefreshSerializer
+
+
+# --- Expiry sweeper ---
+def sweep_expired_tokens(batch_size=None, pause: float = 0, on_batch=None) -> dict:
+    """
+    Deletes expired OutstandingTokens (and, by cascade, their BlacklistedTokens)
+    in id order, one short transaction per batch. An expired token fails
+    verification on its own, so its blacklist entry is no longer needed.
+    `on_batch(stats)` is called after every batch for progress reporting.
+    """
+    batch_size = batch_size or get_token_blacklist_setting("SWEEP_BATCH_SIZE")
+    now = timezone.now()
+    stats = {"deleted": 0, "blacklisted_deleted": 0, "batches": 0, "seconds": 0.0}
+    started = time.monotonic()
+    last_id = 0
+    while True:
+        ids = list(
+            OutstandingToken.objects.filter(id__gt=last_id, expires_at__lte=now)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        last_id = ids[-1]
+        with transaction.atomic():
+            # only("id") keeps the cascade collector from loading token texts
+            _, deleted = OutstandingToken.objects.filter(id__in=ids).only("id").delete()
+        stats["deleted"] += deleted.get(OutstandingToken._meta.label, 0)
+        stats["blacklisted_deleted"] += deleted.get(BlacklistedToken._meta.label, 0)
+        stats["batches"] += 1
+        stats["seconds"] = time.monotonic() - started
+        if on_batch is not None:
+            on_batch(stats)
+        if len(ids) < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+
+    stats["seconds"] = time.monotonic() - started
+    return stats
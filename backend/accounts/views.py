@@ -19,6 +19,12 @@ class CustomRegisterView(RegisterView):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = self.perform_create(serializer)  # This calls serializer.save()
+        # perform_create minted this signup's only token pair (jwt_encode);
+        # serializer.data below reuses it instead of minting another
+        if dj_rest_auth_api_settings.USE_JWT and hasattr(self, "refresh_token"):
+            serializer.context.update(
+                access_token=self.access_token, refresh_token=self.refresh_token
+            )
         headers = self.get_success_headers(serializer.data)
 
         # Use the default get_response_data to get access/refresh tokens in the body
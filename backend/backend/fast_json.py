@@ -0,0 +1,69 @@
+# backend/backend/fast_json.py
+# orjson-backed drop-ins for DRF's JSONRenderer and JSONParser, registered in
+# REST_FRAMEWORK. Output is byte-for-byte what DRF produces with our settings
+# (compact, UTF-8); values orjson would encode differently go through DRF's
+# encoder, and anything orjson can't encode at all is handed back to the stock
+# classes.
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# UUIDs are encoded natively by orjson. Datetimes, dates and times go to DRF's
+# encoder, so their format is DRF's by construction rather than by the two
+# libraries happening to agree (serializer fields hand us strings anyway).
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME
+# Encoded as \u escapes by DRF so the output stays a strict JavaScript subset
+LINE_SEPARATORS = (b"\xe2\x80\xa8", b"\xe2\x80\xa9")
+
+_drf_default = JSONEncoder().default  # Datetimes, lazy strings, Decimal, QuerySet, ...
+
+
+class OrjsonRenderer(JSONRenderer):
+    """
+    JSONRenderer built on orjson. Pretty-printed output (`; indent=` in the
+    Accept header, the browsable API), non-UTF-8 settings, and values orjson
+    rejects (non-string keys, ints over 64 bits) fall back to DRF's renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        renderer_context = renderer_context or {}
+        if (
+            self.ensure_ascii
+            or not self.compact
+            or not self.strict  # DRF would emit NaN; orjson writes null
+            or self.get_indent(accepted_media_type, renderer_context) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_drf_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if LINE_SEPARATORS[0] in ret or LINE_SEPARATORS[1] in ret:
+            ret = ret.replace(LINE_SEPARATORS[0], b"\\u2028").replace(
+                LINE_SEPARATORS[1], b"\\u2029"
+            )
+        return ret
+
+
+class OrjsonParser(JSONParser):
+    """JSONParser built on orjson. orjson rejects NaN/Infinity, matching STRICT_JSON."""
+
+    renderer_class = OrjsonRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if not self.strict or encoding.lower().replace("_", "-") not in (
+            "utf-8",
+            "utf8",
+        ):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
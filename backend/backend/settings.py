@@ -32,6 +32,7 @@ INSTALLED_APPS = [
     "generation",
     "onboarding",
     "jobposts",
+    "search",
     "corsheaders",
     "allauth",
     "allauth.account",
@@ -106,6 +107,8 @@ TIME_ZONE = "UTC"
 USE_I18N = True
 USE_TZ = True
 STATIC_URL = "static/"
+MEDIA_URL = "media/"
+MEDIA_ROOT = BASE_DIR / "media_root"  # Rendered resume PDFs live under here
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # Django Rest Framework Settings
@@ -118,11 +121,22 @@ REST_FRAMEWORK = {
     # Make sure DRF uses Django's session authentication if needed by allauth views
     # or if you mix session and token auth. dj_rest_auth handles token auth.
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # simplejwt's JWTAuthentication with a short-TTL user cache
+        "accounts.authentication.CachedJWTAuthentication",
         # Add session auth if you have views that might use it,
         # or if allauth's non-API views are directly accessed.
         # 'rest_framework.authentication.SessionAuthentication',
     ),
+    # orjson-backed JSON (backend/fast_json.py); the other classes are DRF's defaults
+    "DEFAULT_RENDERER_CLASSES": (
+        "backend.fast_json.OrjsonRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "backend.fast_json.OrjsonParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
 }
 
 AUTHENTICATION_BACKENDS = (
@@ -197,6 +211,65 @@ SIMPLE_JWT = {
     # This is usually handled by dj-rest-auth's configuration rather than simplejwt directly
 }
 
+# Build and verify the GenAI client on a background thread at startup.
+# Leave off for migrate/check/tests; enable for web workers via the environment.
+GENAI_WARM_UP = os.environ.get("GENAI_WARM_UP", "False") == "True"
+
+# Shared AI gateway (generation/services/ai_gateway.py) and its HTTP transport
+AI_GATEWAY = {
+    "BACKEND": "generation.services.ai_gateway.GenAIBackend",
+    "MAX_CONCURRENCY": int(os.environ.get("AI_MAX_CONCURRENCY", "8")),
+    "MODEL_CONCURRENCY": {
+        "gemini-2.5-pro-preview-05-06": 2,  # Slow, rate-limited extraction model
+    },
+    "ACQUIRE_TIMEOUT": 30,  # Seconds a request may wait for a free slot
+    "MAX_CONNECTIONS": 20,
+    "MAX_KEEPALIVE_CONNECTIONS": 10,
+    "KEEPALIVE_EXPIRY": 60,
+    "TIMEOUT_MS": 120000,
+}
+
+# Tailored resume storage (resumes/storage.py)
+RESUME_STORAGE = {
+    # Store generated resumes as diffs against a snapshot of the base resume
+    "DELTA_TAILORED_RESUMES": os.environ.get("RESUME_DELTA_STORAGE", "False") == "True",
+    # Keep edit history for tailored resumes. Off by default: each content edit
+    # then costs three more queries on top of the resume UPDATE (the next version
+    # number, a ResumeVersion INSERT, and pruning past MAX_VERSIONS).
+    "VERSION_HISTORY": os.environ.get("RESUME_VERSION_HISTORY", "False") == "True",
+    "MAX_VERSIONS": 50,
+}
+
+# Upkeep of the JWT blacklist tables (accounts/tokens.py)
+TOKEN_BLACKLIST = {
+    "SWEEP_BATCH_SIZE": 5000,
+    "CACHE_SIZE": 10000,
+}
+
+# Authenticated-user cache for JWT requests (accounts/authentication.py)
+USER_AUTH_CACHE = {
+    "TIMEOUT": 30,
+    "CACHE_ALIAS": "default",
+}
+
+# Reaping of unclaimed anonymous resumes (resumes/cleanup.py)
+ORPHAN_RESUME_CLEANUP = {
+    "TTL_HOURS": int(os.environ.get("ORPHAN_RESUME_TTL_HOURS", "72")),
+    "BATCH_SIZE": 500,
+    "ARCHIVE": False,
+    "ARCHIVE_DIR": "orphaned_resumes",
+}
+
+# Server-side resume PDFs (resumes/pdf.py)
+PDF_RENDER = {
+    "USE_PROCESS_POOL": os.environ.get("PDF_USE_PROCESS_POOL", "True") == "True",
+    "MAX_WORKERS": int(os.environ.get("PDF_MAX_WORKERS", "2")),
+    "MAX_PENDING": 8,  # Renders queued or running before requests get a 503
+    "ACQUIRE_TIMEOUT": 10,
+    "RENDER_TIMEOUT": 60,
+    "STORAGE_DIR": "resume_pdfs",
+}
+
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
     "http://127.0.0.1:3000",
@@ -207,7 +280,12 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_HEADERS = list(default_headers) + [
     "x-demo-token",
+    "if-none-match",
+    "if-match",
+    "prefer",
 ]
+# Let the frontend read ETags for conditional requests
+CORS_EXPOSE_HEADERS = ["ETag", "Content-Disposition"]
 
 CORS_ALLOW_CREDENTIALS = True
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"  # During development
@@ -0,0 +1,42 @@
+import datetime
+import decimal
+import io
+import uuid
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from .fast_json import OrjsonParser, OrjsonRenderer
+
+
+class OrjsonRendererTests(SimpleTestCase):
+    def assert_same_bytes(self, data):
+        self.assertEqual(OrjsonRenderer().render(data), JSONRenderer().render(data))
+
+    def test_matches_drf_renderer(self):
+        utc = datetime.timezone.utc
+        plus_two = datetime.timezone(datetime.timedelta(hours=2))
+        cases = {
+            "aware datetime": datetime.datetime(2024, 5, 1, 9, 30, 15, 123456, utc),
+            "whole-second datetime": datetime.datetime(2024, 5, 1, 9, 30, tzinfo=utc),
+            "offset datetime": datetime.datetime(2024, 5, 1, 9, 30, 0, 5, plus_two),
+            "naive datetime": datetime.datetime(2024, 5, 1, 9, 30, 15, 999999),
+            "date": datetime.date(2024, 5, 1),
+            "time": datetime.time(9, 30, 15, 123456),
+            "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "decimal": decimal.Decimal("12.50"),
+            "line separators": "one\u2028two\u2029three",
+            "lazy string": gettext_lazy("This field is required."),
+            "nested": {"at": [datetime.datetime(2024, 1, 1, tzinfo=utc)], "n": None},
+        }
+        for name, value in cases.items():
+            with self.subTest(name):
+                self.assert_same_bytes({"value": value})
+
+    def test_round_trip(self):
+        body = OrjsonRenderer().render({"summary": "Caf\u00e9\u2028", "work": []})
+        self.assertEqual(
+            OrjsonParser().parse(io.BytesIO(body)),
+            {"summary": "Caf\u00e9\u2028", "work": []},
+        )
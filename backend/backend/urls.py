@@ -2,10 +2,17 @@
 from django.contrib import admin
 from django.urls import path, include
 from accounts.views import CustomRegisterView  # Import the custom view
+from accounts.tokens import CachedBlacklistTokenRefreshView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     # path("api/auth/", include("authentication.urls")), # Old auth URLs
+    # Ahead of dj_rest_auth.urls: same refresh endpoint, cached blacklist checks
+    path(
+        "api/auth/token/refresh/",
+        CachedBlacklistTokenRefreshView.as_view(),
+        name="token_refresh",
+    ),
     path("api/auth/", include("dj_rest_auth.urls")),  # dj-rest-auth main URLs
     path("api/auth/registration/", CustomRegisterView.as_view(), name="rest_register"),
     path(
@@ -15,4 +22,6 @@ urlpatterns = [
     path("api/", include("resumes.urls")),
     path("api/", include("generation.urls")),
     path("api/", include("onboarding.urls")),
+    path("api/", include("search.urls")),
+    path("api/", include("jobposts.urls")),
 ]
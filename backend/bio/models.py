@@ -71,14 +71,33 @@ class SocialProfile(models.Model):
         unique_together = ("bio", "network")
 
 
+# User fields copied into the Bio while any of them is still blank there
+BIO_SYNCED_USER_FIELDS = ("first_name", "last_name", "email")
+
+
 @receiver(post_save, sender=get_user_model())  # Use get_user_model() for sender
-def create_or_update_user_bio(sender, instance, created, **kwargs):
-    bio, bio_created = Bio.objects.get_or_create(user=instance)
-    # CustomUser model has first_name, last_name, email directly
-    if bio_created or not bio.first_name or not bio.last_name or not bio.email:
-        bio.first_name = instance.first_name or bio.first_name
-        bio.last_name = instance.last_name or bio.last_name
-        bio.email = instance.email or bio.email  # instance here is CustomUser
-        bio.save()
-    elif not bio_created:
-        bio.save()
+def create_or_update_user_bio(sender, instance, created, update_fields=None, **kwargs):
+    # Saves that touch none of the synced fields (e.g. update_last_login on
+    # every login) don't need the Bio at all: no SELECT, no UPDATE
+    if update_fields is not None and not set(update_fields) & set(
+        BIO_SYNCED_USER_FIELDS
+    ):
+        return
+    bio, bio_created = Bio.objects.get_or_create(
+        user=instance,
+        # CustomUser model has first_name, last_name, email directly
+        defaults={
+            field: getattr(instance, field) or None for field in BIO_SYNCED_USER_FIELDS
+        },
+    )
+    if bio_created or all(getattr(bio, field) for field in BIO_SYNCED_USER_FIELDS):
+        return
+    # Some Bio field is blank: take the user's values, writing only real changes
+    changed = []
+    for field in BIO_SYNCED_USER_FIELDS:
+        value = getattr(instance, field) or getattr(bio, field)
+        if value != getattr(bio, field):
+            setattr(bio, field, value)
+            changed.append(field)
+    if changed:
+        bio.save(update_fields=changed + ["updated_at"])
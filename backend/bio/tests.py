@@ -1,3 +1,59 @@
+from django.contrib.auth.models import update_last_login
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from accounts.models import CustomUser
+
+from .models import Bio
+
+
+class UserBioSyncQueryTests(TestCase):
+    """The user post_save receiver must not touch the Bio on logins."""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            email="ada@example.com",
+            password="pw12345!x",
+            first_name="Ada",
+            last_name="L",
+        )
+
+    def bio_writes(self, queries):
+        return [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith(("INSERT", "UPDATE"))
+            and '"bio_bio"' in query["sql"]
+        ]
+
+    def test_update_last_login(self):
+        # What simplejwt's UPDATE_LAST_LOGIN and session logins run
+        with self.assertNumQueries(1):  # The user UPDATE only
+            update_last_login(None, self.user)
+
+    def test_login_endpoint(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = APIClient().post(
+                "/api/auth/login/",
+                {"email": "ada@example.com", "password": "pw12345!x"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(
+            [query for query in queries.captured_queries if '"bio_bio"' in query["sql"]]
+        )
+
+    def test_repeat_save_does_not_write_bio(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.user.save()
+        self.assertEqual(self.bio_writes(queries), [])
+
+    def test_name_change_fills_blank_bio_fields(self):
+        Bio.objects.filter(user=self.user).update(last_name=None)
+        self.user.last_name = "Lovelace"
+        with CaptureQueriesContext(connection) as queries:
+            self.user.save(update_fields=["last_name"])
+        self.assertEqual(len(self.bio_writes(queries)), 1)
+        self.assertEqual(Bio.objects.get(user=self.user).last_name, "Lovelace")
@@ -1,6 +1,8 @@
 # backend/bio/views.py
 from rest_framework import viewsets, permissions, generics
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from accounts.authentication import get_user_bio_id
 from .models import Bio, SocialProfile
 from .serializers import (
     BioSerializer,
@@ -33,10 +35,15 @@ class SocialProfileViewSet(viewsets.ModelViewSet):
     serializer_class = SocialProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def get_bio_id(self):
+        # Usually already loaded with the authenticated user, so no Bio query
+        bio_id = get_user_bio_id(self.request.user)
+        if bio_id is None:
+            raise Http404("No Bio matches the given query.")
+        return bio_id
+
     def get_queryset(self):
-        user_bio = get_object_or_404(Bio, user=self.request.user)
-        return SocialProfile.objects.filter(bio=user_bio)
+        return SocialProfile.objects.filter(bio_id=self.get_bio_id())
 
     def perform_create(self, serializer):
-        user_bio = get_object_or_404(Bio, user=self.request.user)
-        serializer.save(bio=user_bio)
+        serializer.save(bio_id=self.get_bio_id())
@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class GenerationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'generation'
+
+    def ready(self):
+        # Optional, non-blocking GenAI health check (off by default so that
+        # management commands and tests never touch the network).
+        if getattr(settings, "GENAI_WARM_UP", False):
+            from .services.ai_client import start_background_warm_up
+
+            start_background_warm_up()
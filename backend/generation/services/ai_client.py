@@ -0,0 +1,106 @@
+# backend/generation/services/ai_client.py
+import os
+import logging
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# --- Shared GenAI Client (created lazily on first use) ---
+_client = None
+_client_lock = threading.Lock()
+_warm_up_thread = None
+
+# Keep-alive connection pool shared by every request made through the client
+DEFAULT_TRANSPORT_SETTINGS = {
+    "MAX_CONNECTIONS": 20,
+    "MAX_KEEPALIVE_CONNECTIONS": 10,
+    "KEEPALIVE_EXPIRY": 60,  # Seconds an idle connection stays open
+    "TIMEOUT_MS": 120000,  # Per-request timeout in milliseconds
+}
+
+
+def get_api_key() -> str | None:
+    """Returns the GenAI API key (GOOGLE_API_KEY first, then GEMINI_API_KEY)."""
+    return os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
+
+
+def _build_http_options():
+    """Builds HttpOptions with a pooled keep-alive httpx transport from settings.AI_GATEWAY."""
+    import httpx
+    from google.genai import types
+
+    configured = getattr(settings, "AI_GATEWAY", {})
+    options = {
+        key: configured.get(key, default)
+        for key, default in DEFAULT_TRANSPORT_SETTINGS.items()
+    }
+    return types.HttpOptions(
+        timeout=options["TIMEOUT_MS"],
+        client_args={
+            "limits": httpx.Limits(
+                max_connections=options["MAX_CONNECTIONS"],
+                max_keepalive_connections=options["MAX_KEEPALIVE_CONNECTIONS"],
+                keepalive_expiry=options["KEEPALIVE_EXPIRY"],
+            )
+        },
+    )
+
+
+def get_client():
+    """
+    Returns the process-wide genai.Client, constructing it on first call.
+    No network call is made here; returns None if the client cannot be configured.
+    """
+    global _client
+    if _client is not None:
+        return _client
+
+    with _client_lock:
+        if _client is None:
+            api_key = get_api_key()
+            if not api_key:
+                logger.error(
+                    "API Key (GOOGLE_API_KEY or GEMINI_API_KEY) not found in environment variables for GenAI Client."
+                )
+                return None
+            try:
+                # Imported here so Django startup doesn't pay for the SDK import
+                from google import genai
+
+                _client = genai.Client(
+                    api_key=api_key, http_options=_build_http_options()
+                )
+                logger.info("GenAI Client configured successfully.")
+            except Exception as e:
+                logger.error(
+                    f"ERROR configuring GenAI Client: {type(e).__name__} - {e}"
+                )
+                return None
+    return _client
+
+
+def verify_client() -> bool:
+    """Health check: lists the first page of models (low cost). Returns True on success."""
+    client = get_client()
+    if client is None:
+        return False
+    try:
+        next(iter(client.models.list()), None)
+        logger.info("Successfully listed models. GenAI Client verified.")
+        return True
+    except Exception as e:
+        logger.error(f"ERROR verifying Google GenAI Client: {type(e).__name__} - {e}")
+        return False
+
+
+def start_background_warm_up() -> None:
+    """Builds and verifies the client on a daemon thread so boot is never blocked."""
+    global _warm_up_thread
+    if _warm_up_thread is not None:
+        return
+    _warm_up_thread = threading.Thread(
+        target=verify_client, name="genai-warm-up", daemon=True
+    )
+    _warm_up_thread.start()
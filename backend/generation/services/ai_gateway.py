@@ -0,0 +1,241 @@
+# backend/generation/services/ai_gateway.py
+# Single in-process gateway for every AI model call. Services call
+# generate_content() here instead of using a genai.Client directly; the gateway
+# caps in-flight requests (process-wide and per model), records queue waits and
+# delegates to a swappable backend (GenAI SDK, or FakeAIBackend in tests).
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .ai_client import get_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GATEWAY_SETTINGS = {
+    "BACKEND": "generation.services.ai_gateway.GenAIBackend",
+    "MAX_CONCURRENCY": 8,  # In-flight AI requests per process
+    "MODEL_CONCURRENCY": {},  # e.g. {"gemini-2.5-pro-preview-05-06": 2}
+    "ACQUIRE_TIMEOUT": 30,  # Seconds a request may queue before being rejected
+}
+
+
+class AIGatewayBusy(RuntimeError):
+    """Raised when no concurrency slot frees up within ACQUIRE_TIMEOUT."""
+
+
+def get_gateway_setting(name: str):
+    """Reads a key from settings.AI_GATEWAY, falling back to the defaults above."""
+    return getattr(settings, "AI_GATEWAY", {}).get(
+        name, DEFAULT_GATEWAY_SETTINGS.get(name)
+    )
+
+
+def _normalize_model_name(model: str) -> str:
+    """'models/gemini-x' and 'gemini-x' share the same per-model limit."""
+    return model.removeprefix("models/")
+
+
+# --- Backends ---
+class GenAIBackend:
+    """Calls Google GenAI through the shared, pooled client."""
+
+    def is_available(self) -> bool:
+        return get_client() is not None
+
+    def generate_content(self, model: str, contents):
+        client = get_client()
+        if client is None:
+            raise RuntimeError("AI Client is not configured properly.")
+        return client.models.generate_content(model=model, contents=contents)
+
+
+class FakeResponse:
+    """Minimal stand-in for a GenerateContentResponse."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.prompt_feedback = None
+        self.candidates = []
+
+
+class FakeAIBackend:
+    """
+    Local backend for tests: returns queued responses without any network access.
+    Pass strings (or callables taking (model, contents)) to `responses`.
+    """
+
+    def __init__(self, responses=None, default_text: str = "{}"):
+        self.responses = list(responses or [])
+        self.default_text = default_text
+        self.calls = []
+
+    def is_available(self) -> bool:
+        return True
+
+    def generate_content(self, model: str, contents):
+        self.calls.append({"model": model, "contents": contents})
+        response = self.responses.pop(0) if self.responses else self.default_text
+        if callable(response):
+            response = response(model, contents)
+        return FakeResponse(response)
+
+
+# --- Metrics ---
+class GatewayMetrics:
+    """Thread-safe counters for queue waits and in-flight requests."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.rejected = 0
+            self.in_flight = 0
+            self.total_wait_seconds = 0.0
+            self.max_wait_seconds = 0.0
+            self.per_model = {}
+
+    def record_wait(self, model: str, wait_seconds: float, acquired: bool) -> None:
+        with self._lock:
+            model_stats = self.per_model.setdefault(
+                model, {"requests": 0, "rejected": 0, "total_wait_seconds": 0.0}
+            )
+            model_stats["total_wait_seconds"] += wait_seconds
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+            if acquired:
+                self.requests += 1
+                self.in_flight += 1
+                model_stats["requests"] += 1
+            else:
+                self.rejected += 1
+                model_stats["rejected"] += 1
+
+    def record_done(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            waited = self.requests + self.rejected
+            return {
+                "requests": self.requests,
+                "rejected": self.rejected,
+                "in_flight": self.in_flight,
+                "avg_wait_seconds": self.total_wait_seconds / waited if waited else 0.0,
+                "max_wait_seconds": self.max_wait_seconds,
+                "per_model": {
+                    model: dict(stats) for model, stats in self.per_model.items()
+                },
+            }
+
+
+# --- Gateway state ---
+_state_lock = threading.Lock()
+_backend = None
+_global_semaphore = None
+_model_semaphores = {}
+metrics = GatewayMetrics()
+
+
+def get_backend():
+    """Returns the configured backend, instantiating it on first use."""
+    global _backend
+    if _backend is None:
+        with _state_lock:
+            if _backend is None:
+                _backend = import_string(get_gateway_setting("BACKEND"))()
+    return _backend
+
+
+def set_backend(backend) -> None:
+    """Swaps the backend in place (e.g. `set_backend(FakeAIBackend([...]))` in tests)."""
+    global _backend
+    with _state_lock:
+        _backend = backend
+
+
+def reset() -> None:
+    """Drops the backend, limiters and metrics so they are rebuilt from settings."""
+    global _backend, _global_semaphore
+    with _state_lock:
+        _backend = None
+        _global_semaphore = None
+        _model_semaphores.clear()
+    metrics.reset()
+
+
+def _get_semaphores(model: str) -> list:
+    global _global_semaphore
+    with _state_lock:
+        if _global_semaphore is None:
+            _global_semaphore = threading.BoundedSemaphore(
+                get_gateway_setting("MAX_CONCURRENCY")
+            )
+        semaphores = [_global_semaphore]
+        model_limit = get_gateway_setting("MODEL_CONCURRENCY").get(model)
+        if model_limit:
+            if model not in _model_semaphores:
+                _model_semaphores[model] = threading.BoundedSemaphore(model_limit)
+            # Per-model slot first, so requests queued on a busy model never
+            # hold process-wide slots that other models could use.
+            semaphores.insert(0, _model_semaphores[model])
+    return semaphores
+
+
+@contextmanager
+def _concurrency_slot(model: str):
+    """Holds a process-wide slot and, if configured, a per-model slot."""
+    semaphores = _get_semaphores(model)
+    deadline = time.monotonic() + get_gateway_setting("ACQUIRE_TIMEOUT")
+    started = time.monotonic()
+    acquired = []
+    try:
+        for semaphore in semaphores:
+            if not semaphore.acquire(timeout=max(0.0, deadline - time.monotonic())):
+                wait_seconds = time.monotonic() - started
+                metrics.record_wait(model, wait_seconds, acquired=False)
+                logger.warning(
+                    f"AI gateway busy: no slot for {model} after {wait_seconds:.2f}s."
+                )
+                raise AIGatewayBusy(f"AI gateway is busy for model {model}.")
+            acquired.append(semaphore)
+        wait_seconds = time.monotonic() - started
+        metrics.record_wait(model, wait_seconds, acquired=True)
+        if wait_seconds > 1:
+            logger.info(f"AI gateway: {model} request queued for {wait_seconds:.2f}s.")
+        try:
+            yield
+        finally:
+            metrics.record_done()
+    finally:
+        for semaphore in reversed(acquired):
+            semaphore.release()
+
+
+# --- Public API ---
+def is_available() -> bool:
+    """True if the configured backend can serve requests."""
+    return get_backend().is_available()
+
+
+def generate_content(model: str, contents):
+    """
+    Sends a generate_content request through the gateway.
+    Blocks for a concurrency slot (raising AIGatewayBusy after ACQUIRE_TIMEOUT),
+    then returns the backend's response object.
+    """
+    model_key = _normalize_model_name(model)
+    with _concurrency_slot(model_key):
+        return get_backend().generate_content(model=model, contents=contents)
+
+
+def get_metrics() -> dict:
+    """Returns a snapshot of the gateway's queue-wait and throughput counters."""
+    return metrics.snapshot()
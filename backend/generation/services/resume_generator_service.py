@@ -1,61 +1,169 @@
 # backend/generation/services/resume_generator_service.py
-import os
-from google import genai
-
-# from google.genai import types # If needed later
 from django.contrib.auth.models import User
 from bio.models import Bio  # Import Bio model
+from jobposts.fingerprint import find_near_duplicate_job_posts
+from jobposts.models import JobPost
 from resumes.models import Resume  # Import Resume model
+from resumes.storage import get_tailored_storage_kwargs
+
+# All AI calls go through the shared gateway (pooled client + concurrency limits)
+from . import ai_gateway
 
 # Import utility functions using relative paths within the app
 from ..utils.profile_formatter import format_base_data_for_ai_prompt
-from ..utils.prompt_builder import build_generation_prompt
+from ..utils.prompt_builder import (
+    build_generation_prompt,
+    build_section_regeneration_prompt,
+)
 from ..utils.response_parser import clean_and_parse_json
-from ..utils.jd_parser import extract_keywords_from_jd  # Placeholder
-
-# --- Configure GenAI Client ---
-GENAI_CONFIGURED = False
-client = None  # Initialize client as None globally
-try:
-    # Try GOOGLE_API_KEY first, then GEMINI_API_KEY
-    api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
-    if not api_key:
-        raise RuntimeError(
-            "API Key not found in .env (checked GOOGLE_API_KEY, GEMINI_API_KEY)"
-        )
+from ..utils.jd_parser import analyze_jd, cache_jd_analysis, get_cached_jd_analysis
 
-    # Use the Client constructor from the new SDK
-    client = genai.Client(api_key=api_key)
+GENERATION_MODEL_NAME = "gemini-1.5-flash"  # Verify model
+# Sections of a tailored resume that can be regenerated individually
+REGENERABLE_SECTIONS = ("summary", "work", "skills", "projects")
+
+
+def _extract_generated_text(response) -> tuple[str | None, str | None]:
+    """
+    Checks safety feedback and pulls the text out of a Gemini response.
+    Returns (generated_text, None) on success or (None, error_message) on failure.
+    """
+    generated_text = None  # Default to None
 
-    # Optional verification: Try listing a model (low cost)
-    # This will raise an exception if the key is invalid or config fails
-    print("Verifying GenAI config by listing models (first page)...")
+    # 1. Check for blocking feedback safely
     try:
-        _ = next(client.models.list())
-        print(_, "Successfully listed models. GenAI Client configured.")
-    except StopIteration:
+        # Check if feedback exists AND has a block reason
+        if (
+            hasattr(response, "prompt_feedback")
+            and response.prompt_feedback
+            and response.prompt_feedback.block_reason
+        ):
+            block_reason_str = str(response.prompt_feedback.block_reason)
+            print(f"Generation blocked. Reason: {block_reason_str}")
+            return (
+                None,
+                f"Error: Content generation blocked by safety filter ({block_reason_str}).",
+            )  # Return error string
+    except AttributeError:
         print(
-            "Warning: no models returned on list(), but GenAI Client appears configured."
+            "AttributeError checking prompt_feedback, proceeding..."
+        )  # Log if attribute missing entirely
+        pass  # Ignore if prompt_feedback structure is unexpected
+    except Exception as e:
+        print(f"Unexpected error checking prompt_feedback: {type(e).__name__} - {e}")
+        # Decide whether to proceed or return error - let's try proceeding for now
+        pass
+
+    # 2. Attempt to extract text using the .text attribute
+    try:
+        if hasattr(response, "text"):
+            generated_text = response.text
+            if generated_text:  # Check if text is not empty
+                print("Successfully extracted text using response.text.")
+                print("\n--- RAW AI Response Text Received ---\n")
+                print(generated_text)
+                print("\n--- End RAW AI Response Text ---\n")
+            else:
+                # Handle cases where .text exists but is empty/None
+                print(
+                    f"Warning: response.text exists but is empty/None. Candidates: {getattr(response, 'candidates', 'N/A')}"
+                )
+                return None, "Error: AI returned an empty text response."
+        else:
+            # If .text attribute doesn't exist, maybe check candidates (less common now?)
+            print(
+                f"Warning: response object lacks .text attribute. Candidates: {getattr(response, 'candidates', 'N/A')}"
+            )
+            # Try fallback to candidates if needed, based on SDK structure for errors
+            # candidate = response.candidates[0] # Example, might error
+            # generated_text = candidate.content.parts[0].text # Example, might error
+            # if not generated_text: return "Error: AI response structure unexpected (no text found)."
+            # else: print("Extracted text via candidates fallback.")
+
+            # For now, return error if .text is missing
+            return (
+                None,
+                "Error: AI response structure missing expected 'text' attribute.",
+            )
+
+    except ValueError as e:
+        # Handle cases where .text property itself raises error
+        print(
+            f"ValueError extracting response.text: {e}. Candidates: {getattr(response, 'candidates', 'N/A')}"
         )
-    # Even if no models were returned, assume configuration succeeded
-    GENAI_CONFIGURED = True
+        return None, "Error: Could not extract text from AI response value."
+    except Exception as e:
+        # Catch other potential errors during text extraction
+        print(f"Unexpected error extracting response text: {type(e).__name__} - {e}")
+        return None, "Error: Unexpected issue accessing AI response text content."
+
+    if generated_text is None:  # Should have returned error above, but double-check
+        return None, "Error: Failed to extract valid text from AI response."
+    return generated_text, None
 
-except Exception as e:
-    print(
-        f"ERROR configuring or verifying Google GenAI Client: {type(e).__name__} - {e}"
+
+# --- Near-duplicate JDs ---
+def find_tailored_duplicate(user: User, jd_text: str) -> dict | None:
+    """
+    Looks for job posts whose description is a near-duplicate of `jd_text`
+    (see jobposts/fingerprint.py) and the user's tailored resume for one.
+    Returns {"job_post_id", "similarity", "resume_id"} for the closest job
+    post the user already tailored for, else for the closest job post with
+    "resume_id" None; None if there is no near-duplicate at all.
+    """
+    matches = find_near_duplicate_job_posts(jd_text)
+    if not matches:
+        return None
+    similarities = {job_post_id: similarity for similarity, job_post_id in matches}
+    tailored = (
+        Resume.objects.filter(
+            user=user,
+            is_base_resume=False,
+            associated_job_post_id__in=similarities,
+        )
+        .order_by("-updated_at")
+        .values_list("id", "associated_job_post_id")
     )
-    client = None  # Ensure client remains None on failure
-    GENAI_CONFIGURED = False
+    best = None
+    for resume_id, job_post_id in tailored:  # Newest first wins ties
+        if best is None or similarities[job_post_id] > best["similarity"]:
+            best = {
+                "job_post_id": job_post_id,
+                "similarity": similarities[job_post_id],
+                "resume_id": resume_id,
+            }
+    if best is None:
+        similarity, job_post_id = matches[0]
+        best = {"job_post_id": job_post_id, "similarity": similarity, "resume_id": None}
+    return best
+
+
+def get_tailored_resume_data(user: User, resume_id) -> dict | str:
+    """Serialized data of one of the user's tailored resumes, for reuse instead of generating."""
+    from resumes.fast_serializers import serialize_resume
+
+    resume = (
+        Resume.objects.select_related("user__bio")
+        .prefetch_related("user__bio__social_profiles")
+        .filter(pk=resume_id, user=user, is_base_resume=False)
+        .first()
+    )
+    if resume is None:
+        return "Error: Tailored resume not found."
+    return serialize_resume(resume)
 
 
 # --- Main Generation Function ---
-def generate_resume_content_for_jd(user: User, jd_text: str) -> dict | str:
+def generate_resume_content_for_jd(
+    user: User, jd_text: str, job_post_id=None
+) -> dict | str:
     """
     Orchestrates the resume generation process. Fetches Base Resume, calls AI,
-    creates a NEW Resume record with generated content.
+    creates a NEW Resume record with generated content, associated with
+    `job_post_id` when given.
     Returns the *serialized data* of the new Resume object on success or an error message string.
     """
-    if not GENAI_CONFIGURED or client is None:
+    if not ai_gateway.is_available():
         return "Error: AI Client is not configured properly."
 
     print(f"Starting generation for user: {user.username}")
@@ -79,23 +187,40 @@ def generate_resume_content_for_jd(user: User, jd_text: str) -> dict | str:
             print(f"Error fetching base data for user {user.username}: {e}")
             return "Error: Could not retrieve base resume data."
 
+        job_post = None
+        if job_post_id is not None:
+            job_post = (
+                JobPost.objects.filter(pk=job_post_id)
+                .only("id", "company_name", "source_url")
+                .first()
+            )
+            if job_post is None:
+                return "Error: Job post not found."
+
         # --- Step 2: Format BASE data for AI Prompt ---
         ai_input_string = format_base_data_for_ai_prompt(bio, base_resume)
 
-        # --- Step 3: Pre-parse JD (Placeholder) ---
-        # jd_keywords = extract_keywords_from_jd(jd_text)
+        # --- Step 3: Pre-parse JD ---
+        # Cached so section regeneration of this resume reuses it (see jd_parser)
+        jd_analysis = analyze_jd(jd_text)
+        cache_jd_analysis(jd_text, jd_analysis)
+        jd_stats = jd_analysis["stats"]
+        print(
+            f"JD cleaned: ~{jd_stats['tokens_before']} -> ~{jd_stats['tokens_after']} tokens"
+        )
 
         # --- Step 4: Build the Prompt ---
-        prompt = build_generation_prompt(ai_input_string, jd_text)
+        # The prompt gets the JD without boilerplate; the Resume keeps the original
+        prompt = build_generation_prompt(ai_input_string, jd_analysis["cleaned_jd"])
         # Print the AI prompt for debugging
         print("\n--- AI Generation Prompt ---\n")
         print(prompt)
         print("\n--- End AI Generation Prompt ---\n")
 
         # --- Step 5: Call AI Model ---
-        model_name = "gemini-1.5-flash"  # Verify model
+        model_name = GENERATION_MODEL_NAME
         print(f"Calling Gemini model: {model_name}...")
-        response = client.models.generate_content(
+        response = ai_gateway.generate_content(
             model=model_name,  # Pass model name string directly
             contents=prompt,
         )
@@ -104,79 +229,11 @@ def generate_resume_content_for_jd(user: User, jd_text: str) -> dict | str:
         # Add generation config, safety settings if needed
         # config = types.GenerationConfig(response_mime_type="application/json")
 
-        # --- Step 6: Process AI Response (Improved) ---
+        # --- Step 6: Process AI Response ---
         print("Processing AI response...")
-        generated_text = None  # Default to None
-
-        # 1. Check for blocking feedback safely
-        try:
-            # Check if feedback exists AND has a block reason
-            if (
-                hasattr(response, "prompt_feedback")
-                and response.prompt_feedback
-                and response.prompt_feedback.block_reason
-            ):
-                block_reason_str = str(response.prompt_feedback.block_reason)
-                print(f"Generation blocked. Reason: {block_reason_str}")
-                return f"Error: Content generation blocked by safety filter ({block_reason_str})."  # Return error string
-        except AttributeError:
-            print(
-                "AttributeError checking prompt_feedback, proceeding..."
-            )  # Log if attribute missing entirely
-            pass  # Ignore if prompt_feedback structure is unexpected
-        except Exception as e:
-            print(
-                f"Unexpected error checking prompt_feedback: {type(e).__name__} - {e}"
-            )
-            # Decide whether to proceed or return error - let's try proceeding for now
-            pass
-
-        # 2. Attempt to extract text using the .text attribute
-        try:
-            if hasattr(response, "text"):
-                generated_text = response.text
-                if generated_text:  # Check if text is not empty
-                    print("Successfully extracted text using response.text.")
-                    print("\n--- RAW AI Response Text Received ---\n")
-                    print(generated_text)
-                    print("\n--- End RAW AI Response Text ---\n")
-                    # Proceed to Step 7 (Parsing) below
-                else:
-                    # Handle cases where .text exists but is empty/None
-                    print(
-                        f"Warning: response.text exists but is empty/None. Candidates: {getattr(response, 'candidates', 'N/A')}"
-                    )
-                    return "Error: AI returned an empty text response."
-            else:
-                # If .text attribute doesn't exist, maybe check candidates (less common now?)
-                print(
-                    f"Warning: response object lacks .text attribute. Candidates: {getattr(response, 'candidates', 'N/A')}"
-                )
-                # Try fallback to candidates if needed, based on SDK structure for errors
-                # candidate = response.candidates[0] # Example, might error
-                # generated_text = candidate.content.parts[0].text # Example, might error
-                # if not generated_text: return "Error: AI response structure unexpected (no text found)."
-                # else: print("Extracted text via candidates fallback.")
-
-                # For now, return error if .text is missing
-                return "Error: AI response structure missing expected 'text' attribute."
-
-        except ValueError as e:
-            # Handle cases where .text property itself raises error
-            print(
-                f"ValueError extracting response.text: {e}. Candidates: {getattr(response, 'candidates', 'N/A')}"
-            )
-            return "Error: Could not extract text from AI response value."
-        except Exception as e:
-            # Catch other potential errors during text extraction
-            print(
-                f"Unexpected error extracting response text: {type(e).__name__} - {e}"
-            )
-            return "Error: Unexpected issue accessing AI response text content."
-
-        # --- If we got here, generated_text should be valid ---
-        if generated_text is None:  # Should have returned error above, but double-check
-            return "Error: Failed to extract valid text from AI response."
+        generated_text, error_message = _extract_generated_text(response)
+        if error_message:
+            return error_message
 
         # --- Step 7: Parse AI Response JSON ---
         print("Cleaning and parsing AI response JSON...")
@@ -189,36 +246,37 @@ def generate_resume_content_for_jd(user: User, jd_text: str) -> dict | str:
         # --- Step 8: Create and Save NEW Resume Record ---
         print("Creating new Resume record...")
         try:
-            # TODO: Extract company name/url from JD or request data
-            company_name_from_jd = "Company from JD"  # Placeholder
+            # TODO: Extract company name/url from JD when there is no job post
+            company_name_from_jd = (
+                job_post.company_name
+                if job_post and job_post.company_name
+                else "Company from JD"
+            )
 
             new_resume = Resume.objects.create(
-                user=user,
+                # Reuse the user loaded with the base resume: its Bio and social
+                # profiles are already cached, so serialization needs no queries.
+                user=base_resume.user,
                 name=f"Resume for {company_name_from_jd}",  # Auto-generate a name
                 is_base_resume=False,
                 source_job_description=jd_text,
-                # source_job_url= extracted_url, # Populate if available
+                source_job_url=job_post.source_url if job_post else None,
+                associated_job_post=job_post,
                 source_company_name=company_name_from_jd,  # Populate if available
                 # Populate generated fields directly from AI output JSON
                 summary=generated_data.get("summary", ""),
                 work=generated_data.get("work", []),
                 projects=generated_data.get("projects", []),
                 skills=generated_data.get("skills", {}),
+                # Delta against a base snapshot when RESUME_STORAGE enables it
+                **get_tailored_storage_kwargs(base_resume),
             )
             print(f"Successfully created new Resume record with ID: {new_resume.id}")
 
             # Return the data of the newly created resume using the merging serializer
-            # This requires importing the serializer and potentially passing context
             from resumes.serializers import ResumeSerializer
 
-            # We need the full object with prefetched Bio for the serializer to work
-            # Re-fetch might be simplest here, or pass bio object if available easily
-            new_resume_full = (
-                Resume.objects.select_related("user__bio")
-                .prefetch_related("user__bio__social_profiles")
-                .get(pk=new_resume.pk)
-            )
-            serializer = ResumeSerializer(new_resume_full)
+            serializer = ResumeSerializer(new_resume)
             return serializer.data  # Return the serialized dict
 
         except Exception as e:
@@ -228,9 +286,92 @@ def generate_resume_content_for_jd(user: User, jd_text: str) -> dict | str:
             # import traceback; traceback.print_exc()
             return "Error: Failed to save the generated resume data."
 
+    except ai_gateway.AIGatewayBusy:
+        return "Error: AI service is busy. Please retry shortly."
     except Exception as e:
         print(
             f"ERROR in generation service for user {user.username}: {type(e).__name__} - {e}"
         )
         # import traceback; traceback.print_exc()
         return f"Error: An unexpected exception occurred during generation - {type(e).__name__}"
+
+
+# --- Section Regeneration Function ---
+def regenerate_resume_sections(user: User, resume_id, sections: list) -> dict | str:
+    """
+    Regenerates only the requested sections of an existing tailored Resume.
+    Sends just those sections plus the cached JD analysis to the AI and patches
+    the Resume row in place instead of creating a new one.
+    Returns the *serialized data* of the updated Resume or an error message string.
+    """
+    if not ai_gateway.is_available():
+        return "Error: AI Client is not configured properly."
+
+    invalid_sections = [name for name in sections if name not in REGENERABLE_SECTIONS]
+    if not sections or invalid_sections:
+        return f"Error: Invalid sections requested. Allowed: {', '.join(REGENERABLE_SECTIONS)}."
+    # Preserve the canonical section order and drop duplicates
+    sections = [name for name in REGENERABLE_SECTIONS if name in sections]
+
+    print(f"Starting section regeneration {sections} for user: {user.username}")
+    try:
+        # --- Step 1: Fetch the tailored Resume (with Bio for serialization) ---
+        try:
+            resume = (
+                Resume.objects.select_related("user__bio")
+                .prefetch_related("user__bio__social_profiles")
+                .get(pk=resume_id, user=user, is_base_resume=False)
+            )
+        except Resume.DoesNotExist:
+            return "Error: Tailored resume not found."
+        if not resume.source_job_description:
+            return "Error: Resume has no source job description to tailor against."
+
+        # --- Step 2: Build the minimal prompt ---
+        jd_text = resume.source_job_description
+        current_sections = {name: getattr(resume, name) for name in sections}
+        jd_analysis = get_cached_jd_analysis(jd_text)
+        prompt = build_section_regeneration_prompt(
+            current_sections, jd_analysis["cleaned_jd"], jd_analysis["keywords"]
+        )
+
+        # --- Step 3: Call AI Model ---
+        print(
+            f"Calling Gemini model: {GENERATION_MODEL_NAME} for sections {sections}..."
+        )
+        response = ai_gateway.generate_content(
+            model=GENERATION_MODEL_NAME,
+            contents=prompt,
+        )
+        print("Gemini response received.")
+
+        # --- Step 4: Process and parse AI Response ---
+        generated_text, error_message = _extract_generated_text(response)
+        if error_message:
+            return error_message
+        generated_data = clean_and_parse_json(
+            generated_text, expected_keys=set(sections)
+        )
+        if generated_data is None:
+            return "Error: Failed to parse AI response as JSON."
+
+        # --- Step 5: Patch the existing Resume in place ---
+        updated_fields = [name for name in sections if name in generated_data]
+        if not updated_fields:
+            return "Error: Failed to parse AI response as JSON (no requested sections returned)."
+        for name in updated_fields:
+            setattr(resume, name, generated_data[name])
+        resume.save(update_fields=updated_fields + ["updated_at"])
+        print(f"Updated sections {updated_fields} of Resume ID: {resume.id}")
+
+        from resumes.serializers import ResumeSerializer
+
+        return ResumeSerializer(resume).data
+
+    except ai_gateway.AIGatewayBusy:
+        return "Error: AI service is busy. Please retry shortly."
+    except Exception as e:
+        print(
+            f"ERROR in section regeneration for user {user.username}: {type(e).__name__} - {e}"
+        )
+        return f"Error: An unexpected exception occurred during regeneration - {type(e).__name__}"
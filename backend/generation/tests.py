@@ -1,3 +1,413 @@
-from django.test import TestCase
+import json
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from bio.models import SocialProfile
+from jobposts.fingerprint import (
+    NEAR_DUPLICATE_THRESHOLD,
+    compute_minhash,
+    estimate_similarity,
+)
+from jobposts.models import JobPost
+from resumes.models import Resume
+
+from .services import ai_gateway
+from .utils import jd_parser
+from .utils.jd_cleaner import clean_job_description
+from .utils.response_parser import clean_and_parse_json, extract_json_object
+
+RESPONSIBILITIES = """Ship and maintain the payments API used by thousands of merchants.
+- Design Python services on PostgreSQL and Kafka
+- Own on-call for the ledger and reconciliation jobs
+- Partner with product on roadmap and technical design reviews
+
+Requirements
+- 5+ years of backend experience with Python or Go
+- Experience with distributed systems and event-driven architecture
+- Strong SQL and data modeling skills"""
+
+
+class CleanJobDescriptionTests(SimpleTestCase):
+    def assert_section_kept(self, heading):
+        jd = f"""Senior Backend Engineer
+
+About Acme
+
+Acme is on a mission to make money move at the speed of the internet and is
+proud to be recognized as a Great Place to Work three years in a row.
+
+{heading}
+
+{RESPONSIBILITIES}
+
+Benefits
+
+- Competitive salary and equity
+- 401(k) with 4% match
+"""
+        cleaned, stats = clean_job_description(jd)
+        self.assertIn(heading, cleaned)
+        self.assertIn("Own on-call for the ledger", cleaned)
+        self.assertNotIn("Great Place to Work", cleaned)
+        self.assertNotIn("401(k)", cleaned)
+        self.assertIn("Strong SQL and data modeling", cleaned)
+        self.assertEqual(stats["sections_removed"], 2)
+
+    def test_about_your_role_is_not_company_boilerplate(self):
+        self.assert_section_kept("About your role:")
+
+    def test_about_your_team_is_not_company_boilerplate(self):
+        self.assert_section_kept("About your team")
+
+    def test_about_the_role_is_kept(self):
+        self.assert_section_kept("About the role")
+
+
+GENERATED = {
+    "summary": "Backend engineer focused on payments",
+    "work": [{"name": "Acme", "highlights": ["Built the ledger"]}],
+    "skills": [{"category": "Languages", "skills": ["Python"]}],
+    "projects": [],
+}
+
+
+class GenerateResumeQueryCountTests(TestCase):
+    """Pins the queries of POST /api/generate/ so the save path can't regress."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(
+            email="ada@example.com",
+            password="pw12345!x",
+            first_name="Ada",
+            last_name="L",
+        )
+        Resume.objects.create(
+            user=self.user,
+            name="Base",
+            is_base_resume=True,
+            summary="Backend engineer",
+            work=[{"name": "Acme", "highlights": ["Built the ledger"]}],
+            skills=[{"category": "Languages", "skills": ["Python"]}],
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        ai_gateway.set_backend(
+            ai_gateway.FakeAIBackend(default_text=json.dumps(GENERATED))
+        )
+        self.addCleanup(ai_gateway.reset)
+
+    def generate(self, **data):
+        return self.client.post(
+            "/api/generate/", {"jd_text": RESPONSIBILITIES, **data}, format="json"
+        )
+
+    def test_generate(self):
+        # Near-duplicate lookup, base resume with Bio, its social profiles,
+        # INSERT, search document upsert; serializing the result adds none
+        with self.assertNumQueries(5):
+            response = self.generate()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["summary"], GENERATED["summary"])
+
+    def test_generate_for_job_post(self):
+        job_post = JobPost.objects.create(
+            source_url="https://example.com/jobs/1", company_name="Acme"
+        )
+        with self.assertNumQueries(6):  # Plus the job post lookup
+            response = self.generate(job_post_id=str(job_post.id))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["source_company_name"], "Acme")
+
+    def test_query_count_independent_of_profiles_and_resumes(self):
+        for network in ("GitHub", "LinkedIn", "Mastodon"):
+            SocialProfile.objects.create(
+                bio=self.user.bio, network=network, url="https://example.com/ada"
+            )
+        self.generate(on_duplicate="regenerate")
+        with self.assertNumQueries(5):
+            response = self.generate(on_duplicate="regenerate")
+        self.assertEqual(len(response.json()["basics"]["profiles"]), 3)
+
+
+class RegenerateResumeSectionsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(
+            email="ada@example.com", password="pw12345!x"
+        )
+        self.resume = Resume.objects.create(
+            user=self.user,
+            name="Tailored",
+            source_job_description=RESPONSIBILITIES,
+            **GENERATED,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.backend = ai_gateway.FakeAIBackend(
+            default_text=json.dumps({"summary": "Payments engineer"})
+        )
+        ai_gateway.set_backend(self.backend)
+        self.addCleanup(ai_gateway.reset)
+
+    def regenerate(self, sections, resume=None):
+        return self.client.post(
+            f"/api/generate/{(resume or self.resume).id}/sections/",
+            {"sections": sections},
+            format="json",
+        )
+
+    def test_only_requested_sections_change(self):
+        self.backend.default_text = json.dumps(
+            {"summary": "Payments engineer", "work": [], "skills": []}
+        )
+        before = Resume.objects.values().get(pk=self.resume.pk)
+        response = self.regenerate(["summary"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["summary"], "Payments engineer")
+        after = Resume.objects.values().get(pk=self.resume.pk)
+        changed = {key for key in after if after[key] != before[key]}
+        self.assertEqual(changed, {"summary", "updated_at"})
+        self.assertEqual(Resume.objects.count(), 1)
+        prompt = self.backend.calls[0]["contents"]
+        self.assertIn("`summary`", prompt)
+        self.assertNotIn("Built the ledger", prompt)  # Other sections aren't sent
+
+    def test_unknown_section(self):
+        response = self.regenerate(["summary", "hobbies"])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.backend.calls, [])
+
+    def test_other_users_resume(self):
+        other = CustomUser.objects.create_user(
+            email="bob@example.com", password="pw12345!x"
+        )
+        resume = Resume.objects.create(
+            user=other, source_job_description=RESPONSIBILITIES, **GENERATED
+        )
+        response = self.regenerate(["summary"], resume=resume)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.backend.calls, [])
+        self.assertEqual(Resume.objects.get(pk=resume.pk).summary, GENERATED["summary"])
+
+    def test_base_resume(self):
+        Resume.objects.filter(pk=self.resume.pk).update(is_base_resume=True)
+        self.assertEqual(self.regenerate(["summary"]).status_code, 404)
+
+    def test_reuses_the_analysis_of_full_generation(self):
+        Resume.objects.create(user=self.user, name="Base", is_base_resume=True)
+        self.backend.default_text = json.dumps(GENERATED)
+        jd_text = RESPONSIBILITIES + "\n\nBenefits\n\n- 401(k) with 4% match"
+        response = self.client.post(
+            "/api/generate/",
+            {"jd_text": jd_text, "on_duplicate": "regenerate"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        analysis = cache.get(jd_parser._jd_analysis_key(jd_text))
+        self.assertIn("ledger", analysis["keywords"])
+        self.assertNotIn("401(k)", analysis["cleaned_jd"])
+
+        with mock.patch.object(jd_parser, "analyze_jd") as analyze:
+            self.regenerate(
+                ["summary"], resume=Resume.objects.get(pk=response.json()["id"])
+            )
+        analyze.assert_not_called()
+        prompt = self.backend.calls[-1]["contents"]
+        self.assertIn(", ".join(analysis["keywords"]), prompt)
+        self.assertIn(analysis["cleaned_jd"], prompt)
+
+
+# The same posting as RESPONSIBILITIES, as another board scraped it
+NEAR_DUPLICATE_JD = "Apply on JobBoard today!\n\n" + RESPONSIBILITIES.replace(
+    "thousands of", "thousands of online"
+)
+UNRELATED_JD = """Registered nurse for our pediatric intensive care unit.
+- Assess and monitor critically ill infants and children
+- Administer medications and coordinate care with physicians
+- Educate families on discharge plans and home care"""
+
+
+class NearDuplicateGenerationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(
+            email="ada@example.com", password="pw12345!x"
+        )
+        Resume.objects.create(user=self.user, name="Base", is_base_resume=True)
+        self.job_post = JobPost.objects.create(
+            source_url="https://example.com/jobs/1",
+            company_name="Acme",
+            job_description=RESPONSIBILITIES,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.backend = ai_gateway.FakeAIBackend(default_text=json.dumps(GENERATED))
+        ai_gateway.set_backend(self.backend)
+        self.addCleanup(ai_gateway.reset)
+        response = self.generate(RESPONSIBILITIES, job_post_id=str(self.job_post.id))
+        self.assertEqual(response.status_code, 201)
+        self.tailored_id = response.json()["id"]
+        self.backend.calls.clear()
+
+    def generate(self, jd_text, **data):
+        return self.client.post(
+            "/api/generate/", {"jd_text": jd_text, **data}, format="json"
+        )
+
+    def test_near_duplicate_is_offered(self):
+        response = self.generate(NEAR_DUPLICATE_JD)
+        self.assertEqual(response.status_code, 409)
+        duplicate = response.json()["duplicate"]
+        self.assertEqual(duplicate["resume_id"], self.tailored_id)
+        self.assertEqual(duplicate["job_post_id"], str(self.job_post.id))
+        self.assertGreaterEqual(duplicate["similarity"], 0.7)
+        self.assertEqual(self.backend.calls, [])
+        self.assertEqual(Resume.objects.count(), 2)
+
+    def test_reuse_returns_the_existing_resume(self):
+        response = self.generate(NEAR_DUPLICATE_JD, on_duplicate="reuse")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["id"], self.tailored_id)
+        self.assertEqual(self.backend.calls, [])
+        self.assertEqual(Resume.objects.count(), 2)
+
+    def test_regenerate_calls_the_ai(self):
+        response = self.generate(NEAR_DUPLICATE_JD, on_duplicate="regenerate")
+        self.assertEqual(response.status_code, 201)
+        self.assertNotEqual(response.json()["id"], self.tailored_id)
+        self.assertEqual(len(self.backend.calls), 1)
+        resume = Resume.objects.get(pk=response.json()["id"])
+        self.assertEqual(resume.associated_job_post_id, self.job_post.id)
+
+    def test_unrelated_jd_is_not_matched(self):
+        response = self.generate(UNRELATED_JD)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(self.backend.calls), 1)
+        self.assertIsNone(
+            Resume.objects.get(pk=response.json()["id"]).associated_job_post_id
+        )
+
+    def test_below_threshold_is_not_matched(self):
+        # Shares the first half of the posting only
+        half = RESPONSIBILITIES.split("Requirements")[0] + UNRELATED_JD
+        similarity = estimate_similarity(
+            compute_minhash(half), compute_minhash(RESPONSIBILITIES)
+        )
+        self.assertLess(similarity, NEAR_DUPLICATE_THRESHOLD)
+        self.assertEqual(self.generate(half).status_code, 201)
+
+
+# Malformed model outputs seen in practice, with what must be salvaged from them
+MALFORMED_OUTPUTS = [
+    (
+        "nested objects in a fence",
+        'Here you go:\n```json\n{"work": [{"name": "Acme", "meta": {"team": {"size": 4}}}]}\n```',
+        {"work": [{"name": "Acme", "meta": {"team": {"size": 4}}}]},
+    ),
+    (
+        "prose with braces before the fence",
+        'Use {summary} and {work}.\n```\n{"summary": "A", "skills": []}\n```\nDone {!}',
+        {"summary": "A", "skills": []},
+    ),
+    (
+        "unfenced with trailing prose",
+        'Sure! {"summary": "A"} Let me know if you want changes.',
+        {"summary": "A"},
+    ),
+    (
+        "escaped quotes and braces inside strings",
+        r'{"summary": "Led \"Project {X}\" to 99.9% uptime", "work": ["a \\ b"]}',
+        {"summary": 'Led "Project {X}" to 99.9% uptime', "work": ["a \\ b"]},
+    ),
+    (
+        "trailing commas",
+        '{"skills": ["Python", "Go", ], "work": [{"name": "Acme",\n}, ],\n}',
+        {"skills": ["Python", "Go"], "work": [{"name": "Acme"}]},
+    ),
+    (
+        "raw newline inside a string",
+        '{"summary": "Line one\nline two"}',
+        {"summary": "Line one\nline two"},
+    ),
+    (
+        "truncated inside a string",
+        '```json\n{"summary": "Backend engineer", "work": [{"highlights": ["Built the led',
+        {"summary": "Backend engineer", "work": [{"highlights": ["Built the led"]}]},
+    ),
+    (
+        "truncated inside an escape",
+        '{"summary": "Said \\',
+        {"summary": "Said "},
+    ),
+    (
+        "truncated after a comma",
+        '{"skills": ["Python", "Go",',
+        {"skills": ["Python", "Go"]},
+    ),
+    (
+        "truncated after a colon",
+        '{"summary": "A", "work":',
+        {"summary": "A", "work": None},
+    ),
+    (
+        "dangling key",
+        '{"summary": "A", "projects": [{"name": "Ledger", "descr',
+        {"summary": "A", "projects": [{"name": "Ledger", "descr": None}]},
+    ),
+    (
+        "dangling complete key",
+        '{"summary": "A", "work"',
+        {"summary": "A", "work": None},
+    ),
+]
+
+UNRECOVERABLE_OUTPUTS = ["", "I can't help with that.", "```json\n```"]
+
+
+class ResponseParserCorpusTests(SimpleTestCase):
+    def test_salvages_malformed_outputs(self):
+        for name, text, expected in MALFORMED_OUTPUTS:
+            with self.subTest(name):
+                self.assertEqual(
+                    clean_and_parse_json(text, expected_keys=set()), expected
+                )
+
+    def test_well_formed_output_is_not_repaired(self):
+        text = json.dumps(GENERATED)
+        self.assertEqual(extract_json_object(text), (text, False))
+        self.assertEqual(clean_and_parse_json(text), GENERATED)
+
+    def test_unrecoverable_outputs(self):
+        for text in UNRECOVERABLE_OUTPUTS:
+            with self.subTest(text):
+                self.assertIsNone(clean_and_parse_json(text, expected_keys=set()))
+
+    def test_linear_time(self):
+        # 4x the input must cost well under the 16x of a quadratic scan
+        cases = {
+            "deep nesting": lambda n: "{" + '"a": [' * n,
+            "escaped quotes": lambda n: '{"a": "' + 'x\\"' * n,
+            "unbalanced quotes": lambda n: "{" + '"a' * n,
+            "trailing commas": lambda n: '{"a": [' + "1, " * n,
+            "many keys": lambda n: "{"
+            + ", ".join(f'"k{i}": ["}}"]' for i in range(n))
+            + "}",
+        }
+        for name, build in cases.items():
+            with self.subTest(name):
+                small, large = (self.best_time(build(n)) for n in (5000, 20000))
+                self.assertLess(large, small * 10)
+
+    def best_time(self, text):
+        timings = []
+        for _ in range(3):
+            start = time.perf_counter()
+            extract_json_object(text)
+            timings.append(time.perf_counter() - start)
+        return min(timings)
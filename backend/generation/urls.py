@@ -1,7 +1,12 @@
 # backend/generation/urls.py
 from django.urls import path
-from .views import GenerateResumeView
+from .views import GenerateResumeView, RegenerateResumeSectionsView
 
 urlpatterns = [
     path("generate/", GenerateResumeView.as_view(), name="generate-resume"),
+    path(
+        "generate/<uuid:resume_id>/sections/",
+        RegenerateResumeSectionsView.as_view(),
+        name="regenerate-resume-sections",
+    ),
 ]
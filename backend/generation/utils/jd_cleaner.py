@@ -0,0 +1,190 @@
+# backend/generation/utils/jd_cleaner.py
+# Strips text with no tailoring signal from a scraped job description before
+# it goes into a prompt: HTML remnants, EEO and accommodation statements,
+# benefits and perks lists, "About us" blurbs, pay-transparency legalese and
+# job-board chrome. Rule-based and local, so it costs about a millisecond per
+# JD. Sections are dropped by their heading, other paragraphs only when
+# they match boilerplate phrases and carry no requirement language.
+import html
+import re
+from html.parser import HTMLParser
+
+# Cleaning never leaves fewer tokens than this. A JD the rules would gut (say,
+# one scraped entirely under an "About us" heading) is more likely mis-scraped
+# than all boilerplate, so it is sent HTML-stripped only. Not a ratio: a JD
+# that is 85% benefits and legalese is common and should be cleaned.
+MIN_KEPT_TOKENS = 50
+
+_HTML_TAG_RE = re.compile(r"</?[a-zA-Z][a-zA-Z0-9]*(\s[^<>]*)?/?>")
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_SPACES_RE = re.compile(r"[ \t\f\v\u00a0\u200b]+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+_BLOCK_TAGS = set(
+    "p div br li ul ol tr table section article header footer"
+    " h1 h2 h3 h4 h5 h6 blockquote hr".split()
+)
+_SKIPPED_TAGS = set("script style noscript svg template head button form".split())
+
+# Headings whose whole section is boilerplate. "About the role/team/job" is
+# not "About us" and is kept; so is anything _JOB_HEADING_RE matches.
+_BOILERPLATE_HEADING_RE = re.compile(
+    r"^(about (us|the company|our company|(?!the\b|this\b|you\b|your\b)\w+(\s\w+)?)"
+    r"|who we are|our (story|mission|values|culture)|life at \w+|why (join|work)\b.*"
+    r"|(our |the )?(benefits|perks)(\s*(&|and)\s*(perks|benefits))?|what we offer|we offer"
+    r"|compensation( and benefits)?|pay transparency|salary( range)?|total rewards"
+    r"|equal (employment )?opportunity.*|eeo.*|diversity.*|accommodations?"
+    r"|(privacy|applicant privacy|data protection)( notice| policy)?|disclaimer"
+    r"|how to apply|share this job|similar jobs|more jobs.*)\s*:?$",
+    re.IGNORECASE,
+)
+
+# Headings that start the part of a JD worth keeping; they end a boilerplate
+# section even when the scrape lost the formatting of its list items
+_JOB_HEADING_RE = re.compile(
+    r"^(about (the|this|your) (role|team|job|position|opportunity)|about you|the role|your role"
+    r"|the team|overview|(job |role |position )?(summary|description|overview)"
+    r"|(key |main |your )?(responsibilities|duties)|what you('ll| will) (do|work on|bring)"
+    r"|(minimum |basic |preferred |required )?(qualifications|requirements|skills.*)"
+    r"|who you are|you (have|are|bring)|what we('re| are) looking for|nice to have.*"
+    r"|bonus points|tech stack|our stack|technologies.*|experience)\s*:?$",
+    re.IGNORECASE,
+)
+
+# Phrases that mark a paragraph as boilerplate wherever it appears
+_BOILERPLATE_PHRASES = re.compile(
+    r"equal opportunity employer|equal employment opportunity|without regard to"
+    r"|race, colou?r|sexual orientation|gender identity|protected veteran"
+    r"|reasonable accommodations?|disability status|e-verify|fair chance"
+    r"|arrest (and|or) conviction|background check|drug[- ]free"
+    r"|privacy (notice|policy)|personal data|cookies?\b"
+    r"|(salary|pay|compensation|base pay) range|base salary|actual (pay|salary|compensation)"
+    r"|pay transparency|eligible for (a |an )?(bonus|equity|commission)|total rewards"
+    r"|401\s?\(?k\)?|health(, dental| insurance| care)|dental|vision insurance"
+    r"|paid time off|\bpto\b|parental leave|wellness (stipend|program)|commuter benefits"
+    r"|recruit(ers|ing) (agencies|firms)|unsolicited (resumes|applications)"
+    r"|apply now|click apply|share this job|report this job|save this job"
+    r"|posted \d+ (days?|hours?|weeks?) ago|\d+ applicants",
+    re.IGNORECASE,
+)
+
+# Language that means a paragraph describes the job itself; such paragraphs
+# are kept even if they also mention a boilerplate phrase
+_REQUIREMENT_PHRASES = re.compile(
+    r"experience (with|in|of)|years of|proficien|familiar(ity)? with|knowledge of"
+    r"|responsib|you will|you'll|must have|nice to have|qualifications?|requirements?"
+    r"|skills?\b|degree in|ability to|expertise|hands-on",
+    re.IGNORECASE,
+)
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIPPED_TAGS:
+            self._skipping += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+            if tag == "li":
+                self.parts.append("- ")
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED_TAGS:
+            self._skipping = max(0, self._skipping - 1)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skipping:
+            self.parts.append(data)
+
+
+def html_to_text(text: str) -> str:
+    """Plain text with one line per block element; entities decoded, markup dropped."""
+    if _HTML_TAG_RE.search(text):
+        extractor = _TextExtractor()
+        extractor.feed(text)
+        extractor.close()
+        text = "".join(extractor.parts)
+    elif "&" in text:
+        text = html.unescape(text)
+    lines = (_SPACES_RE.sub(" ", line).strip() for line in text.splitlines())
+    return _BLANK_LINES_RE.sub("\n\n", "\n".join(lines)).strip()
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough prompt-token count (words and punctuation); good for before/after ratios."""
+    return len(_TOKEN_RE.findall(text))
+
+
+def _is_heading(line: str) -> bool:
+    words = line.rstrip(":").split()
+    return (
+        0 < len(words) <= 8
+        and not line.endswith((".", ",", ";"))
+        and not line.startswith("- ")
+    )
+
+
+def _is_boilerplate(paragraph: str) -> bool:
+    return bool(
+        _BOILERPLATE_PHRASES.search(paragraph)
+    ) and not _REQUIREMENT_PHRASES.search(paragraph)
+
+
+def clean_job_description(jd_text: str) -> tuple[str, dict]:
+    """
+    Returns (cleaned_text, stats). Stats hold estimated tokens before and
+    after and the number of sections and paragraphs dropped. Falls back to
+    the HTML-stripped text when the rules would keep under MIN_KEPT_TOKENS.
+    """
+    text = html_to_text(jd_text or "")
+    kept = []
+    sections_removed = paragraphs_removed = 0
+    in_boilerplate_section = False
+    for line in text.split("\n"):
+        if not line:
+            if kept and kept[-1]:
+                kept.append("")
+            continue
+        if (
+            _is_heading(line)
+            and _BOILERPLATE_HEADING_RE.match(line)
+            and not _JOB_HEADING_RE.match(line)
+        ):
+            in_boilerplate_section = True
+            sections_removed += 1
+            continue
+        if in_boilerplate_section:
+            # Only a real heading ends the section; short list items don't
+            if not _is_heading(line) or not (
+                line.endswith(":") or _JOB_HEADING_RE.match(line)
+            ):
+                continue
+            in_boilerplate_section = False
+        if _is_boilerplate(line):
+            paragraphs_removed += 1
+            continue
+        kept.append(line)
+    cleaned = "\n".join(kept).strip()
+
+    tokens_before = estimate_tokens(jd_text or "")
+    tokens_after = estimate_tokens(cleaned)
+    if tokens_after < MIN_KEPT_TOKENS:
+        cleaned, tokens_after = text, estimate_tokens(text)
+        sections_removed = paragraphs_removed = 0
+    return cleaned, {
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "tokens_removed": tokens_before - tokens_after,
+        "sections_removed": sections_removed,
+        "paragraphs_removed": paragraphs_removed,
+    }
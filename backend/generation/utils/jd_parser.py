@@ -1,5 +1,15 @@
 # backend/generation/utils/jd_parser.py
 # Placeholder for Job Description parsing logic
+import hashlib
+
+from django.core.cache import cache
+
+from jobposts.fingerprint import find_near_duplicate_job_posts
+from jobposts.models import JobPost
+
+from .jd_cleaner import clean_job_description
+
+JD_ANALYSIS_CACHE_TIMEOUT = 60 * 60 * 24  # 1 day in seconds
 
 
 def extract_keywords_from_jd(jd_text: str) -> list:
@@ -15,4 +25,65 @@ def extract_keywords_from_jd(jd_text: str) -> list:
         return []
 
 
+def _jd_analysis_key(jd_text: str) -> str:
+    return f"jd_analysis_{hashlib.sha256(jd_text.encode('utf-8')).hexdigest()}"
+
+
+def analyze_jd(jd_text: str) -> dict:
+    """
+    The JD analysis prompts are built from: the JD without boilerplate
+    ("cleaned_jd"), the cleaning stats and the keywords of the cleaned text.
+    """
+    cleaned_jd, stats = clean_job_description(jd_text)
+    return {
+        "cleaned_jd": cleaned_jd,
+        "stats": stats,
+        "keywords": extract_keywords_from_jd(cleaned_jd),
+    }
+
+
+def cache_jd_analysis(jd_text: str, analysis: dict) -> None:
+    """Stores an analyze_jd() result, e.g. the one full generation computed."""
+    cache.set(_jd_analysis_key(jd_text), analysis, JD_ANALYSIS_CACHE_TIMEOUT)
+
+
+def get_cached_jd_analysis(jd_text: str) -> dict:
+    """
+    Returns the analysis of a JD (see analyze_jd), computing it at most once per
+    JD text. Keyed by a hash of the text so identical JDs share it; full
+    generation stores the analysis it used, so section regeneration of that
+    resume starts warm. On a miss, the keywords of a near-duplicate job post's
+    JD are reused if cached.
+    """
+    analysis = cache.get(_jd_analysis_key(jd_text))
+    if analysis is None:
+        analysis = analyze_jd(jd_text)
+        keywords = _get_near_duplicate_jd_keywords(jd_text)
+        if keywords is not None:
+            analysis["keywords"] = keywords
+        cache_jd_analysis(jd_text, analysis)
+    return analysis
+
+
+def _get_near_duplicate_jd_keywords(jd_text: str) -> list | None:
+    matches = find_near_duplicate_job_posts(jd_text)
+    if not matches:
+        return None
+    descriptions = dict(
+        JobPost.objects.filter(
+            pk__in=[job_post_id for _, job_post_id in matches]
+        ).values_list("id", "job_description")
+    )
+    keys = [
+        _jd_analysis_key(descriptions[job_post_id])
+        for _, job_post_id in matches
+        if descriptions.get(job_post_id)
+    ]
+    cached = cache.get_many(keys)
+    for key in keys:  # Most similar first
+        if key in cached:
+            return cached[key]["keywords"]
+    return None
+
+
 # TODO: Add more functions later (e.g., extract_required_skills, get_company_tone)
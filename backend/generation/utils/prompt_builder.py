@@ -1,4 +1,5 @@
 # backend/generation/utils/prompt_builder.py
+import json
 
 
 def build_generation_prompt(base_data_string: str, jd_text: str) -> str:
@@ -75,3 +76,69 @@ Parse the provided `--- BASE RESUME JSON CHUNKS ---` (Work, Skills, Projects, Su
 --- TAILORED RESUME JSON OUTPUT (summary, work, skills, projects ONLY) ---"""
 
     return prompt
+
+
+# Per-section tailoring rules, mirroring the full generation prompt above but
+# scoped so a targeted edit only pays for the sections it actually rewrites.
+SECTION_RULES = {
+    "summary": (
+        "`summary` (string): 3 concise lines ONLY. A targeted pitch for the specific role "
+        "in the `JOB DESCRIPTION`, using its skills and keywords."
+    ),
+    "work": (
+        "`work` (array): keep every entry, its order and its non-highlight fields unchanged. "
+        "Rewrite `highlights` to 4-6 bullets per entry, each 185-210 characters, following "
+        "Action Verb -> Task -> Quantifiable Result, aligned with the `JOB DESCRIPTION`. "
+        "No first-person, no adverbs, no filler."
+    ),
+    "skills": (
+        "`skills` (array): keep the existing category structure. Remove hard skills that are "
+        "irrelevant to the `JOB DESCRIPTION` and add the tools and technologies it mentions. "
+        "No skill levels, no words like exposure or expert."
+    ),
+    "projects": (
+        "`projects` (array): keep every entry and its fields. Rewrite `description` to highlight "
+        "the tech stack, skills and impact relevant to the `JOB DESCRIPTION`."
+    ),
+}
+
+
+def build_section_regeneration_prompt(
+    current_sections: dict, jd_text: str, jd_keywords: list | None = None
+) -> str:
+    """
+    Constructs a minimal prompt that regenerates only the given sections of an
+    already tailored resume. `current_sections` maps section name to its current
+    JSON value; only those sections are sent and requested back.
+    """
+    section_names = list(current_sections.keys())
+    keys_str = ", ".join(f"`{name}`" for name in section_names)
+    rules_str = "\n".join(
+        f"{index}.  {SECTION_RULES[name]}"
+        for index, name in enumerate(section_names, start=1)
+    )
+    sections_json = json.dumps(current_sections, ensure_ascii=False)
+    keywords_str = ", ".join(jd_keywords) if jd_keywords else "N/A"
+
+    prompt = f"""IMPERATIVE: OUTPUT A SINGLE, VALID JSON OBJECT AND NOTHING ELSE. NO MARKDOWN, NO EXPLANATIONS, NOTHING BEFORE THE OPENING '{{' OR AFTER THE CLOSING '}}'.
+
+**TASK:**
+
+Rewrite ONLY the {keys_str} section(s) of the `--- CURRENT SECTIONS JSON ---` so they are tailored to the `--- JOB DESCRIPTION ---`. The output JSON object MUST contain exactly these top-level keys: {keys_str}. Keep the structure of each section identical to the input.
+
+**SECTION RULES:**
+
+{rules_str}
+
+--- JOB KEYWORDS ---
+{keywords_str}
+
+--- CURRENT SECTIONS JSON ---
+{sections_json}
+
+--- JOB DESCRIPTION ---
+{jd_text}
+
+--- REGENERATED SECTIONS JSON OUTPUT ({', '.join(section_names)} ONLY) ---"""
+
+    return prompt
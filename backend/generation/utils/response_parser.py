@@ -2,63 +2,165 @@
 import json
 import re
 
+import orjson
 
-def clean_and_parse_json(ai_response_text: str) -> dict | None:
+
+DEFAULT_EXPECTED_KEYS = {"summary", "work", "projects", "skills"}
+
+# Structural tokens for the JSON scanner. A string is consumed in one regex step
+# (escapes honoured, unterminated strings run to the end of the text), so braces
+# inside strings are never mistaken for structure.
+_JSON_TOKEN_RE = re.compile(
+    r'"[^"\\]*(?:\\(?:.|\Z)[^"\\]*)*(?:"|\Z)|[{}\[\],:]', re.DOTALL
+)
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def extract_json_object(text: str) -> tuple[str | None, bool]:
+    """
+    Single pass over `text` that returns the outermost balanced JSON object,
+    honouring strings and escapes. Prefers an object inside a ``` fence.
+    Repairs trailing commas and, if the output was truncated, closes the open
+    string/containers. Returns (json_string, was_repaired) or (None, False).
+    """
+    start = text.find("{")
+    fence = text.find("```")
+    if fence != -1:
+        fenced_start = text.find("{", fence)
+        if fenced_start != -1:
+            start = fenced_start
+    if start == -1:
+        return None, False
+
+    stack = []
+    removals = []  # Positions of trailing commas to drop
+    end = None
+    prev_kind = None  # Kind of the previous structural token
+    prev_end = start
+    expect_key = False  # Next string in the current object is a key
+    last_string_is_key = False
+    unterminated_string = False
+
+    for match in _JSON_TOKEN_RE.finditer(text, start):
+        token = match.group()
+        pos = match.start()
+        if token[0] == '"':
+            if len(token) == 1 or token[-1] != '"' or _ends_with_escape(token):
+                unterminated_string = True
+            last_string_is_key = expect_key
+            expect_key = False
+            kind = "string"
+        elif token in "{[":
+            stack.append(token)
+            expect_key = token == "{"
+            kind = "open"
+        elif token in "}]":
+            if prev_kind == "," and not text[prev_end:pos].strip():
+                removals.append(prev_end - 1)
+            if not stack or _CLOSERS[stack[-1]] != token:
+                break  # Mismatched closer: treat everything from here as truncated
+            stack.pop()
+            expect_key = False
+            if not stack:
+                end = match.end()
+                break
+            kind = "close"
+        elif token == ",":
+            expect_key = stack[-1] == "{"
+            kind = ","
+        else:  # ":"
+            last_string_is_key = False
+            kind = ":"
+        prev_kind = kind
+        prev_end = match.end()
+
+    if end is not None:
+        candidate = _apply_removals(text, start, end, removals)
+        return candidate, bool(removals)
+
+    # Truncated output: close whatever is still open
+    candidate = _apply_removals(text, start, len(text), removals)
+    if unterminated_string and prev_kind == "string":
+        if _ends_with_escape(candidate + '"'):
+            candidate = candidate[:-1]  # Drop a dangling escape backslash
+        candidate += '"'
+    candidate = candidate.rstrip()
+    if candidate.endswith(","):
+        candidate = candidate[:-1].rstrip()
+    if candidate.endswith(":"):
+        candidate += " null"
+    elif prev_kind == "string" and last_string_is_key:
+        candidate += ": null"
+    candidate += "".join(_CLOSERS[opener] for opener in reversed(stack))
+    return candidate, True
+
+
+def _ends_with_escape(token: str) -> bool:
+    """True if the closing quote of a string token is itself escaped (truncated mid-escape)."""
+    backslashes = len(token) - 1 - len(token[:-1].rstrip("\\"))
+    return backslashes % 2 == 1
+
+
+def _apply_removals(text: str, start: int, end: int, removals: list) -> str:
+    if not removals:
+        return text[start:end]
+    parts = []
+    cursor = start
+    for pos in removals:
+        parts.append(text[cursor:pos])
+        cursor = pos + 1
+    parts.append(text[cursor:end])
+    return "".join(parts)
+
+
+def loads_json(json_string: str):
+    """Fast decode with orjson; falls back to lenient json (raw control chars in strings)."""
+    try:
+        return orjson.loads(json_string)
+    except orjson.JSONDecodeError:
+        return json.loads(json_string, strict=False)
+
+
+def clean_and_parse_json(
+    ai_response_text: str, expected_keys: set | None = None
+) -> dict | None:
     """
-    Cleans potential markdown fences and parses the JSON string.
+    Finds the JSON object in an AI response (fenced or not), repairs common
+    truncation/trailing-comma faults and parses it.
     Returns the parsed dictionary or None if parsing fails.
+    `expected_keys` defaults to the full tailored-resume sections; pass an
+    empty set to skip the check.
     """
     if not ai_response_text:
         print("Error: Received empty string from AI.")
         return None
 
-    cleaned_json_string = ai_response_text.strip()
-    # Enhanced regex to find JSON block, handles potential leading/trailing text
-    match = re.search(
-        r"```(?:json)?\s*(\{.*?\})\s*```",
-        cleaned_json_string,
-        re.DOTALL | re.IGNORECASE,
-    )
-    json_to_parse = None
-
-    if match:
-        json_to_parse = match.group(
-            1
-        ).strip()  # Group 1 is the content inside ```json ... ```
-    elif cleaned_json_string.startswith("{") and cleaned_json_string.endswith("}"):
-        # Assume the whole string is JSON if it starts/ends with braces
-        json_to_parse = cleaned_json_string
-    else:
-        # Fallback: try to find the first '{' and last '}'
-        first_brace = cleaned_json_string.find("{")
-        last_brace = cleaned_json_string.rfind("}")
-        if first_brace != -1 and last_brace != -1 and last_brace > first_brace:
-            json_to_parse = cleaned_json_string[first_brace : last_brace + 1]
-            print(
-                "Warning: Parsed JSON by finding first/last braces. Result might be incomplete."
-            )
-        else:
-            print("Error: Cannot reliably find JSON object in AI response.")
-            print("\n--- Raw AI Response Snippet ---\n")
-            print(ai_response_text[:1000])
-            return None
-
+    json_to_parse, was_repaired = extract_json_object(ai_response_text)
     if not json_to_parse:
-        print("Error: JSON string is empty after cleaning attempts.")
+        print("Error: Cannot reliably find JSON object in AI response.")
+        print("\n--- Raw AI Response Snippet ---\n")
+        print(ai_response_text[:1000])
         return None
+    if was_repaired:
+        print("Warning: Repaired malformed/truncated JSON in AI response.")
 
     try:
-        parsed_data = json.loads(json_to_parse)
-        print("Successfully parsed generated JSON.")
-        # Basic validation: Check if expected keys exist
-        expected_keys = {"summary", "work", "projects", "skills"}
-        if not expected_keys.issubset(parsed_data.keys()):
-            print(
-                f"Warning: Parsed JSON missing some expected keys. Found: {list(parsed_data.keys())}"
-            )
-        return parsed_data
+        parsed_data = loads_json(json_to_parse)
     except json.JSONDecodeError as e:
         print(f"ERROR - Failed to parse AI JSON output: {e}")
         print("\n--- String Attempted to Parse ---\n")
         print(json_to_parse[:1000])
         return None
+
+    if not isinstance(parsed_data, dict):
+        print(f"ERROR - AI JSON output is not an object: {type(parsed_data).__name__}")
+        return None
+    print("Successfully parsed generated JSON.")
+    # Basic validation: Check if expected keys exist
+    if expected_keys is None:
+        expected_keys = DEFAULT_EXPECTED_KEYS
+    if not expected_keys.issubset(parsed_data.keys()):
+        print(
+            f"Warning: Parsed JSON missing some expected keys. Found: {list(parsed_data.keys())}"
+        )
+    return parsed_data
@@ -2,18 +2,69 @@ from django.shortcuts import render
 
 # Create your views here.
 # backend/generation/views.py
+import uuid
+
 from rest_framework import views, permissions, status
 from rest_framework.response import Response
 
 # Correct import path for the service function
-from .services.resume_generator_service import generate_resume_content_for_jd
+from .services.resume_generator_service import (
+    find_tailored_duplicate,
+    generate_resume_content_for_jd,
+    get_tailored_resume_data,
+    regenerate_resume_sections,
+)
+
+# What to do when the JD is a near-duplicate of one the user already tailored for
+ON_DUPLICATE_CHOICES = ("offer", "reuse", "regenerate")
+
+
+def _service_error_response(result_data: str) -> Response:
+    """Maps an "Error: ..." string returned by the generation service to a Response."""
+    status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    if (
+        "profile not found" in result_data.lower()
+        or "base resume not found" in result_data.lower()
+    ):
+        status_code = (
+            status.HTTP_400_BAD_REQUEST
+        )  # Bad request if prerequisite data missing
+    elif (
+        "tailored resume not found" in result_data.lower()
+        or "job post not found" in result_data.lower()
+    ):
+        status_code = status.HTTP_404_NOT_FOUND
+    elif (
+        "invalid sections" in result_data.lower()
+        or "no source job description" in result_data.lower()
+    ):
+        status_code = status.HTTP_400_BAD_REQUEST
+    elif "blocked by safety filters" in result_data.lower():
+        status_code = (
+            status.HTTP_400_BAD_REQUEST
+        )  # Treat blocking as bad input/request for now
+    elif (
+        "AI Client not configured" in result_data or "AI service is busy" in result_data
+    ):
+        status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    elif "Failed to parse AI response" in result_data:
+        status_code = (
+            status.HTTP_502_BAD_GATEWAY
+        )  # Error communicating with or parsing AI
+    return Response({"error": result_data}, status=status_code)
 
 
 class GenerateResumeView(views.APIView):
     """
     API endpoint to trigger resume content generation based on a Job Description.
-    Requires authentication. Expects {"jd_text": "..."} in POST body.
+    Requires authentication. Expects {"jd_text": "..."} in POST body, plus
+    optionally "job_post_id" (from /api/job-posts/ingest/) and "on_duplicate".
     Returns the full data of the newly created Resume object on success.
+
+    If the user already tailored a resume for a near-duplicate JD, no AI call
+    is made unless on_duplicate is "regenerate": "offer" (the default) answers
+    409 with {"error", "duplicate": {"resume_id", "job_post_id", "similarity"}},
+    "reuse" returns that resume with 200.
     """
 
     permission_classes = [permissions.IsAuthenticated]
@@ -25,34 +76,79 @@ class GenerateResumeView(views.APIView):
                 {"error": "jd_text field is required."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        on_duplicate = request.data.get("on_duplicate", "offer")
+        if on_duplicate not in ON_DUPLICATE_CHOICES:
+            return Response(
+                {
+                    "error": f"Invalid on_duplicate. Allowed: {', '.join(ON_DUPLICATE_CHOICES)}."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        job_post_id = request.data.get("job_post_id", None)
+        if job_post_id is not None:
+            try:
+                job_post_id = uuid.UUID(str(job_post_id))
+            except ValueError:
+                return Response(
+                    {"error": "job_post_id must be a UUID."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
         user = request.user
+        duplicate = find_tailored_duplicate(user, jd_text)
+        if duplicate and duplicate["resume_id"] and on_duplicate != "regenerate":
+            if on_duplicate == "offer":
+                return Response(
+                    {
+                        "error": "A resume was already tailored for a near-duplicate job description.",
+                        "duplicate": duplicate,
+                    },
+                    status=status.HTTP_409_CONFLICT,
+                )
+            result_data = get_tailored_resume_data(user, duplicate["resume_id"])
+            if isinstance(result_data, str) and result_data.startswith("Error:"):
+                return _service_error_response(result_data)
+            return Response(result_data, status=status.HTTP_200_OK)
+
+        if job_post_id is None and duplicate:
+            # Same job as an existing post: link the new resume to it
+            job_post_id = duplicate["job_post_id"]
         # Call the main service function
-        result_data = generate_resume_content_for_jd(user, jd_text)
+        result_data = generate_resume_content_for_jd(
+            user, jd_text, job_post_id=job_post_id
+        )
 
         # Check if the service returned an error string
         if isinstance(result_data, str) and result_data.startswith("Error:"):
-            status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
-            if (
-                "profile not found" in result_data.lower()
-                or "base resume not found" in result_data.lower()
-            ):
-                status_code = (
-                    status.HTTP_400_BAD_REQUEST
-                )  # Bad request if prerequisite data missing
-            elif "blocked by safety filters" in result_data.lower():
-                status_code = (
-                    status.HTTP_400_BAD_REQUEST
-                )  # Treat blocking as bad input/request for now
-            elif "AI Client not configured" in result_data:
-                status_code = status.HTTP_503_SERVICE_UNAVAILABLE
-            elif "Failed to parse AI response" in result_data:
-                status_code = (
-                    status.HTTP_502_BAD_GATEWAY
-                )  # Error communicating with or parsing AI
-            return Response({"error": result_data}, status=status_code)
+            return _service_error_response(result_data)
 
         # If successful, result_data is the dictionary from the ResumeSerializer
         return Response(
             result_data, status=status.HTTP_201_CREATED
         )  # Return 201 since a new resource was created
+
+
+class RegenerateResumeSectionsView(views.APIView):
+    """
+    API endpoint to regenerate only some sections of an existing tailored Resume.
+    Requires authentication. Expects {"sections": ["summary", "skills", ...]} in POST body.
+    Patches the Resume in place and returns its full data.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, resume_id, *args, **kwargs):
+        sections = request.data.get("sections", None)
+        if not sections or not isinstance(sections, list):
+            return Response(
+                {"error": "sections must be a non-empty list."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        result_data = regenerate_resume_sections(request.user, resume_id, sections)
+
+        if isinstance(result_data, str) and result_data.startswith("Error:"):
+            return _service_error_response(result_data)
+
+        # The existing resource was updated in place
+        return Response(result_data, status=status.HTTP_200_OK)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class JobpostsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "jobposts"
+
+    def ready(self):
+        # Registers the receivers that keep job description fingerprints in sync
+        from . import fingerprint  # noqa: F401
@@ -0,0 +1,165 @@
+# backend/jobposts/fingerprint.py
+# Near-duplicate job descriptions. The same job is posted on several boards
+# with small differences (a board header, a reworded benefits line), so each
+# JobPost.job_description gets a MinHash signature over word 3-shingles, and
+# its LSH band hashes are stored in JobPostLSHBucket. Finding near-duplicates
+# is then one indexed lookup of 16 buckets plus a signature comparison per
+# candidate, instead of a scan of every description.
+import hashlib
+import re
+from array import array
+
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from .models import JobPost, JobPostLSHBucket
+
+SHINGLE_SIZE = 3  # Words per shingle
+MIN_SHINGLES = 8  # Shorter texts get no fingerprint: too little to compare
+# One-permutation MinHash: the top bits of a shingle's hash pick one of
+# NUM_BINS bins, and each bin keeps its minimum. One hash per shingle instead
+# of one per permutation.
+NUM_BINS = 64
+BIN_BITS = 6  # log2(NUM_BINS)
+BAND_ROWS = 4  # Bins per LSH band; 16 bands
+NUM_BANDS = NUM_BINS // BAND_ROWS
+# Estimated Jaccard similarity above which two descriptions are the same job.
+# With 16 bands of 4 rows, pairs at 0.7 become candidates 98% of the time.
+NEAR_DUPLICATE_THRESHOLD = 0.7
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_VALUE_MASK = (1 << (64 - BIN_BITS)) - 1
+
+
+def _shingle_hashes(text: str) -> set:
+    words = _WORD_RE.findall(text.lower())
+    shingles = {
+        " ".join(words[i : i + SHINGLE_SIZE]).encode()
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+    blake2b, from_bytes = hashlib.blake2b, int.from_bytes
+    return {
+        from_bytes(blake2b(shingle, digest_size=8).digest(), "big")
+        for shingle in shingles
+    }
+
+
+def compute_minhash(text: str | None) -> bytes | None:
+    """
+    The MinHash signature of a description, NUM_BINS unsigned 64-bit values
+    packed as bytes (what JobPost.jd_minhash stores). None for texts too
+    short to fingerprint.
+    """
+    hashes = _shingle_hashes(text or "")
+    if len(hashes) < MIN_SHINGLES:
+        return None
+    empty = _VALUE_MASK + 1
+    mins = [empty] * NUM_BINS
+    for value in hashes:
+        index = value >> (64 - BIN_BITS)
+        value &= _VALUE_MASK
+        if value < mins[index]:
+            mins[index] = value
+    # Densify: an empty bin borrows the next filled bin's value (circularly)
+    # so short texts still compare position by position
+    for index in range(NUM_BINS):
+        if mins[index] == empty:
+            offset = 1
+            while mins[(index + offset) % NUM_BINS] == empty:
+                offset += 1
+            mins[index] = mins[(index + offset) % NUM_BINS] + offset * empty
+    return array("Q", mins).tobytes()
+
+
+def estimate_similarity(signature: bytes, other: bytes) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    a, b = array("Q", signature), array("Q", other)
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_BINS
+
+
+def lsh_buckets(signature: bytes) -> list:
+    """
+    One signed 64-bit bucket per band: a hash of that band's rows, salted with
+    the band number so equal rows in different bands never share a bucket.
+    """
+    band_size = BAND_ROWS * 8
+    return [
+        int.from_bytes(
+            hashlib.blake2b(
+                signature[band * band_size : (band + 1) * band_size],
+                digest_size=8,
+                person=band.to_bytes(2, "big"),
+            ).digest(),
+            "big",
+            signed=True,
+        )
+        for band in range(NUM_BANDS)
+    ]
+
+
+def find_near_duplicate_job_posts(
+    text: str, threshold: float = NEAR_DUPLICATE_THRESHOLD
+) -> list:
+    """
+    JobPosts whose description is a near-duplicate of `text`, as
+    `(similarity, job_post_id)` pairs, most similar first. One query: the
+    candidates' signatures, joined through the bucket index.
+    """
+    signature = compute_minhash(text)
+    if signature is None:
+        return []
+    candidates = dict(
+        JobPostLSHBucket.objects.filter(bucket__in=lsh_buckets(signature)).values_list(
+            "job_post_id", "job_post__jd_minhash"
+        )
+    )
+    matches = []
+    for job_post_id, candidate in candidates.items():
+        similarity = estimate_similarity(signature, bytes(candidate))
+        if similarity >= threshold:
+            matches.append((similarity, job_post_id))
+    matches.sort(key=lambda match: match[0], reverse=True)
+    return matches
+
+
+def replace_lsh_buckets(job_posts: list) -> None:
+    """
+    Rewrites the bucket rows of `job_posts` from their jd_minhash, in two
+    statements however many there are.
+    """
+    if not job_posts:
+        return
+    JobPostLSHBucket.objects.filter(
+        job_post__in=[job_post.pk for job_post in job_posts]
+    ).delete()
+    JobPostLSHBucket.objects.bulk_create(
+        [
+            JobPostLSHBucket(job_post_id=job_post.pk, band=band, bucket=bucket)
+            for job_post in job_posts
+            if job_post.jd_minhash is not None
+            for band, bucket in enumerate(lsh_buckets(bytes(job_post.jd_minhash)))
+        ]
+    )
+
+
+# --- Incremental maintenance ---
+# Bulk writes (jobposts/ingest.py) send no signals and call these helpers directly.
+def _touches_description(update_fields) -> bool:
+    return update_fields is None or "job_description" in update_fields
+
+
+@receiver(pre_save, sender=JobPost)
+def fingerprint_job_post(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw or not _touches_description(update_fields):
+        return
+    instance.jd_minhash = compute_minhash(instance.job_description)
+
+
+@receiver(post_save, sender=JobPost)
+def bucket_job_post(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw or not _touches_description(update_fields):
+        return
+    if update_fields is not None and "jd_minhash" not in update_fields:
+        # A save(update_fields=[...]) doesn't write what pre_save computed
+        JobPost.objects.filter(pk=instance.pk).update(jd_minhash=instance.jd_minhash)
+    replace_lsh_buckets([instance])
@@ -0,0 +1,170 @@
+# backend/jobposts/ingest.py
+# Job post ingestion. The same posting is scraped under many URLs that differ
+# only in tracking parameters, letter case or trailing slashes, so every URL is
+# canonicalized before it is used as the JobPost.source_url key. A batch is
+# then written with bulk INSERT ... ON CONFLICT (source_url) DO UPDATE.
+import posixpath
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from django.db import transaction
+
+from search.indexing import build_job_post_document, upsert_documents
+
+from .fingerprint import compute_minhash, replace_lsh_buckets
+from .models import JobPost
+
+MAX_INGEST_BATCH = 500  # Postings accepted per request
+
+# Query parameters that only identify the click, never the posting. Job ids
+# carried in the query string (LinkedIn currentJobId, Indeed jk, Greenhouse
+# gh_jid, ...) are kept.
+TRACKING_PARAM_PREFIXES = ("utm_", "_hs", "mc_", "pk_", "hsa_")
+TRACKING_PARAMS = {
+    "gclid",
+    "gclsrc",
+    "gh_src",
+    "dclid",
+    "gbraid",
+    "wbraid",
+    "fbclid",
+    "msclkid",
+    "yclid",
+    "twclid",
+    "igshid",
+    "li_fat_id",
+    "ref",
+    "refid",
+    "referer",
+    "referrer",
+    "trk",
+    "trkinfo",
+    "trackingid",
+    "lipi",
+    "originalsubdomain",
+    "src",
+    "source",
+    "sourcetype",
+    "from",
+    "si",
+    "spm",
+}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Fields a re-scrape of a known posting may overwrite
+INGEST_FIELDS = ("company_name", "job_title", "job_description", "apply_link")
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PARAM_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    The canonical form of a job posting URL: https, lower-case host without
+    "www." or a default port, normalized path without a trailing slash,
+    tracking parameters removed, remaining parameters sorted, no fragment.
+    Raises ValueError for anything that isn't an absolute http(s) URL.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        raise ValueError("Enter an absolute http(s) URL.")
+
+    host = parts.hostname.rstrip(".")  # urlsplit already lower-cases it
+    if ":" in host:  # IPv6 literal; hostname comes without its brackets
+        host = f"[{host}]"
+    elif host.startswith("www."):
+        host = host[4:]
+    try:
+        port = parts.port
+    except ValueError:  # Not a number, or out of range
+        raise ValueError("Enter a URL with a valid port.")
+    if port is not None and port not in DEFAULT_PORTS.values():
+        host = f"{host}:{port}"
+
+    path = posixpath.normpath(re.sub(r"/{2,}", "/", parts.path or "/"))
+    path = path.rstrip("/") or "/"
+
+    query = urlencode(
+        sorted(
+            (name, value)
+            for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not _is_tracking_param(name)
+        )
+    )
+    return urlunsplit(("https", host, path, query, ""))
+
+
+def upsert_job_posts(postings: list) -> list:
+    """
+    Creates or updates one JobPost per posting dict (keys: source_url, which
+    must already be canonical, and any of INGEST_FIELDS), and refreshes their
+    search documents and description fingerprints. Missing or None fields
+    never overwrite stored values; postings sharing a URL are merged, later
+    values winning.
+
+    Statement count doesn't grow with the batch: one upsert per distinct set
+    of provided fields (normally one), one id lookup, one search upsert and
+    two statements for the LSH buckets.
+    Returns `{"id", "source_url", "created"}` per posting, in input order.
+    """
+    if not postings:
+        return []
+    merged = {}
+    for posting in postings:
+        values = merged.setdefault(posting["source_url"], {})
+        values.update(
+            (field, posting[field])
+            for field in INGEST_FIELDS
+            if posting.get(field) is not None
+        )
+    for values in merged.values():
+        if "job_description" in values:
+            values["jd_minhash"] = compute_minhash(values["job_description"])
+    groups = {}  # provided fields -> JobPosts to upsert with them
+    for source_url, values in merged.items():
+        groups.setdefault(tuple(sorted(values)), []).append(
+            JobPost(source_url=source_url, **values)
+        )
+
+    with transaction.atomic():
+        for fields, job_posts in groups.items():
+            JobPost.objects.bulk_create(
+                job_posts,
+                update_conflicts=True,
+                unique_fields=["source_url"],
+                update_fields=[*fields, "updated_at"],
+            )
+        # On conflict the existing row keeps its id, so read the rows back
+        stored = {
+            job_post.source_url: job_post
+            for job_post in JobPost.objects.filter(source_url__in=merged)
+        }
+        created = {
+            job_post.source_url: stored[job_post.source_url].id == job_post.id
+            for job_posts in groups.values()
+            for job_post in job_posts
+        }
+        # bulk_create sends no signals, so index and bucket here (see
+        # search/indexing.py and jobposts/fingerprint.py)
+        upsert_documents(
+            [build_job_post_document(job_post) for job_post in stored.values()]
+        )
+        replace_lsh_buckets(
+            [
+                stored[source_url]
+                for source_url, values in merged.items()
+                if "job_description" in values
+            ]
+        )
+
+    return [
+        {
+            "id": stored[posting["source_url"]].id,
+            "source_url": posting["source_url"],
+            "created": created[posting["source_url"]],
+        }
+        for posting in postings
+    ]
@@ -0,0 +1,145 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:51
+
+import hashlib
+import re
+from array import array
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Frozen copy of jobposts/fingerprint.py as of this migration, so later changes
+# there can't change what this backfill writes. A new fingerprint scheme needs
+# its own migration to recompute jd_minhash and the buckets.
+SHINGLE_SIZE = 3
+MIN_SHINGLES = 8
+NUM_BINS = 64
+BIN_BITS = 6
+BAND_ROWS = 4
+NUM_BANDS = NUM_BINS // BAND_ROWS
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_VALUE_MASK = (1 << (64 - BIN_BITS)) - 1
+
+
+def compute_minhash(text):
+    words = _WORD_RE.findall((text or "").lower())
+    hashes = {
+        int.from_bytes(
+            hashlib.blake2b(
+                " ".join(words[i : i + SHINGLE_SIZE]).encode(), digest_size=8
+            ).digest(),
+            "big",
+        )
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+    if len(hashes) < MIN_SHINGLES:
+        return None
+    empty = _VALUE_MASK + 1
+    mins = [empty] * NUM_BINS
+    for value in hashes:
+        index = value >> (64 - BIN_BITS)
+        value &= _VALUE_MASK
+        if value < mins[index]:
+            mins[index] = value
+    for index in range(NUM_BINS):
+        if mins[index] == empty:
+            offset = 1
+            while mins[(index + offset) % NUM_BINS] == empty:
+                offset += 1
+            mins[index] = mins[(index + offset) % NUM_BINS] + offset * empty
+    return array("Q", mins).tobytes()
+
+
+def lsh_buckets(signature):
+    band_size = BAND_ROWS * 8
+    return [
+        int.from_bytes(
+            hashlib.blake2b(
+                signature[band * band_size : (band + 1) * band_size],
+                digest_size=8,
+                person=band.to_bytes(2, "big"),
+            ).digest(),
+            "big",
+            signed=True,
+        )
+        for band in range(NUM_BANDS)
+    ]
+
+
+def _save_fingerprints(JobPost, JobPostLSHBucket, job_posts):
+    JobPost.objects.bulk_update(job_posts, ["jd_minhash"])
+    JobPostLSHBucket.objects.bulk_create(
+        [
+            JobPostLSHBucket(job_post_id=job_post.pk, band=band, bucket=bucket)
+            for job_post in job_posts
+            for band, bucket in enumerate(lsh_buckets(job_post.jd_minhash))
+        ]
+    )
+
+
+def fingerprint_existing_job_posts(apps, schema_editor):
+    JobPost = apps.get_model("jobposts", "JobPost")
+    JobPostLSHBucket = apps.get_model("jobposts", "JobPostLSHBucket")
+    batch = []
+    for job_post in JobPost.objects.only("id", "job_description").iterator(
+        chunk_size=500
+    ):
+        job_post.jd_minhash = compute_minhash(job_post.job_description)
+        if job_post.jd_minhash is not None:
+            batch.append(job_post)
+        if len(batch) == 500:
+            _save_fingerprints(JobPost, JobPostLSHBucket, batch)
+            batch = []
+    if batch:
+        _save_fingerprints(JobPost, JobPostLSHBucket, batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobposts", "0003_remove_jobpost_url_remove_jobpost_user_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="jobpost",
+            name="jd_minhash",
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name="JobPostLSHBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("band", models.PositiveSmallIntegerField()),
+                ("bucket", models.BigIntegerField()),
+                (
+                    "job_post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="lsh_buckets",
+                        to="jobposts.jobpost",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["bucket"], name="jobpost_lsh_bucket_idx")
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="jobpostlshbucket",
+            constraint=models.UniqueConstraint(
+                fields=("job_post", "band"), name="unique_jobpost_lsh_band"
+            ),
+        ),
+        migrations.RunPython(fingerprint_existing_job_posts, migrations.RunPython.noop),
+    ]
@@ -9,6 +9,8 @@ class JobPost(models.Model):
     job_title = models.CharField(max_length=255, blank=True, null=True)
     job_description = models.TextField(blank=True, null=True)
     apply_link = models.URLField(max_length=1024, blank=True, null=True, help_text="Direct link to apply for the job, if different from source_url.")
+    # MinHash of job_description for near-duplicate detection (jobposts/fingerprint.py)
+    jd_minhash = models.BinaryField(null=True, blank=True, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -18,3 +20,20 @@ class JobPost(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+
+
+class JobPostLSHBucket(models.Model):
+    """
+    One LSH band hash of a JobPost's jd_minhash. Job posts sharing any
+    bucket are near-duplicate candidates (buckets are salted per band).
+    """
+
+    job_post = models.ForeignKey(JobPost, on_delete=models.CASCADE, related_name="lsh_buckets")
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["job_post", "band"], name="unique_jobpost_lsh_band")
+        ]
+        indexes = [models.Index(fields=["bucket"], name="jobpost_lsh_bucket_idx")]
@@ -0,0 +1,75 @@
+# backend/jobposts/serializers.py
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import URLValidator
+from rest_framework import serializers
+
+from .ingest import canonicalize_url
+from .models import JobPost
+
+# What the extension's scraper stores when a selector finds nothing
+SCRAPER_MISSING_VALUE = "N/A"
+
+_url_validator = URLValidator(schemes=["http", "https"])
+
+
+class JobPostingIngestSerializer(serializers.Serializer):
+    """
+    One scraped posting, in the extension's scrapedJobDetails shape. Validates
+    to JobPost field names with a canonical source_url; over-long text is cut
+    to the column size and an unusable apply_link is dropped, rather than
+    failing the whole batch.
+    """
+
+    url = serializers.CharField(max_length=4096)
+    title = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    company = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    description = serializers.CharField(
+        required=False, allow_blank=True, allow_null=True, trim_whitespace=False
+    )
+    # Free text, like the other scraped fields: a link that isn't a usable URL
+    # is dropped in to_internal_value instead of failing the batch
+    apply_link = serializers.CharField(
+        required=False, allow_blank=True, allow_null=True
+    )
+
+    def validate_url(self, value):
+        try:
+            url = canonicalize_url(value)
+        except ValueError as exc:
+            raise serializers.ValidationError(str(exc))
+        if len(url) > JobPost._meta.get_field("source_url").max_length:
+            raise serializers.ValidationError("URL is too long.")
+        return url
+
+    def to_internal_value(self, data):
+        attrs = super().to_internal_value(data)
+
+        def text(key, field_name=None):
+            value = attrs.get(key)
+            if not value or value.strip() == SCRAPER_MISSING_VALUE:
+                return None
+            if field_name:
+                value = value.strip()[: JobPost._meta.get_field(field_name).max_length]
+            return value
+
+        def url(key, field_name):
+            value = text(key)
+            # A cut URL points somewhere else, so too long means dropped
+            if (
+                value is None
+                or len(value) > JobPost._meta.get_field(field_name).max_length
+            ):
+                return None
+            try:
+                _url_validator(value)
+            except DjangoValidationError:
+                return None
+            return value
+
+        return {
+            "source_url": attrs["url"],
+            "job_title": text("title", "job_title"),
+            "company_name": text("company", "company_name"),
+            "job_description": text("description"),
+            "apply_link": url("apply_link", "apply_link"),
+        }
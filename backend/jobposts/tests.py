@@ -0,0 +1,198 @@
+import importlib
+
+from django.apps import apps
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+
+from . import fingerprint
+from .ingest import canonicalize_url
+from .models import JobPost, JobPostLSHBucket
+
+backfill = importlib.import_module("jobposts.migrations.0004_jd_fingerprints")
+
+
+class CanonicalizeUrlTests(SimpleTestCase):
+    def assert_canonical(self, url, expected):
+        self.assertEqual(canonicalize_url(url), expected)
+
+    def test_scheme_and_host_case(self):
+        self.assert_canonical(
+            "HTTP://Jobs.Example.COM/Careers/42", "https://jobs.example.com/Careers/42"
+        )
+
+    def test_default_ports(self):
+        for url in ("https://example.com:443/jobs/1", "http://example.com:80/jobs/1"):
+            with self.subTest(url):
+                self.assert_canonical(url, "https://example.com/jobs/1")
+        self.assert_canonical(
+            "https://example.com:8443/jobs/1", "https://example.com:8443/jobs/1"
+        )
+
+    def test_www(self):
+        self.assert_canonical(
+            "https://www.example.com/jobs/1", "https://example.com/jobs/1"
+        )
+
+    def test_trailing_slash(self):
+        self.assert_canonical(
+            "https://example.com/jobs/1/", "https://example.com/jobs/1"
+        )
+        self.assert_canonical(
+            "https://example.com//jobs//1/./", "https://example.com/jobs/1"
+        )
+        self.assert_canonical("https://example.com", "https://example.com/")
+
+    def test_query_sorted_without_tracking_params(self):
+        self.assert_canonical(
+            "https://boards.example.com/jobs?utm_source=li&gh_jid=7&b=2&fbclid=x&a=1&trk=feed",
+            "https://boards.example.com/jobs?a=1&b=2&gh_jid=7",
+        )
+
+    def test_fragment_dropped(self):
+        self.assert_canonical(
+            "https://example.com/jobs/1#apply", "https://example.com/jobs/1"
+        )
+
+    def test_ipv6_host_keeps_brackets(self):
+        self.assert_canonical(
+            "http://[2001:DB8::1]:8080/jobs/1", "https://[2001:db8::1]:8080/jobs/1"
+        )
+        self.assert_canonical("https://[::1]/jobs", "https://[::1]/jobs")
+
+    def test_invalid_urls(self):
+        for url in (
+            "ftp://example.com/job",
+            "/jobs/1",
+            "https://example.com:99999/",
+            "https://example.com:abc/",
+            "http://[::1/",
+        ):
+            with self.subTest(url):
+                with self.assertRaises(ValueError):
+                    canonicalize_url(url)
+
+
+class JobPostIngestTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            email="ada@example.com", password="pw12345!x"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def ingest(self, postings):
+        return self.client.post("/api/job-posts/ingest/", postings, format="json")
+
+    def test_reingest_updates_instead_of_duplicating(self):
+        first = self.ingest(
+            {
+                "url": "https://www.example.com/jobs/1/?utm_source=li",
+                "title": "Engineer",
+                "company": "Acme",
+            }
+        )
+        self.assertEqual(first.status_code, 200)
+        [created] = first.json()["results"]
+        self.assertTrue(created["created"])
+        self.assertEqual(created["source_url"], "https://example.com/jobs/1")
+
+        second = self.ingest(
+            {
+                "url": "HTTP://Example.com:80/jobs/1#apply",
+                "title": "Senior Engineer",
+                "company": "N/A",
+            }
+        )
+        [updated] = second.json()["results"]
+        self.assertFalse(updated["created"])
+        self.assertEqual(updated["id"], created["id"])
+        job_post = JobPost.objects.get()
+        self.assertEqual(job_post.job_title, "Senior Engineer")
+        self.assertEqual(job_post.company_name, "Acme")  # "N/A" never overwrites
+
+    def test_bad_port_is_a_validation_error(self):
+        response = self.ingest({"url": "https://example.com:99999/jobs/1"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), [{"url": ["Enter a URL with a valid port."]}])
+
+    def test_bad_apply_link_does_not_reject_the_batch(self):
+        long_link = "https://example.com/apply?" + "x" * 1024
+        response = self.ingest(
+            [
+                {"url": "https://example.com/jobs/1", "apply_link": "not a url"},
+                {"url": "https://example.com/jobs/2", "apply_link": long_link},
+                {
+                    "url": "https://example.com/jobs/3",
+                    "apply_link": "javascript:apply()",
+                },
+                {
+                    "url": "https://example.com/jobs/4",
+                    "apply_link": "https://example.com/apply/4",
+                },
+            ]
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            dict(JobPost.objects.values_list("source_url", "apply_link")),
+            {
+                "https://example.com/jobs/1": None,
+                "https://example.com/jobs/2": None,
+                "https://example.com/jobs/3": None,
+                "https://example.com/jobs/4": "https://example.com/apply/4",
+            },
+        )
+
+
+DESCRIPTIONS = [
+    "Ship and maintain the payments API used by thousands of merchants. Design"
+    " Python services on PostgreSQL and Kafka, and own on-call for the ledger.",
+    "Registered nurse for our pediatric intensive care unit: assess and monitor"
+    " critically ill infants and children, and administer medications.",
+    "Short text with barely enough words for eight shingles here.",
+    "Too short to fingerprint",
+    "",
+]
+
+
+class FingerprintBackfillTests(TestCase):
+    """Migration 0004 freezes a copy of fingerprint.py; both must agree."""
+
+    def test_frozen_functions_match_live_code(self):
+        for text in DESCRIPTIONS:
+            with self.subTest(text[:20]):
+                signature = fingerprint.compute_minhash(text)
+                self.assertEqual(backfill.compute_minhash(text), signature)
+                if signature is not None:
+                    self.assertEqual(
+                        backfill.lsh_buckets(signature),
+                        fingerprint.lsh_buckets(signature),
+                    )
+
+    def test_backfill_matches_live_fingerprints(self):
+        for index, text in enumerate(DESCRIPTIONS):
+            JobPost.objects.create(
+                source_url=f"https://example.com/jobs/{index}", job_description=text
+            )
+        live = self.fingerprints()
+        self.assertEqual(len(live["buckets"]), 3 * fingerprint.NUM_BANDS)
+
+        JobPostLSHBucket.objects.all().delete()
+        JobPost.objects.update(jd_minhash=None)
+        backfill.fingerprint_existing_job_posts(apps, None)
+
+        self.assertEqual(self.fingerprints(), live)
+
+    def fingerprints(self):
+        return {
+            "minhashes": {
+                job_post_id: minhash and bytes(minhash)
+                for job_post_id, minhash in JobPost.objects.values_list(
+                    "id", "jd_minhash"
+                )
+            },
+            "buckets": set(
+                JobPostLSHBucket.objects.values_list("job_post_id", "band", "bucket")
+            ),
+        }
@@ -0,0 +1,7 @@
+# backend/jobposts/urls.py
+from django.urls import path
+from .views import JobPostIngestView
+
+urlpatterns = [
+    path("job-posts/ingest/", JobPostIngestView.as_view(), name="job-post-ingest"),
+]
@@ -0,0 +1,38 @@
+# backend/jobposts/views.py
+from rest_framework import views, permissions, status
+from rest_framework.response import Response
+
+from .ingest import MAX_INGEST_BATCH, upsert_job_posts
+from .serializers import JobPostingIngestSerializer
+
+
+class JobPostIngestView(views.APIView):
+    """
+    Saves scraped job postings, creating or updating by canonical URL.
+    POST /api/job-posts/ingest/ with one posting, a list of postings, or
+    {"postings": [...]}; each posting is {"url", "title", "company",
+    "description", "apply_link"}. Returns {"results": [{"id", "source_url",
+    "created"}, ...]} in request order.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        postings = request.data
+        if isinstance(postings, dict):
+            postings = postings.get("postings", [postings])
+        if not isinstance(postings, list) or not postings:
+            return Response(
+                {"error": "At least one job posting is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(postings) > MAX_INGEST_BATCH:
+            return Response(
+                {"error": f"At most {MAX_INGEST_BATCH} job postings per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        serializer = JobPostingIngestSerializer(data=postings, many=True)
+        serializer.is_valid(raise_exception=True)
+        results = upsert_job_posts(serializer.validated_data)
+        return Response({"results": results}, status=status.HTTP_200_OK)
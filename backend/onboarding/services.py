@@ -1,37 +1,23 @@
 # backend/onboarding/services.py
+from __future__ import annotations
+
 import os
 import json
 import logging
 import tempfile  # Added for temporary file handling
-from typing import Union  # For type hinting
+from typing import TYPE_CHECKING, Union  # For type hinting
 
-from google import genai
-from google.genai import types
-import textract  # Import textract directly
 from django.core.files.uploadedfile import UploadedFile  # For type checking
 
-logger = logging.getLogger(__name__)
+# All AI calls go through the shared gateway (pooled client + concurrency limits)
+from generation.services import ai_gateway
+from generation.utils.response_parser import extract_json_object, loads_json
 
-# --- AI Client Setup ---
-GENAI_CONFIGURED = False
-client = None
-try:
-    # Ensure API key is correctly fetched from environment variables
-    api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
-    if not api_key:
-        raise RuntimeError(
-            "API Key (GOOGLE_API_KEY or GEMINI_API_KEY) not found in environment variables for GenAI Client."
-        )
-    client = genai.Client(api_key=api_key)
-    GENAI_CONFIGURED = True
-    logger.info(
-        "GenAI Client configured successfully for onboarding service."
-    )  # Use logger
-except Exception as e:
-    logger.error(
-        f"(Onboarding Service) ERROR configuring GenAI Client: {e}"
-    )  # Use logger
-# --- End AI Client Setup ---
+if TYPE_CHECKING:
+    # google.genai and textract are heavy; they are imported where first used
+    from google.genai import types
+
+logger = logging.getLogger(__name__)
 
 
 def _build_gemini_extraction_prompt() -> str:
@@ -178,11 +164,14 @@ def _call_gemini_api(
     model_name: str = "gemini-2.5-pro-preview-05-06",  # Corrected model name, ensure it is valid
 ) -> types.GenerateContentResponse | None:
     """Submits the prompt and resume data to the Gemini API and returns the response."""
+    if not ai_gateway.is_available():
+        logger.error("AI Client not configured. Cannot call Gemini API.")
+        return None
     try:
         logger.info(
             f"Calling Gemini model ({model_name}) to process file content..."
         )  # Use logger
-        response = client.models.generate_content(  # Corrected: client.generate_content for some SDK versions or client.models.generate_content
+        response = ai_gateway.generate_content(
             model=f"models/{model_name}",  # Ensure 'models/' prefix is correct for your SDK version
             contents=[prompt, resume_part],
         )
@@ -253,22 +242,16 @@ def _process_gemini_response(
         )  # Use logger
         return None
 
-    cleaned_json_string = (
-        generated_text.strip()
-        .removeprefix("```json")
-        .removeprefix("```")
-        .removesuffix("```")
-        .strip()
-    )
+    cleaned_json_string, was_repaired = extract_json_object(generated_text)
 
     if not cleaned_json_string:
-        logger.error(
-            "Error: Cleaned JSON string is empty after stripping prefixes/suffixes."
-        )  # Use logger
+        logger.error("Error: No JSON object found in AI response text.")
         return None
+    if was_repaired:
+        logger.warning("Repaired malformed/truncated JSON in AI response.")
 
     try:
-        parsed_data = json.loads(cleaned_json_string)
+        parsed_data = loads_json(cleaned_json_string)
         logger.info("Successfully parsed JSON from AI response.")  # Use logger
         return parsed_data
     except json.JSONDecodeError as e:
@@ -290,7 +273,7 @@ def generate_structured_data_from_file_content(
     """
     Orchestrates the process of generating structured data using AI, accepting either an uploaded file or extracted text.
     """
-    if not GENAI_CONFIGURED or client is None:
+    if not ai_gateway.is_available():
         logger.error("Error: AI Client not configured for processing. Cannot proceed.")
         return None
     if not content_input:
@@ -299,6 +282,8 @@ def generate_structured_data_from_file_content(
         )
         return None
 
+    from google.genai import types
+
     resume_part = None
     try:
         if isinstance(content_input, str):
@@ -366,6 +351,8 @@ def extract_text_from_uploaded_file(uploaded_file: UploadedFile) -> str | None:
     Supports .txt, .pdf, .doc, .docx using textract.
     Returns the extracted text as a string, or None if extraction fails.
     """
+    import textract  # Heavy import, only needed when a file is actually processed
+
     filename = uploaded_file.name
     logger.info(f"Attempting to extract text from file: {filename}")
 
@@ -432,7 +419,7 @@ def extract_contact_details_from_text_snippet(
     Extracts contact details (first_name, last_name, email, phone) from a short text snippet
     using the Gemini API.
     """
-    if not GENAI_CONFIGURED or client is None:
+    if not ai_gateway.is_available():
         logger.error("AI Client not configured. Cannot extract contact details.")
         return None
 
@@ -446,6 +433,8 @@ def extract_contact_details_from_text_snippet(
 
     prompt = _build_contact_extraction_prompt(text_snippet_100_chars)
 
+    from google.genai import types
+
     try:
         # Create a genai.types.Part object from the text snippet.
         text_part = types.Part(text=text_snippet_100_chars)
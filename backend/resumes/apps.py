@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ResumesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'resumes'
+
+    def ready(self):
+        # Registers the base-resume payload cache invalidation receivers
+        from . import cache  # noqa: F401
@@ -0,0 +1,58 @@
+# backend/resumes/cache.py
+# Per-user cache of the serialized base resume, stored as pre-encoded JSON bytes.
+# Entries are dropped by the signal receivers below and are additionally tagged
+# with the ETag they were rendered for, so a write that bypasses signals
+# (e.g. QuerySet.update) can never cause stale bytes to be served.
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from bio.models import Bio, SocialProfile
+
+from .models import Resume
+
+BASE_RESUME_CACHE_TIMEOUT = 60 * 60  # 1 hour in seconds
+
+
+def _base_payload_key(user_id) -> str:
+    return f"base_resume_payload_{user_id}"
+
+
+def get_cached_base_payload(user_id, etag: str) -> bytes | None:
+    """Returns the cached JSON bytes if they were rendered for `etag`, else None."""
+    entry = cache.get(_base_payload_key(user_id))
+    if entry is None or entry["etag"] != etag:
+        return None
+    return entry["body"]
+
+
+def set_cached_base_payload(user_id, etag: str, body: bytes) -> None:
+    cache.set(
+        _base_payload_key(user_id),
+        {"etag": etag, "body": body},
+        BASE_RESUME_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_base_payload(user_id) -> None:
+    if user_id is not None:
+        cache.delete(_base_payload_key(user_id))
+
+
+# --- Invalidation ---
+@receiver([post_save, post_delete], sender=Resume)
+def invalidate_on_resume_change(sender, instance, **kwargs):
+    invalidate_base_payload(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=Bio)
+def invalidate_on_bio_change(sender, instance, **kwargs):
+    invalidate_base_payload(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=SocialProfile)
+def invalidate_on_social_profile_change(sender, instance, **kwargs):
+    user_id = (
+        Bio.objects.filter(pk=instance.bio_id).values_list("user_id", flat=True).first()
+    )
+    invalidate_base_payload(user_id)
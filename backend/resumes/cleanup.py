@@ -0,0 +1,110 @@
+# backend/resumes/cleanup.py
+# Reaps resumes nobody claimed. Every demo upload through the onboarding view
+# saves a Resume with user=None; attach_user_and_set_base adopts it, and the
+# rest would otherwise stay forever. The reaper walks orphans in primary-key
+# order, one short transaction per batch, so it never holds locks for long.
+import time
+from datetime import timedelta
+from functools import partial
+
+import orjson
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Resume
+
+DEFAULT_CLEANUP_SETTINGS = {
+    "TTL_HOURS": 72,  # Orphans younger than this are left for attach-user
+    "BATCH_SIZE": 500,  # Resumes deleted per transaction
+    "ARCHIVE": False,  # Write each deleted batch to storage as NDJSON
+    "ARCHIVE_DIR": "orphaned_resumes",
+}
+
+
+def get_cleanup_setting(name: str):
+    """Reads a key from settings.ORPHAN_RESUME_CLEANUP, falling back to the defaults above."""
+    return getattr(settings, "ORPHAN_RESUME_CLEANUP", {}).get(
+        name, DEFAULT_CLEANUP_SETTINGS[name]
+    )
+
+
+def _orphans(cutoff):
+    return Resume.objects.filter(user__isnull=True, created_at__lt=cutoff)
+
+
+def _archive_name(run_name: str, batch_number: int) -> str:
+    return f"{get_cleanup_setting('ARCHIVE_DIR')}/{run_name}/{batch_number:05d}.ndjson"
+
+
+def _save_archive(name: str, rows: list, archives: list) -> None:
+    content = b"".join(orjson.dumps(row) + b"\n" for row in rows)
+    archives.append(default_storage.save(name, ContentFile(content)))
+
+
+def reap_orphaned_resumes(
+    ttl_hours=None,
+    batch_size=None,
+    archive=None,
+    dry_run: bool = False,
+    pause: float = 0,
+    on_batch=None,
+) -> dict:
+    """
+    Deletes (optionally archiving them) resumes with no user that are older
+    than the TTL. Each batch re-checks user IS NULL inside its transaction, so
+    a resume attached mid-run is never removed. Returns run statistics;
+    `on_batch(stats)` is called after every batch for progress reporting.
+    """
+    ttl_hours = get_cleanup_setting("TTL_HOURS") if ttl_hours is None else ttl_hours
+    batch_size = batch_size or get_cleanup_setting("BATCH_SIZE")
+    archive = get_cleanup_setting("ARCHIVE") if archive is None else archive
+    cutoff = timezone.now() - timedelta(hours=ttl_hours)
+    run_name = timezone.now().strftime("%Y%m%dT%H%M%S")
+
+    stats = {"scanned": 0, "deleted": 0, "batches": 0, "archives": [], "seconds": 0.0}
+    started = time.monotonic()
+    last_pk = None
+    while True:
+        # Keyset walk over the partial resume_orphan_idx index
+        batch = _orphans(cutoff).order_by("pk")
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+        ids = list(batch.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            break
+        last_pk = ids[-1]
+        stats["scanned"] += len(ids)
+        stats["batches"] += 1
+
+        if not dry_run:
+            with transaction.atomic():
+                orphans = _orphans(cutoff).filter(pk__in=ids)
+                if archive:
+                    # Read under the row locks, written to storage only once the
+                    # delete has committed: storage I/O never runs inside the
+                    # transaction, and a rolled-back batch leaves no archive
+                    rows = list(orphans.select_for_update().values())
+                    transaction.on_commit(
+                        partial(
+                            _save_archive,
+                            _archive_name(run_name, stats["batches"]),
+                            rows,
+                            stats["archives"],
+                        )
+                    )
+                _, deleted = orphans.delete()
+            stats["deleted"] += deleted.get(Resume._meta.label, 0)
+
+        stats["seconds"] = time.monotonic() - started
+        if on_batch is not None:
+            on_batch(stats)
+        if len(ids) < batch_size:
+            break
+        if pause:
+            time.sleep(pause)  # Give replication/other writers room between batches
+
+    stats["seconds"] = time.monotonic() - started
+    return stats
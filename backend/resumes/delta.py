@@ -0,0 +1,109 @@
+# backend/resumes/delta.py
+# Structural diff/patch for resume JSON. A delta node is one of:
+#   {"v": value}                      replace with a literal value
+#   {"o": {key: node}, "r": [keys]}   patch an object (changed/added keys, removed keys)
+#                                     plus "k": [keys] when the key order changed
+#   {"a": [entry, ...]}               rebuild a list; an entry is an int (copy base[i]),
+#                                     {"p": i, "x": node} (patch base[i]) or {"v": value}
+# An empty delta ({} or None) means "identical to base".
+import copy
+
+import orjson
+
+
+def _encode(value) -> bytes:
+    return orjson.dumps(value)
+
+
+def diff(base, target) -> dict | None:
+    """Returns the delta turning `base` into `target`, or None if they are equal."""
+    if _encode(base) == _encode(target):
+        return None
+    return _smallest(_diff_node(base, target), target)
+
+
+def _smallest(node: dict, target) -> dict:
+    """Falls back to a literal when the structural delta isn't actually smaller."""
+    if "v" in node:
+        return node
+    literal = {"v": target}
+    return literal if len(_encode(node)) >= len(_encode(literal)) else node
+
+
+def _diff_node(base, target) -> dict:
+    if isinstance(base, dict) and isinstance(target, dict):
+        changes = {}
+        for key, value in target.items():
+            if key in base:
+                child = diff(base[key], value)
+                if child is not None:
+                    changes[key] = child
+            else:
+                changes[key] = {"v": value}
+        node = {"o": changes}
+        removed = [key for key in base if key not in target]
+        if removed:
+            node["r"] = removed
+        # Keep the target's key order so materialized JSON renders identically
+        kept = [key for key in base if key in target]
+        kept += [key for key in target if key not in base]
+        if kept != list(target):
+            node["k"] = list(target)
+        return node
+
+    if isinstance(base, list) and isinstance(target, list):
+        # Items copied verbatim from the base (possibly reordered) become indexes
+        base_index = {}
+        for position, item in enumerate(base):
+            base_index.setdefault(_encode(item), position)
+        entries = []
+        for position, item in enumerate(target):
+            match = base_index.get(_encode(item))
+            if match is not None:
+                entries.append(match)
+                continue
+            if (
+                position < len(base)
+                and isinstance(item, (dict, list))
+                and type(base[position]) is type(item)
+            ):
+                child = diff(base[position], item)
+                if "v" not in child:
+                    entries.append({"p": position, "x": child})
+                    continue
+            entries.append({"v": item})
+        return {"a": entries}
+
+    return {"v": target}
+
+
+def apply(base, node):
+    """Materializes `node` against `base`. `base` is never mutated."""
+    if not node:
+        return base
+    if "v" in node:
+        return node["v"]
+    if "o" in node:
+        result = dict(base)
+        for key in node.get("r", ()):
+            result.pop(key, None)
+        for key, child in node["o"].items():
+            result[key] = apply(base.get(key), child)
+        if "k" in node:
+            result = {key: result[key] for key in node["k"]}
+        return result
+    if "a" in node:
+        result = []
+        used = set()
+        for entry in node["a"]:
+            if isinstance(entry, int):
+                item = base[entry]
+                # The same base item referenced twice must not share one object
+                result.append(copy.deepcopy(item) if entry in used else item)
+                used.add(entry)
+            elif "p" in entry:
+                result.append(apply(base[entry["p"]], entry["x"]))
+            else:
+                result.append(entry["v"])
+        return result
+    raise ValueError(f"Unknown delta node: {sorted(node)}")
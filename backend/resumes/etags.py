@@ -0,0 +1,67 @@
+# backend/resumes/etags.py
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+from .models import Resume
+
+# Values that change whenever a ResumeSerializer payload (which merges Bio
+# basics and social profiles) would change.
+FRESHNESS_FIELDS = ("id", "updated_at", "user__bio__updated_at")
+
+
+def _freshness_queryset():
+    return Resume.objects.values(*FRESHNESS_FIELDS).annotate(
+        profiles_updated_at=Max("user__bio__social_profiles__updated_at"),
+        profiles_count=Count("user__bio__social_profiles"),
+    )
+
+
+def get_resume_freshness(user, resume_id) -> dict | None:
+    """Single query for the values a resume detail ETag is derived from."""
+    try:
+        return _freshness_queryset().filter(pk=resume_id, user=user).first()
+    except (ValidationError, ValueError):
+        return None  # Malformed id: let the regular lookup return its 404
+
+
+def get_base_resume_freshness(user) -> dict | None:
+    """Single query for the id and updated_at of the user's base resume."""
+    return (
+        Resume.objects.filter(user=user, is_base_resume=True)
+        .values("id", "updated_at")
+        .first()
+    )
+
+
+def build_etag(freshness: dict, variant: str) -> str:
+    """Strong ETag from the freshness values; `variant` separates payload shapes."""
+    raw = "|".join(
+        [variant] + [str(freshness[key]) for key in sorted(freshness.keys())]
+    )
+    return quote_etag(hashlib.sha256(raw.encode("utf-8")).hexdigest()[:40])
+
+
+def get_not_modified_response(request, etag: str):
+    """Returns a 304 response if the request's If-None-Match matches, else None."""
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        return None
+    return set_etag_headers(response, etag)
+
+
+def get_precondition_failed_response(request, etag: str):
+    """For writes: returns a 412 response if If-Match names another version, else None."""
+    return get_not_modified_response(
+        request, etag
+    )  # Django answers 412 for unsafe methods
+
+
+def set_etag_headers(response, etag: str):
+    """Attaches the ETag and makes clients revalidate instead of reusing blindly."""
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
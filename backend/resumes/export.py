@@ -0,0 +1,115 @@
+# backend/resumes/export.py
+# Streaming export of everything we hold for a user: Bio, resumes and the job
+# posts they are associated with. Rows are read with chunked iterator() queries
+# and encoded one record at a time, so memory stays flat however many resumes
+# the user has. Used by ResumeViewSet.export and the export_user_data command.
+import zipfile
+
+import orjson
+
+from bio.models import Bio
+from bio.serializers import BioSerializer
+from jobposts.models import JobPost
+
+from .models import Resume
+
+EXPORT_CHUNK_SIZE = 500  # Rows fetched per database round trip
+NDJSON_FLUSH_BYTES = 64 * 1024  # Bytes buffered before a chunk is yielded
+
+# Delta-storage internals are left out: content is exported materialized
+RESUME_EXPORT_EXCLUDE = {"storage_mode", "base_snapshot", "content_delta"}
+RESUME_EXPORT_FIELDS = [
+    field.attname
+    for field in Resume._meta.concrete_fields
+    if field.name not in RESUME_EXPORT_EXCLUDE
+]
+# The near-duplicate fingerprint is derived data (jobposts/fingerprint.py)
+JOB_POST_EXPORT_EXCLUDE = {"jd_minhash"}
+JOB_POST_EXPORT_FIELDS = [
+    field.attname
+    for field in JobPost._meta.concrete_fields
+    if field.name not in JOB_POST_EXPORT_EXCLUDE
+]
+
+
+def iter_export_records(user, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """Yields (record_type, record_id, data) for the user's Bio, resumes and job posts."""
+    bio = Bio.objects.prefetch_related("social_profiles").filter(user=user).first()
+    if bio is not None:
+        yield "bio", bio.id, BioSerializer(bio).data
+
+    resumes = Resume.objects.filter(user=user).order_by("created_at", "id")
+    for resume in resumes.iterator(chunk_size=chunk_size):
+        yield "resume", resume.id, {
+            name: getattr(resume, name) for name in RESUME_EXPORT_FIELDS
+        }
+
+    job_posts = (
+        JobPost.objects.filter(associated_resumes__user=user)
+        .distinct()
+        .order_by("created_at", "id")
+        .values(*JOB_POST_EXPORT_FIELDS)
+    )
+    for job_post in job_posts.iterator(chunk_size=chunk_size):
+        yield "job_post", job_post["id"], job_post
+
+
+def _encode(data) -> bytes:
+    # orjson handles UUIDs, datetimes and dates natively
+    return orjson.dumps(data)
+
+
+def stream_ndjson(user, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """One JSON object per line: {"type": ..., "data": {...}}."""
+    buffer = bytearray()
+    for record_type, _, data in iter_export_records(user, chunk_size):
+        buffer += _encode({"type": record_type, "data": data})
+        buffer += b"\n"
+        if len(buffer) >= NDJSON_FLUSH_BYTES:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+class _StreamBuffer:
+    """Write-only, unseekable file object that ZipFile writes into; drained after each entry."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(user, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """ZIP with bio.json, resumes/<id>.json and job_posts/<id>.json, built on the fly."""
+    buffer = _StreamBuffer()
+    # An unseekable target makes ZipFile use data descriptors instead of seeking back
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for record_type, record_id, data in iter_export_records(user, chunk_size):
+            name = (
+                "bio.json"
+                if record_type == "bio"
+                else f"{record_type}s/{record_id}.json"
+            )
+            archive.writestr(name, _encode(data))
+            chunk = buffer.drain()
+            if chunk:
+                yield chunk
+    yield buffer.drain()  # Central directory
+
+
+EXPORT_FORMATS = {
+    "ndjson": (stream_ndjson, "application/x-ndjson", "ndjson"),
+    "zip": (stream_zip, "application/zip", "zip"),
+}
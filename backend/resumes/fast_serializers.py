@@ -0,0 +1,130 @@
+# backend/resumes/fast_serializers.py
+# Read-only fast paths for the hottest resume responses. Each function builds
+# exactly the dict its DRF serializer would (same keys, order and value
+# formatting) without instantiating serializers or deep-copying their fields.
+# Keep them in step with the serializer named in each docstring.
+from rest_framework import serializers
+
+from .serializers import build_basics, get_bio_entry
+
+# One shared field instance: output follows DATETIME_FORMAT and the current
+# timezone, exactly like the serializers' DateTimeFields
+_datetime_field = serializers.DateTimeField(read_only=True)
+
+
+def _datetime(value):
+    return None if value is None else _datetime_field.to_representation(value)
+
+
+def _uuid(value):
+    return None if value is None else str(value)
+
+
+def _str(value):
+    return None if value is None else str(value)
+
+
+# --- ResumeListSerializer ---
+RESUME_LIST_VALUES = (
+    "id",
+    "name",
+    "is_base_resume",
+    "source_company_name",
+    "updated_at",
+)
+
+
+def serialize_resume_list_item(row) -> dict:
+    """ResumeListSerializer output from a `.values(*RESUME_LIST_VALUES)` row."""
+    return {
+        "id": _uuid(row["id"]),
+        "name": _str(row["name"]),
+        "is_base_resume": row["is_base_resume"],
+        "source_company_name": _str(row["source_company_name"]),
+        "updated_at": _datetime(row["updated_at"]),
+    }
+
+
+# --- RecentApplicationItemSerializer ---
+RECENT_APPLICATION_VALUES = (
+    "id",
+    "name",
+    "updated_at",
+    "is_base_resume",
+    "associated_job_post_id",
+    "associated_job_post__job_title",
+    "associated_job_post__company_name",
+    "associated_job_post__source_url",
+    "associated_job_post__apply_link",
+)
+
+
+def serialize_recent_application(row) -> dict:
+    """RecentApplicationItemSerializer output from a `.values(*RECENT_APPLICATION_VALUES)` row."""
+    job_post = None
+    if row["associated_job_post_id"] is not None:
+        job_post = {
+            "id": _uuid(row["associated_job_post_id"]),
+            "job_title": _str(row["associated_job_post__job_title"]),
+            "company_name": _str(row["associated_job_post__company_name"]),
+            "source_url": _str(row["associated_job_post__source_url"]),
+            "apply_link": _str(row["associated_job_post__apply_link"]),
+        }
+    return {
+        "resume_id": _uuid(row["id"]),
+        "resume_name": _str(row["name"]),
+        "resume_updated_at": _datetime(row["updated_at"]),
+        "job_post": job_post,
+        "is_base_resume": row["is_base_resume"],
+    }
+
+
+# --- ResumeSerializer ---
+def _serialize_social_profile(profile) -> dict:
+    """SocialProfileSerializer output."""
+    return {
+        "id": profile.id,
+        "network": _str(profile.network),
+        "username": _str(profile.username),
+        "url": _str(profile.url),
+        "created_at": _datetime(profile.created_at),
+        "updated_at": _datetime(profile.updated_at),
+    }
+
+
+def serialize_resume(resume, context: dict | None = None) -> dict:
+    """
+    ResumeSerializer output for a Resume instance. Shares the serializer's
+    per-user Bio cache, so pass one `context` dict when serializing many.
+    """
+    context = {} if context is None else context
+    entry = get_bio_entry(resume, context)
+    if entry is None:
+        basics = {}
+        bio = None
+    else:
+        bio = entry["bio"]
+        if entry["profiles"] is None:
+            entry["profiles"] = [
+                _serialize_social_profile(profile)
+                for profile in bio.social_profiles.all()
+            ]
+        basics = build_basics(entry)
+    return {
+        "id": _uuid(resume.id),
+        "name": _str(resume.name),
+        "is_base_resume": resume.is_base_resume,
+        "source_job_description": _str(resume.source_job_description),
+        "source_job_url": _str(resume.source_job_url),
+        "source_company_name": _str(resume.source_company_name),
+        "summary": _str(resume.summary),
+        "work": resume.work,
+        "projects": resume.projects,
+        "skills": resume.skills,
+        "basics": basics,
+        "education": bio.base_education_json if bio else [],
+        "languages": bio.base_languages_json if bio else [],
+        "certificates": bio.base_certificates_json if bio else [],
+        "created_at": _datetime(resume.created_at),
+        "updated_at": _datetime(resume.updated_at),
+    }
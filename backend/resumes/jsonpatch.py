@@ -0,0 +1,252 @@
+# backend/resumes/jsonpatch.py
+# RFC 6902 JSON Patch (with RFC 6901 JSON Pointers) for the editable JSON of a
+# resume, so editing one bullet sends one small operation instead of the whole
+# section. Operations are applied to copies; nothing is written until every
+# operation has succeeded and the result has been validated.
+import copy
+import re
+
+from backend.fast_json import OrjsonParser
+
+JSON_PATCH_MEDIA_TYPE = "application/json-patch+json"
+MAX_OPERATIONS = 100
+
+# Top-level members a patch may address, with the JSON types each may hold
+PATCHABLE_FIELDS = {
+    "name": (str,),
+    "summary": (str, type(None)),
+    "work": (list,),
+    "projects": (list,),
+    "skills": (list, dict),  # Category list, or {} on older base resumes
+}
+
+JSON_TYPE_NAMES = {str: "string", type(None): "null", list: "array", dict: "object"}
+
+OPERATIONS = {"add", "remove", "replace", "move", "copy", "test"}
+
+# RFC 6901 array index: ASCII digits without leading zeros. str.isdigit() would
+# also accept other scripts' digits ("١") and superscripts ("²"), which int()
+# then rejects or reads differently.
+ARRAY_INDEX_RE = re.compile(r"0|[1-9][0-9]*")
+
+
+class JsonPatchError(ValueError):
+    """Raised for a malformed patch or an operation that cannot be applied."""
+
+
+class JsonPatchTestFailed(JsonPatchError):
+    """Raised when a "test" operation does not match the current document."""
+
+
+class JsonPatchParser(OrjsonParser):
+    """Accepts PATCH bodies sent as application/json-patch+json."""
+
+    media_type = JSON_PATCH_MEDIA_TYPE
+
+
+def is_json_patch(request) -> bool:
+    return (request.content_type or "").split(";")[0].strip() == JSON_PATCH_MEDIA_TYPE
+
+
+# --- JSON Pointer (RFC 6901) ---
+def parse_pointer(pointer) -> list:
+    if not isinstance(pointer, str):
+        raise JsonPatchError("JSON Pointer must be a string.")
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON Pointer '{pointer}'.")
+    return [
+        token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")
+    ]
+
+
+def _list_index(container: list, token: str, pointer: str, allow_end: bool) -> int:
+    if allow_end and token == "-":
+        return len(container)
+    if not ARRAY_INDEX_RE.fullmatch(token):
+        raise JsonPatchError(f"Invalid array index '{token}' in '{pointer}'.")
+    index = int(token)
+    limit = len(container) if allow_end else len(container) - 1
+    if index > limit:
+        raise JsonPatchError(f"Array index out of range in '{pointer}'.")
+    return index
+
+
+def _resolve(document, tokens: list, pointer: str):
+    """Walks to the value the tokens point at."""
+    value = document
+    for token in tokens:
+        if isinstance(value, dict):
+            if token not in value:
+                raise JsonPatchError(f"Path '{pointer}' does not exist.")
+            value = value[token]
+        elif isinstance(value, list):
+            value = value[_list_index(value, token, pointer, allow_end=False)]
+        else:
+            raise JsonPatchError(f"Path '{pointer}' does not exist.")
+    return value
+
+
+def _resolve_parent(document, tokens: list, pointer: str):
+    if not tokens:
+        raise JsonPatchError("Operations on the whole document are not supported.")
+    parent = _resolve(document, tokens[:-1], pointer)
+    if not isinstance(parent, (dict, list)):
+        raise JsonPatchError(f"Path '{pointer}' does not exist.")
+    return parent, tokens[-1]
+
+
+# --- Operations ---
+def _add(document, tokens: list, pointer: str, value) -> None:
+    parent, token = _resolve_parent(document, tokens, pointer)
+    if isinstance(parent, dict):
+        parent[token] = value
+    else:
+        parent.insert(_list_index(parent, token, pointer, allow_end=True), value)
+
+
+def _remove(document, tokens: list, pointer: str):
+    parent, token = _resolve_parent(document, tokens, pointer)
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Path '{pointer}' does not exist.")
+        return parent.pop(token)
+    return parent.pop(_list_index(parent, token, pointer, allow_end=False))
+
+
+def _replace(document, tokens: list, pointer: str, value) -> None:
+    parent, token = _resolve_parent(document, tokens, pointer)
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Path '{pointer}' does not exist.")
+        parent[token] = value
+    else:
+        parent[_list_index(parent, token, pointer, allow_end=False)] = value
+
+
+def _json_equal(left, right) -> bool:
+    """Equality by JSON type: unlike ==, true != 1 and "1" != 1."""
+    if isinstance(left, bool) or isinstance(right, bool):
+        return type(left) is type(right) and left == right
+    if isinstance(left, (int, float)) and isinstance(right, (int, float)):
+        return left == right
+    if type(left) is not type(right):
+        return False
+    if isinstance(left, dict):
+        return left.keys() == right.keys() and all(
+            _json_equal(value, right[key]) for key, value in left.items()
+        )
+    if isinstance(left, list):
+        return len(left) == len(right) and all(
+            _json_equal(a, b) for a, b in zip(left, right)
+        )
+    return left == right
+
+
+def _get_member(operation: dict, member: str):
+    if member not in operation:
+        raise JsonPatchError(f"'{operation['op']}' operation requires '{member}'.")
+    return operation[member]
+
+
+def apply_patch(document: dict, operations) -> dict:
+    """
+    Applies RFC 6902 operations to `document` and returns the patched copy.
+    The input is left untouched, also when an operation fails halfway.
+    """
+    if not isinstance(operations, list):
+        raise JsonPatchError("A JSON Patch document must be an array of operations.")
+    if len(operations) > MAX_OPERATIONS:
+        raise JsonPatchError(
+            f"A patch may contain at most {MAX_OPERATIONS} operations."
+        )
+
+    document = copy.deepcopy(document)
+    for operation in operations:
+        if not isinstance(operation, dict) or operation.get("op") not in OPERATIONS:
+            raise JsonPatchError(
+                f"Invalid operation. Allowed ops: {', '.join(sorted(OPERATIONS))}."
+            )
+        op = operation["op"]
+        pointer = _get_member(operation, "path")
+        tokens = parse_pointer(pointer)
+
+        if op == "add":
+            _add(
+                document,
+                tokens,
+                pointer,
+                copy.deepcopy(_get_member(operation, "value")),
+            )
+        elif op == "remove":
+            _remove(document, tokens, pointer)
+        elif op == "replace":
+            _replace(
+                document,
+                tokens,
+                pointer,
+                copy.deepcopy(_get_member(operation, "value")),
+            )
+        elif op == "test":
+            if not _json_equal(
+                _resolve(document, tokens, pointer), _get_member(operation, "value")
+            ):
+                raise JsonPatchTestFailed(f"Test failed at '{pointer}'.")
+        else:  # move / copy
+            source = _get_member(operation, "from")
+            source_tokens = parse_pointer(source)
+            if op == "move":
+                if (
+                    tokens[: len(source_tokens)] == source_tokens
+                    and tokens != source_tokens
+                ):
+                    raise JsonPatchError(f"Cannot move '{source}' into its own child.")
+                value = _remove(document, source_tokens, source)
+            else:
+                value = copy.deepcopy(_resolve(document, source_tokens, source))
+            _add(document, tokens, pointer, value)
+    return document
+
+
+# --- Resume documents ---
+def get_patched_fields(operations) -> set:
+    """
+    The resume fields the operations touch; only these are copied and saved.
+    Every path must stay inside PATCHABLE_FIELDS and may not drop a whole field.
+    """
+    if not isinstance(operations, list):
+        raise JsonPatchError("A JSON Patch document must be an array of operations.")
+    fields = set()
+    for operation in operations:
+        if not isinstance(operation, dict):
+            raise JsonPatchError("Each operation must be an object.")
+        for member in ("path", "from"):
+            if member not in operation:
+                continue
+            tokens = parse_pointer(operation[member])
+            if not tokens or tokens[0] not in PATCHABLE_FIELDS:
+                raise JsonPatchError(
+                    f"Path '{operation[member]}' is not editable. "
+                    f"Editable fields: {', '.join(PATCHABLE_FIELDS)}."
+                )
+            if len(tokens) == 1 and (
+                operation.get("op") == "remove"
+                or (operation.get("op") == "move" and member == "from")
+            ):
+                raise JsonPatchError(f"Field '{tokens[0]}' cannot be removed.")
+            fields.add(tokens[0])
+    return fields
+
+
+def patch_resume_fields(resume, operations) -> dict:
+    """Returns {field: patched value} for the fields `operations` touch."""
+    fields = get_patched_fields(operations)
+    document = {field: getattr(resume, field) for field in fields}
+    patched = apply_patch(document, operations)
+    for field, value in patched.items():
+        expected = PATCHABLE_FIELDS[field]
+        if not isinstance(value, expected):
+            names = " or ".join(JSON_TYPE_NAMES[kind] for kind in expected)
+            raise JsonPatchError(f"Field '{field}' must remain a JSON {names}.")
+    return patched
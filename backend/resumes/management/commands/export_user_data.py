@@ -0,0 +1,56 @@
+# backend/resumes/management/commands/export_user_data.py
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from resumes.export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS
+
+
+class Command(BaseCommand):
+    help = (
+        "Streams a user's Bio, resumes and job posts as NDJSON or a ZIP of JSON files."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("email", help="Email of the user to export.")
+        parser.add_argument(
+            "--format",
+            dest="export_format",
+            choices=sorted(EXPORT_FORMATS),
+            default="ndjson",
+        )
+        parser.add_argument(
+            "--output",
+            "-o",
+            help="File to write to (defaults to stdout).",
+        )
+        parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(email__iexact=options["email"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['email']} not found.")
+
+        stream, _, _ = EXPORT_FORMATS[options["export_format"]]
+        output_path = options["output"]
+        target = open(output_path, "wb") if output_path else sys.stdout.buffer
+        written = 0
+        try:
+            for chunk in stream(user, chunk_size=options["chunk_size"]):
+                target.write(chunk)
+                written += len(chunk)
+        finally:
+            if output_path:
+                target.close()
+            else:
+                target.flush()
+
+        if output_path:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Exported {written} bytes for {user.email} to {output_path}."
+                )
+            )
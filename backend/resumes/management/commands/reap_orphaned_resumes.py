@@ -0,0 +1,74 @@
+# backend/resumes/management/commands/reap_orphaned_resumes.py
+from django.core.management.base import BaseCommand, CommandError
+
+from resumes.cleanup import get_cleanup_setting, reap_orphaned_resumes
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes anonymous (user-less) resumes older than a TTL, in primary-key "
+        "batches. Meant to run periodically, e.g. hourly from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ttl-hours",
+            type=float,
+            default=get_cleanup_setting("TTL_HOURS"),
+            help="Only reap orphans created more than this many hours ago.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=get_cleanup_setting("BATCH_SIZE")
+        )
+        parser.add_argument(
+            "--archive",
+            action="store_true",
+            default=get_cleanup_setting("ARCHIVE"),
+            help="Write each batch to storage as NDJSON before deleting it.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="Seconds to sleep between batches.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Count what would be reaped without deleting anything.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        verbose = options["verbosity"] > 1
+
+        def report(stats):
+            if verbose:
+                self.stdout.write(
+                    f"Batch {stats['batches']} done: {stats['scanned']} scanned, "
+                    f"{stats['deleted']} deleted so far."
+                )
+
+        stats = reap_orphaned_resumes(
+            ttl_hours=options["ttl_hours"],
+            batch_size=options["batch_size"],
+            archive=options["archive"],
+            dry_run=options["dry_run"],
+            pause=options["pause"],
+            on_batch=report,
+        )
+        seconds = stats["seconds"]
+        count = stats["scanned"] if options["dry_run"] else stats["deleted"]
+        verb = "Would reap" if options["dry_run"] else "Reaped"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {count} orphaned resumes in {stats['batches']} batches, "
+                f"{seconds:.1f}s ({count / seconds if seconds else 0:.0f}/s)."
+            )
+        )
+        if stats["archives"]:
+            archive_dir = get_cleanup_setting("ARCHIVE_DIR")
+            self.stdout.write(
+                f"Archived {len(stats['archives'])} batch files under {archive_dir}/."
+            )
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-19 13:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resumes", "0003_resume_tracking_link"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="resume",
+            index=models.Index(
+                fields=["user", "-is_base_resume", "-updated_at", "-id"],
+                name="resume_user_list_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="resume",
+            index=models.Index(
+                condition=models.Q(("associated_job_post__isnull", False)),
+                fields=["user", "-updated_at", "-id"],
+                name="resume_user_applications_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resumes", "0004_resume_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ResumeSnapshot",
+            fields=[
+                (
+                    "content_hash",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ("data", models.JSONField(default=dict)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="resume",
+            name="content_delta",
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="resume",
+            name="storage_mode",
+            field=models.CharField(
+                choices=[
+                    ("full", "Full copy"),
+                    ("delta", "Delta against base snapshot"),
+                ],
+                default="full",
+                max_length=10,
+            ),
+        ),
+        migrations.CreateModel(
+            name="ResumeVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("number", models.PositiveIntegerField()),
+                ("changed_fields", models.JSONField(default=list)),
+                ("delta", models.JSONField(default=dict)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "resume",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="versions",
+                        to="resumes.resume",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-number"],
+            },
+        ),
+        migrations.AddField(
+            model_name="resume",
+            name="base_snapshot",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="resumes",
+                to="resumes.resumesnapshot",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="resumeversion",
+            constraint=models.UniqueConstraint(
+                fields=("resume", "number"), name="unique_resume_version_number"
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resumes", "0005_resume_delta_storage"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="resume",
+            index=models.Index(
+                condition=models.Q(("user__isnull", True)),
+                fields=["id", "created_at"],
+                name="resume_orphan_idx",
+            ),
+        ),
+    ]
@@ -9,7 +9,30 @@ from django.db.models import Q  # For constraints condition
 from jobposts.models import JobPost
 
 
+class ResumeSnapshot(models.Model):
+    """
+    Immutable, content-addressed copy of a base resume's content sections.
+    Delta-stored tailored resumes are diffs against one of these, so editing or
+    deleting the live base resume never changes them.
+    """
+
+    # sha256 of the content; the key itself, so cached copies can never go stale
+    content_hash = models.CharField(max_length=64, primary_key=True)
+    data = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Snapshot {self.content_hash[:12]}"
+
+
 class Resume(models.Model):
+    STORAGE_FULL = "full"
+    STORAGE_DELTA = "delta"
+    STORAGE_MODE_CHOICES = [
+        (STORAGE_FULL, "Full copy"),
+        (STORAGE_DELTA, "Delta against base snapshot"),
+    ]
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,  # Use settings.AUTH_USER_MODEL
@@ -85,10 +108,43 @@ class Resume(models.Model):
         blank=True, null=True
     )  # Stores text analysis of the original resume
 
+    # Optional delta storage (resumes/storage.py): summary/work/projects/skills
+    # are kept as a structural diff against base_snapshot and materialized on load
+    storage_mode = models.CharField(
+        max_length=10, choices=STORAGE_MODE_CHOICES, default=STORAGE_FULL
+    )
+    base_snapshot = models.ForeignKey(
+        ResumeSnapshot,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="resumes",
+    )
+    content_delta = models.JSONField(null=True, blank=True)
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        from .storage import on_resume_loaded
+
+        on_resume_loaded(instance)
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        from .storage import on_resume_refreshed
+
+        on_resume_refreshed(self, fields)
+
+    def save(self, *args, **kwargs):
+        from .storage import save_resume
+
+        save_resume(self, super().save, *args, **kwargs)
+
     def __str__(self):
         base_marker = "[BASE]" if self.is_base_resume else ""
         # CustomUser's __str__ returns email, or use user.email directly
@@ -104,3 +160,49 @@ class Resume(models.Model):
                 name="unique_base_resume_per_user",
             )
         ]
+        indexes = [
+            # Backs keyset pagination of ResumeViewSet.list
+            models.Index(
+                fields=["user", "-is_base_resume", "-updated_at", "-id"],
+                name="resume_user_list_idx",
+            ),
+            # Backs keyset pagination of RecentApplicationsListView
+            models.Index(
+                fields=["user", "-updated_at", "-id"],
+                name="resume_user_applications_idx",
+                condition=Q(associated_job_post__isnull=False),
+            ),
+            # Backs the orphaned-resume reaper's primary-key walk (resumes/cleanup.py)
+            models.Index(
+                fields=["id", "created_at"],
+                name="resume_orphan_idx",
+                condition=Q(user__isnull=True),
+            ),
+        ]
+
+
+class ResumeVersion(models.Model):
+    """
+    One edit of a tailored resume. `delta` turns the content saved by this edit
+    back into the content it replaced (see resumes/delta.py), so history costs
+    only the size of the change.
+    """
+
+    resume = models.ForeignKey(
+        Resume, on_delete=models.CASCADE, related_name="versions"
+    )
+    number = models.PositiveIntegerField()
+    changed_fields = models.JSONField(default=list)
+    delta = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.resume_id} v{self.number}"
+
+    class Meta:
+        ordering = ["-number"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["resume", "number"], name="unique_resume_version_number"
+            )
+        ]
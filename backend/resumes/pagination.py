@@ -0,0 +1,141 @@
+# backend/resumes/pagination.py
+import base64
+import json
+from functools import reduce
+
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward-only keyset (seek) pagination over a composite ordering.
+    The cursor encodes the ordering values of the last row of the page, and the
+    next page is fetched with a `WHERE (ordering) < (cursor)` filter instead of
+    OFFSET, with no COUNT(*), so every page costs the same however deep it is.
+    The ordering must end in a unique field (e.g. "id") and should be backed by
+    a matching composite index.
+    """
+
+    ordering = ("-updated_at", "-id")
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.model = queryset.model
+
+        queryset = queryset.order_by(*self.ordering)
+        cursor_values = self.decode_cursor(request)
+        if cursor_values is not None:
+            queryset = queryset.filter(self._build_seek_filter(cursor_values))
+
+        # Fetch one extra row to know whether a next page exists
+        rows = list(queryset[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next:
+            return None
+        last_row = self.page[-1]
+        names = [field_name.lstrip("-") for field_name in self.ordering]
+        if isinstance(last_row, dict):  # Page of .values() rows
+            values = [last_row[name] for name in names]
+        else:
+            values = [getattr(last_row, name) for name in names]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(values)
+        )
+
+    def encode_cursor(self, values: list) -> str:
+        payload = json.dumps(
+            [
+                value if isinstance(value, (bool, int)) else str(value)
+                for value in values
+            ]
+        )
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+    def decode_cursor(self, request) -> list | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw_values = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            if len(raw_values) != len(self.ordering):
+                raise ValueError("Cursor length does not match ordering.")
+            values = [
+                self.model._meta.get_field(field_name.lstrip("-")).to_python(value)
+                for field_name, value in zip(self.ordering, raw_values)
+            ]
+            if None in values:  # Can't be compared against in the seek filter
+                raise ValueError("Cursor contains a null value.")
+            return values
+        except Exception:
+            # A client error, like any other malformed query parameter
+            raise ValidationError(
+                {self.cursor_query_param: self.invalid_cursor_message}
+            )
+
+    def _build_seek_filter(self, cursor_values: list) -> Q:
+        """
+        Lexicographic "comes after the cursor" filter, e.g. for (-a, -b):
+        (a < va) OR (a = va AND b < vb).
+        """
+        conditions = []
+        for index, field_name in enumerate(self.ordering):
+            name = field_name.lstrip("-")
+            lookup = "lt" if field_name.startswith("-") else "gt"
+            equal_prefix = {
+                previous.lstrip("-"): value
+                for previous, value in zip(self.ordering[:index], cursor_values)
+            }
+            conditions.append(
+                Q(**equal_prefix, **{f"{name}__{lookup}": cursor_values[index]})
+            )
+        return reduce(lambda left, right: left | right, conditions)
+
+
+class ResumeKeysetPagination(KeysetPagination):
+    """User's resumes: base resume first, then most recently updated."""
+
+    ordering = ("-is_base_resume", "-updated_at", "-id")
+
+
+class RecentApplicationsKeysetPagination(KeysetPagination):
+    """Applications (resumes with a job post), most recently updated first."""
+
+    ordering = ("-updated_at", "-id")
+    page_size = 10
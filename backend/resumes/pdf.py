@@ -0,0 +1,168 @@
+# backend/resumes/pdf.py
+# Server-side resume PDFs. Output is content-addressed: the storage name is a
+# hash of the rendered fields plus the template version, so identical content
+# is rendered once and then served straight from storage. Rendering runs in a
+# bounded process pool so a burst of downloads can't starve the web workers.
+import hashlib
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+import orjson
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from rest_framework.renderers import BaseRenderer
+
+from backend.fast_json import OrjsonRenderer
+
+from .pdf_template import PDF_TEMPLATE_VERSION, render_resume_pdf
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PDF_SETTINGS = {
+    "USE_PROCESS_POOL": True,  # False renders in the request thread (dev/tests)
+    "MAX_WORKERS": 2,  # Render processes
+    "MAX_PENDING": 8,  # Renders queued or running before new ones are rejected
+    "ACQUIRE_TIMEOUT": 10,  # Seconds a render may wait for a queue slot
+    "RENDER_TIMEOUT": 60,  # Seconds a single render may take
+    "STORAGE_DIR": "resume_pdfs",
+}
+
+# Only the fields that end up on the page take part in the content hash
+PDF_FIELDS = (
+    "basics",
+    "summary",
+    "work",
+    "education",
+    "projects",
+    "skills",
+    "certificates",
+    "languages",
+)
+
+
+class PdfRenderBusy(RuntimeError):
+    """Raised when the render queue is full for longer than ACQUIRE_TIMEOUT."""
+
+
+class PdfRenderError(RuntimeError):
+    """Raised when rendering fails or times out."""
+
+
+def get_pdf_setting(name: str):
+    """Reads a key from settings.PDF_RENDER, falling back to the defaults above."""
+    return getattr(settings, "PDF_RENDER", {}).get(name, DEFAULT_PDF_SETTINGS[name])
+
+
+# --- Process pool ---
+_pool_lock = threading.Lock()
+_executor = None
+_pending = None
+
+
+def _get_executor() -> tuple[ProcessPoolExecutor, threading.BoundedSemaphore]:
+    global _executor, _pending
+    with _pool_lock:
+        if _executor is None:
+            # Spawned (not forked) workers: forking a threaded server is unsafe
+            _executor = ProcessPoolExecutor(
+                max_workers=get_pdf_setting("MAX_WORKERS"),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _pending = threading.BoundedSemaphore(get_pdf_setting("MAX_PENDING"))
+    return _executor, _pending
+
+
+def shutdown_pool() -> None:
+    """Stops the render workers (they are rebuilt on next use)."""
+    global _executor, _pending
+    with _pool_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+        _pending = None
+
+
+def _render(payload: dict) -> bytes:
+    if not get_pdf_setting("USE_PROCESS_POOL"):
+        return render_resume_pdf(payload)
+
+    executor, pending = _get_executor()
+    if not pending.acquire(timeout=get_pdf_setting("ACQUIRE_TIMEOUT")):
+        raise PdfRenderBusy("PDF render queue is full.")
+    try:
+        future = executor.submit(render_resume_pdf, payload)
+        return future.result(timeout=get_pdf_setting("RENDER_TIMEOUT"))
+    except FutureTimeoutError as e:
+        future.cancel()
+        raise PdfRenderError("PDF rendering timed out.") from e
+    except BrokenProcessPool as e:
+        # A worker died (OOM kill, crash); a broken pool fails every later
+        # submit, so drop it and let the next render build a fresh one
+        logger.error(f"ERROR PDF render pool is broken: {e}")
+        shutdown_pool()
+        raise PdfRenderError("PDF rendering failed.") from e
+    finally:
+        pending.release()
+
+
+class PdfRenderer(BaseRenderer):
+    """Lets clients send `Accept: application/pdf`; error payloads still render as JSON."""
+
+    media_type = "application/pdf"
+    format = "pdf"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, bytes):
+            return data
+        return OrjsonRenderer().render(data)
+
+
+# --- Content-addressed cache ---
+def get_pdf_payload(resume_data: dict) -> dict:
+    """The subset of a serialized resume (ResumeSerializer shape) that is rendered."""
+    return {field: resume_data.get(field) for field in PDF_FIELDS}
+
+
+def get_content_hash(payload: dict) -> str:
+    encoded = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(
+        PDF_TEMPLATE_VERSION.encode("utf-8") + b":" + encoded
+    ).hexdigest()
+
+
+def _storage_name(digest: str) -> str:
+    return f"{get_pdf_setting('STORAGE_DIR')}/v{PDF_TEMPLATE_VERSION}/{digest}.pdf"
+
+
+def get_or_render_pdf(resume_data: dict) -> tuple[str, bytes]:
+    """
+    Returns (content_hash, pdf_bytes) for a serialized resume, rendering and
+    storing the PDF only if this exact content has not been rendered before.
+    Raises PdfRenderBusy or PdfRenderError.
+    """
+    payload = get_pdf_payload(resume_data)
+    digest = get_content_hash(payload)
+    name = _storage_name(digest)
+
+    if default_storage.exists(name):
+        with default_storage.open(name, "rb") as stored:
+            return digest, stored.read()
+
+    try:
+        pdf_bytes = _render(payload)
+    except (PdfRenderBusy, PdfRenderError):
+        raise
+    except Exception as e:
+        logger.error(f"ERROR rendering resume PDF: {type(e).__name__} - {e}")
+        raise PdfRenderError("PDF rendering failed.") from e
+
+    if not default_storage.exists(name):  # A concurrent render may have stored it
+        default_storage.save(name, ContentFile(pdf_bytes))
+    return digest, pdf_bytes
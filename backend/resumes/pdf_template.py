@@ -0,0 +1,233 @@
+# backend/resumes/pdf_template.py
+# Resume PDF layout, mirroring the extension's client-side jsPDF template
+# (extension/src/utils/pdfUtils.ts). Deliberately free of Django imports so it
+# can run inside spawned render worker processes.
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+# Bump whenever the layout changes so cached PDFs are re-rendered
+PDF_TEMPLATE_VERSION = "1"
+
+MARGIN_LEFT_MM = 15
+MARGIN_RIGHT_MM = 15
+MARGIN_TOP_MM = 20
+MARGIN_BOTTOM_MM = 20
+
+
+def _text(value) -> str:
+    return escape(str(value)) if value not in (None, "") else ""
+
+
+def _date_range(item: dict) -> str:
+    start = item.get("startDate") or ""
+    end = item.get("endDate") or ("Present" if start else "")
+    return " - ".join(part for part in (start, end) if part)
+
+
+def _skill_groups(skills) -> list[tuple[str, list]]:
+    """Skills are stored either as [{name|category, keywords|skills}] or {category: [...]}."""
+    if isinstance(skills, dict):
+        return [(name, values) for name, values in skills.items()]
+    groups = []
+    for item in skills or []:
+        if isinstance(item, dict):
+            name = item.get("name") or item.get("category") or ""
+            values = item.get("keywords") or item.get("skills") or []
+            groups.append((name, values))
+        elif item:
+            groups.append(("", [item]))
+    return groups
+
+
+def _build_styles():
+    from reportlab.lib.styles import ParagraphStyle
+
+    return {
+        "name": ParagraphStyle(
+            "Name", fontName="Helvetica-Bold", fontSize=20, leading=24, alignment=1
+        ),
+        "contact": ParagraphStyle(
+            "Contact", fontName="Helvetica", fontSize=9, leading=12, alignment=1
+        ),
+        "section": ParagraphStyle(
+            "Section",
+            fontName="Helvetica-Bold",
+            fontSize=13,
+            leading=16,
+            spaceBefore=8,
+            spaceAfter=2,
+        ),
+        "heading": ParagraphStyle(
+            "Heading", fontName="Helvetica-Bold", fontSize=10.5, leading=13
+        ),
+        "meta": ParagraphStyle(
+            "Meta", fontName="Helvetica-Oblique", fontSize=9, leading=11
+        ),
+        "body": ParagraphStyle("Body", fontName="Helvetica", fontSize=10, leading=12),
+        "bullet": ParagraphStyle(
+            "Bullet",
+            fontName="Helvetica",
+            fontSize=10,
+            leading=12,
+            leftIndent=10,
+            bulletIndent=2,
+        ),
+    }
+
+
+def _section(story, styles, title: str):
+    from reportlab.lib import colors
+    from reportlab.platypus import HRFlowable, Paragraph
+
+    story.append(Paragraph(title, styles["section"]))
+    story.append(HRFlowable(width="100%", thickness=0.5, color=colors.grey))
+
+
+def _header(story, styles, basics: dict):
+    from reportlab.platypus import Paragraph
+
+    story.append(Paragraph(_text(basics.get("name")), styles["name"]))
+    location = basics.get("location") or {}
+    contact_parts = [
+        basics.get("email"),
+        basics.get("phone"),
+        ", ".join(p for p in (location.get("city"), location.get("region")) if p),
+    ]
+    contact_parts += [
+        profile.get("url") for profile in basics.get("profiles") or [] if profile
+    ]
+    contact = " | ".join(_text(part) for part in contact_parts if part)
+    if contact:
+        story.append(Paragraph(contact, styles["contact"]))
+
+
+def _item(story, styles, heading: str, meta: str, bullets=(), body: str = ""):
+    from reportlab.platypus import KeepTogether, Paragraph, Spacer
+
+    block = [Paragraph(heading, styles["heading"])]
+    if meta:
+        block.append(Paragraph(meta, styles["meta"]))
+    if body:
+        block.append(Paragraph(_text(body), styles["body"]))
+    block += [
+        Paragraph(_text(bullet), styles["bullet"], bulletText="•")
+        for bullet in bullets
+        if bullet
+    ]
+    block.append(Spacer(1, 4))
+    story.append(KeepTogether(block))
+
+
+def build_story(data: dict) -> list:
+    """Flowables for a resume payload (ResumeSerializer shape)."""
+    from reportlab.platypus import Paragraph
+
+    styles = _build_styles()
+    story = []
+    _header(story, styles, data.get("basics") or {})
+
+    if data.get("summary"):
+        _section(story, styles, "SUMMARY")
+        story.append(Paragraph(_text(data["summary"]), styles["body"]))
+
+    if data.get("work"):
+        _section(story, styles, "EXPERIENCE")
+        for item in data["work"]:
+            heading = " - ".join(
+                _text(part) for part in (item.get("position"), item.get("name")) if part
+            )
+            _item(
+                story,
+                styles,
+                f"<b>{heading}</b>",
+                _text(_date_range(item)),
+                bullets=item.get("highlights") or [],
+            )
+
+    if data.get("education"):
+        _section(story, styles, "EDUCATION")
+        for item in data["education"]:
+            degree = " in ".join(
+                _text(part)
+                for part in (item.get("studyType"), item.get("area"))
+                if part
+            )
+            meta = _text(_date_range(item))
+            if item.get("gpa"):
+                meta = (
+                    f"{meta} | GPA: {_text(item['gpa'])}"
+                    if meta
+                    else f"GPA: {_text(item['gpa'])}"
+                )
+            _item(
+                story,
+                styles,
+                f"<b>{_text(item.get('institution'))}</b>"
+                + (f" - {degree}" if degree else ""),
+                meta,
+                bullets=item.get("courses") or [],
+            )
+
+    if data.get("projects"):
+        _section(story, styles, "PROJECTS")
+        for item in data["projects"]:
+            keywords = ", ".join(str(k) for k in item.get("keywords") or [])
+            _item(
+                story,
+                styles,
+                f"<b>{_text(item.get('name'))}</b>",
+                _text(keywords),
+                bullets=item.get("highlights") or [],
+                body=item.get("description") or "",
+            )
+
+    skill_groups = _skill_groups(data.get("skills"))
+    if skill_groups:
+        _section(story, styles, "SKILLS")
+        for name, values in skill_groups:
+            values_text = _text(", ".join(str(v) for v in values))
+            line = f"<b>{_text(name)}:</b> {values_text}" if name else values_text
+            story.append(Paragraph(line, styles["body"]))
+
+    if data.get("certificates"):
+        _section(story, styles, "CERTIFICATES")
+        for item in data["certificates"]:
+            parts = (item.get("name"), item.get("issuer"), item.get("date"))
+            story.append(
+                Paragraph(" - ".join(_text(p) for p in parts if p), styles["body"])
+            )
+
+    if data.get("languages"):
+        _section(story, styles, "LANGUAGES")
+        line = ", ".join(
+            (
+                f"{_text(item.get('language'))} ({_text(item.get('fluency'))})"
+                if item.get("fluency")
+                else _text(item.get("language"))
+            )
+            for item in data["languages"]
+        )
+        story.append(Paragraph(line, styles["body"]))
+
+    return story
+
+
+def render_resume_pdf(data: dict) -> bytes:
+    """Renders a resume payload to PDF bytes. Output is deterministic for equal input."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+    from reportlab.platypus import SimpleDocTemplate
+
+    buffer = BytesIO()
+    document = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        leftMargin=MARGIN_LEFT_MM * mm,
+        rightMargin=MARGIN_RIGHT_MM * mm,
+        topMargin=MARGIN_TOP_MM * mm,
+        bottomMargin=MARGIN_BOTTOM_MM * mm,
+        title=(data.get("basics") or {}).get("name") or "Resume",
+        invariant=True,  # No timestamps/random ids, so equal input gives equal bytes
+    )
+    document.build(build_story(data))
+    return buffer.getvalue()
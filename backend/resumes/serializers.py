@@ -6,6 +6,61 @@ from bio.serializers import SocialProfileSerializer  # Import for merging
 from bio.models import Bio  # Needed to fetch Bio data
 
 
+def get_bio_entry(obj, context: dict) -> dict | None:
+    """
+    Resolves the Bio (and later its serialized social profiles) once per user
+    for the whole serialization, shared across fields and across instances
+    when serializing many resumes. Also used by resumes/fast_serializers.py.
+    """
+    if obj.user_id is None:
+        return None
+    bio_cache = context.setdefault("bio_cache", {})
+    if obj.user_id in bio_cache:
+        return bio_cache[obj.user_id]
+
+    bio = None
+    # Access prefetch/select_related data from viewset queryset if possible
+    if Resume.user.is_cached(obj) and Bio.user.field.remote_field.is_cached(obj.user):
+        try:
+            bio = obj.user.bio
+        except Bio.DoesNotExist:
+            # select_related caches a missing Bio too; accessing it raises
+            bio = None
+    else:
+        # Fallback to DB query if not prefetched (once per user)
+        try:
+            bio = (
+                Bio.objects.select_related("user")
+                .prefetch_related("social_profiles")
+                .get(user_id=obj.user_id)
+            )
+        except Bio.DoesNotExist:
+            print(
+                f"Warning: Bio not found for user {obj.user_id} during resume serialization."
+            )
+    entry = {"bio": bio, "profiles": None} if bio else None
+    bio_cache[obj.user_id] = entry
+    return entry
+
+
+def build_basics(entry: dict) -> dict:
+    """The JSON Resume "basics" block from a Bio entry with serialized profiles."""
+    bio = entry["bio"]
+    return {
+        "name": bio.full_name,
+        "label": bio.headline or "",
+        "email": bio.email or bio.user.email,
+        "phone": bio.phone or "",
+        "url": "",  # Add website field to Bio model?
+        "location": {
+            "city": bio.current_city or "",
+            "region": bio.current_state or "",
+            "countryCode": bio.current_country or "",
+        },
+        "profiles": entry["profiles"],
+    }
+
+
 class ResumeListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Resume
@@ -54,43 +109,22 @@ class ResumeSerializer(serializers.ModelSerializer):
             "certificates",
         )
 
+    def _get_bio_entry(self, obj) -> dict | None:
+        return get_bio_entry(obj, self.context)
+
     def get_bio_object(self, obj):
-        # Access prefetch/select_related data from viewset queryset if possible
-        if hasattr(obj.user, "bio"):
-            return obj.user.bio
-        # Fallback to DB query if not prefetched (less efficient)
-        try:
-            return (
-                Bio.objects.select_related("user")
-                .prefetch_related("social_profiles")
-                .get(user=obj.user)
-            )
-        except Bio.DoesNotExist:
-            print(
-                f"Warning: Bio not found for user {obj.user.username} during resume serialization."
-            )
-            return None
+        entry = self._get_bio_entry(obj)
+        return entry["bio"] if entry else None
 
     def get_basics(self, obj):
-        bio = self.get_bio_object(obj)
-        if not bio:
+        entry = self._get_bio_entry(obj)
+        if not entry:
             return {}
-        social_profiles_data = SocialProfileSerializer(
-            bio.social_profiles.all(), many=True
-        ).data
-        return {
-            "name": bio.full_name,
-            "label": bio.headline or "",
-            "email": bio.email or bio.user.email,
-            "phone": bio.phone or "",
-            "url": "",  # Add website field to Bio model?
-            "location": {
-                "city": bio.current_city or "",
-                "region": bio.current_state or "",
-                "countryCode": bio.current_country or "",
-            },
-            "profiles": social_profiles_data,
-        }
+        if entry["profiles"] is None:
+            entry["profiles"] = SocialProfileSerializer(
+                entry["bio"].social_profiles.all(), many=True
+            ).data
+        return build_basics(entry)
 
     def get_education(self, obj):
         bio = self.get_bio_object(obj)
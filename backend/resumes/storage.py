@@ -0,0 +1,244 @@
+# backend/resumes/storage.py
+# Delta storage and version history for resume content sections.
+# A delta-mode Resume keeps summary/work/projects/skills as a structural diff
+# (resumes/delta.py) against an immutable ResumeSnapshot of its base resume.
+# Resume.from_db/refresh_from_db/save call into this module, so the rest of the
+# code keeps reading and assigning resume.work etc. as plain values.
+import hashlib
+from functools import lru_cache
+
+import orjson
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+
+from .delta import apply, diff
+from .models import Resume, ResumeSnapshot, ResumeVersion
+
+DELTA_FIELDS = ("summary", "work", "projects", "skills")
+
+DEFAULT_STORAGE_SETTINGS = {
+    "DELTA_TAILORED_RESUMES": False,  # Store newly generated resumes as deltas
+    "VERSION_HISTORY": False,  # Record a ResumeVersion (an extra write) per edit
+    "MAX_VERSIONS": 50,  # Versions kept per resume; older ones are pruned
+}
+
+
+def get_storage_setting(name: str):
+    """Reads a key from settings.RESUME_STORAGE, falling back to the defaults above."""
+    return getattr(settings, "RESUME_STORAGE", {}).get(
+        name, DEFAULT_STORAGE_SETTINGS[name]
+    )
+
+
+def get_content(resume: Resume, fields=DELTA_FIELDS) -> dict:
+    return {field: getattr(resume, field) for field in fields}
+
+
+def _empty_value(field: str):
+    return Resume._meta.get_field(field).get_default()
+
+
+# --- Snapshots ---
+def get_or_create_snapshot(resume: Resume) -> ResumeSnapshot:
+    """Content-addressed snapshot of a (base) resume's content sections."""
+    data = get_content(resume)
+    content_hash = hashlib.sha256(
+        orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+    ).hexdigest()
+    snapshot, _ = ResumeSnapshot.objects.get_or_create(
+        content_hash=content_hash, defaults={"data": data}
+    )
+    return snapshot
+
+
+@lru_cache(maxsize=256)
+def _get_snapshot_bytes(content_hash: str) -> bytes:
+    # Snapshots are immutable and keyed by their hash: cache entries never expire
+    cache_key = f"resume_snapshot_{content_hash}"
+    encoded = cache.get(cache_key)
+    if encoded is None:
+        data = (
+            ResumeSnapshot.objects.filter(pk=content_hash)
+            .values_list("data", flat=True)
+            .first()
+        )
+        if data is None:
+            raise ResumeSnapshot.DoesNotExist(content_hash)
+        encoded = orjson.dumps(data)
+        cache.set(cache_key, encoded, None)
+    return encoded
+
+
+def get_snapshot_data(content_hash: str | None) -> dict:
+    """A fresh (safe to mutate) copy of the snapshot's content."""
+    if not content_hash:
+        return {}
+    return orjson.loads(_get_snapshot_bytes(content_hash))
+
+
+def get_tailored_storage_kwargs(base_resume: Resume) -> dict:
+    """Extra Resume fields for a new tailored resume, per RESUME_STORAGE settings."""
+    if not get_storage_setting("DELTA_TAILORED_RESUMES"):
+        return {}
+    return {
+        "storage_mode": Resume.STORAGE_DELTA,
+        "base_snapshot": get_or_create_snapshot(base_resume),
+    }
+
+
+# --- Materialize / pack ---
+def materialize(resume: Resume, fields=DELTA_FIELDS) -> None:
+    """Sets the given content fields from base snapshot + content_delta."""
+    content = apply(get_snapshot_data(resume.base_snapshot_id), resume.content_delta)
+    for field in fields:
+        setattr(resume, field, content.get(field, _empty_value(field)))
+
+
+def _pack(resume: Resume) -> dict:
+    """Replaces the content fields by content_delta for writing; returns the full values."""
+    content = get_content(resume)
+    resume.content_delta = (
+        diff(get_snapshot_data(resume.base_snapshot_id), content) or {}
+    )
+    for field in DELTA_FIELDS:
+        setattr(resume, field, _empty_value(field))
+    return content
+
+
+def _is_delta(resume: Resume, loaded: dict) -> bool:
+    return (
+        loaded.get("storage_mode") == Resume.STORAGE_DELTA
+        and "content_delta" in loaded
+        and "base_snapshot_id" in loaded
+    )
+
+
+def on_resume_loaded(resume: Resume) -> None:
+    loaded = resume.__dict__
+    fields = [field for field in DELTA_FIELDS if field in loaded]
+    if fields and _is_delta(resume, loaded):
+        materialize(resume, fields)
+    _remember_content(resume, fields)
+
+
+def on_resume_refreshed(resume: Resume, fields) -> None:
+    fields = [field for field in DELTA_FIELDS if fields is None or field in fields]
+    if not fields:
+        return
+    if resume.storage_mode == Resume.STORAGE_DELTA:
+        materialize(resume, fields)
+    _remember_content(resume, fields)
+
+
+def get_live_content(resume: Resume, field: str):
+    """A content field's real value, also while the instance is packed for saving."""
+    unpacked = resume.__dict__.get("_unpacked_content")
+    if unpacked is not None and field in unpacked:
+        return unpacked[field]
+    return getattr(resume, field)
+
+
+# --- Version history ---
+def _tracks_versions(resume: Resume) -> bool:
+    return (
+        get_storage_setting("VERSION_HISTORY")
+        and resume.__dict__.get("is_base_resume") is False
+    )
+
+
+def _remember_content(resume: Resume, fields) -> None:
+    """Keeps the encoded content as loaded, to diff against on the next save."""
+    if not fields or not _tracks_versions(resume):
+        return
+    remembered = resume.__dict__.setdefault("_loaded_content", {})
+    for field in fields:
+        remembered[field] = orjson.dumps(getattr(resume, field))
+
+
+def _record_version(resume: Resume, previous: dict, update_fields) -> None:
+    fields = [
+        field for field in previous if update_fields is None or field in update_fields
+    ]
+    current = {field: getattr(resume, field) for field in fields}
+    changed = [
+        field for field in fields if orjson.dumps(current[field]) != previous[field]
+    ]
+    if not changed:
+        return
+    before = {field: orjson.loads(previous[field]) for field in changed}
+    after = {field: current[field] for field in changed}
+    last_number = resume.versions.aggregate(last=Max("number"))["last"] or 0
+    ResumeVersion.objects.create(
+        resume=resume,
+        number=last_number + 1,
+        changed_fields=changed,
+        delta=diff(after, before),
+    )
+    max_versions = get_storage_setting("MAX_VERSIONS")
+    if max_versions:
+        resume.versions.filter(number__lte=last_number + 1 - max_versions).delete()
+
+
+def get_version_history(resume: Resume) -> list:
+    """
+    Newest first. Each entry's `content` is the resume's content sections as
+    they were before that edit, rebuilt by applying the reverse deltas.
+    """
+    content = get_content(resume)
+    history = []
+    for version in resume.versions.all():
+        changed = {field: content[field] for field in version.changed_fields}
+        content = {**content, **apply(changed, version.delta)}
+        history.append(
+            {
+                "number": version.number,
+                "created_at": version.created_at,
+                "changed_fields": version.changed_fields,
+                "content": content,
+            }
+        )
+    return history
+
+
+# --- Save ---
+def save_resume(resume: Resume, save, *args, **kwargs) -> None:
+    """Resume.save(): packs delta content around the write and records versions."""
+    update_fields = kwargs.get("update_fields")
+    previous = None
+    if not resume._state.adding:
+        previous = resume.__dict__.pop("_loaded_content", None)
+
+    content = None
+    if resume.storage_mode == Resume.STORAGE_DELTA and (
+        update_fields is None or set(update_fields) & set(DELTA_FIELDS)
+    ):
+        content = _pack(resume)
+        # post_save receivers read the real values through get_live_content()
+        resume.__dict__["_unpacked_content"] = content
+        if update_fields is not None:
+            kwargs["update_fields"] = list(update_fields) + ["content_delta"]
+    try:
+        save(*args, **kwargs)
+    finally:
+        if content is not None:
+            resume.__dict__.pop("_unpacked_content", None)
+            for field, value in content.items():
+                setattr(resume, field, value)
+
+    if previous and _tracks_versions(resume):
+        _record_version(resume, previous, update_fields)
+    # What is now in the database: saved fields as written, the rest as loaded
+    saved_fields = [
+        field
+        for field in DELTA_FIELDS
+        if field in resume.__dict__
+        and (update_fields is None or field in update_fields)
+    ]
+    if previous:
+        resume.__dict__["_loaded_content"] = {
+            field: value
+            for field, value in previous.items()
+            if field not in saved_fields
+        }
+    _remember_content(resume, saved_fields)
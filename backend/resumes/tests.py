@@ -1,3 +1,898 @@
-from django.test import TestCase
+import base64
+import io
+import shutil
+import tempfile
+import threading
+import zipfile
+from datetime import timedelta
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
 
-# Create your tests here.
+import orjson
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from backend.fast_json import OrjsonRenderer
+from bio.models import SocialProfile
+from generation.services import ai_gateway
+from jobposts.models import JobPost
+
+from . import pdf
+from .cache import _base_payload_key
+from .cleanup import reap_orphaned_resumes
+from .fast_serializers import (
+    RECENT_APPLICATION_VALUES,
+    RESUME_LIST_VALUES,
+    serialize_recent_application,
+    serialize_resume,
+    serialize_resume_list_item,
+)
+from .models import Resume, ResumeVersion
+from .serializers import (
+    OnboardingResumeCreateSerializer,
+    RecentApplicationItemSerializer,
+    ResumeListSerializer,
+    ResumeSerializer,
+)
+from .storage import DELTA_FIELDS, get_tailored_storage_kwargs, get_version_history
+
+
+def as_json(data):
+    """`data` as a client decodes it after OrjsonRenderer."""
+    return orjson.loads(OrjsonRenderer().render(data))
+
+
+class ResumeAPITestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(
+            email="ada@example.com",
+            password="pw12345!x",
+            first_name="Ada",
+            last_name="L",
+        )
+        SocialProfile.objects.create(
+            bio=self.user.bio, network="GitHub", url="https://github.com/ada"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_resume(self, user=None, **fields):
+        defaults = {
+            "name": "Tailored",
+            "summary": "Backend engineer",
+            "work": [{"name": "Acme", "highlights": ["Built the ledger"]}],
+            "skills": [{"category": "Languages", "skills": ["Python"]}],
+            "projects": [],
+        }
+        return Resume.objects.create(user=user or self.user, **{**defaults, **fields})
+
+
+class ResumeWithoutBioTests(ResumeAPITestCase):
+    def test_detail_without_bio(self):
+        resume = self.create_resume()
+        self.user.bio.delete()
+        response = self.client.get(f"/api/resumes/{resume.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["basics"], {})
+        self.assertEqual(response.json()["education"], [])
+
+
+class ResumeSerializerBioQueryTests(ResumeAPITestCase):
+    """Serializing many resumes resolves the Bio and social profiles once per user."""
+
+    def serialize(self, n):
+        for _ in range(n):
+            self.create_resume()
+        resumes = list(Resume.objects.filter(user=self.user))  # No select_related
+        with CaptureQueriesContext(connection) as queries:
+            data = ResumeSerializer(resumes, many=True).data
+        self.assertEqual(len(data), n)
+        self.assertEqual(len(data[-1]["basics"]["profiles"]), 1)
+        return [query["sql"] for query in queries.captured_queries]
+
+    def assert_constant_bio_queries(self, n):
+        queries = self.serialize(n)
+        # One Bio (joined with its user) and one social profile query
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(sum('FROM "bio_bio"' in sql for sql in queries), 1)
+        self.assertEqual(sum('FROM "bio_socialprofile"' in sql for sql in queries), 1)
+
+    def test_one_resume(self):
+        self.assert_constant_bio_queries(1)
+
+    def test_ten_resumes(self):
+        self.assert_constant_bio_queries(10)
+
+    def test_select_related_needs_no_bio_query(self):
+        for _ in range(10):
+            self.create_resume()
+        resumes = list(
+            Resume.objects.filter(user=self.user)
+            .select_related("user__bio")
+            .prefetch_related("user__bio__social_profiles")
+        )
+        with self.assertNumQueries(0):
+            ResumeSerializer(resumes, many=True).data
+
+
+class FastSerializerEquivalenceTests(ResumeAPITestCase):
+    """The fast paths must render exactly what their DRF serializers render."""
+
+    def setUp(self):
+        super().setUp()
+        self.user.bio.base_education_json = [{"institution": "MIT"}]
+        self.user.bio.save()
+        job_post = JobPost.objects.create(
+            source_url="https://example.com/jobs/1",
+            job_title="Engineer",
+            company_name="Acme",
+        )
+        self.create_resume(name="Base", is_base_resume=True)
+        self.create_resume(source_company_name="Acme", associated_job_post=job_post)
+        self.create_resume(source_company_name=None, summary=None)
+
+    def make_user(self, email, bio=True):
+        user = CustomUser.objects.create_user(email=email, password="pw12345!x")
+        if not bio:
+            user.bio.delete()
+        self.create_resume(user=user)
+        self.client.force_authenticate(user)
+        return user
+
+    def assert_same_output(self, fast, drf):
+        renderer = OrjsonRenderer()
+        self.assertEqual(renderer.render(fast), renderer.render(drf))
+
+    def resumes(self, user):
+        return Resume.objects.filter(user=user).order_by(
+            "-is_base_resume", "-updated_at", "-id"
+        )
+
+    def assert_list_equivalent(self, user):
+        queryset = self.resumes(user)
+        drf = ResumeListSerializer(queryset, many=True).data
+        fast = [
+            serialize_resume_list_item(row)
+            for row in queryset.values(*RESUME_LIST_VALUES)
+        ]
+        self.assert_same_output(fast, drf)
+        response = self.client.get("/api/resumes/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"], as_json(drf))
+
+    def assert_detail_equivalent(self, user):
+        for resume in self.resumes(user).select_related("user__bio"):
+            drf = ResumeSerializer(resume).data
+            self.assert_same_output(serialize_resume(resume), drf)
+            response = self.client.get(f"/api/resumes/{resume.id}/")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), as_json(drf))
+
+    def test_list(self):
+        self.assert_list_equivalent(self.user)
+
+    def test_detail(self):
+        self.assert_detail_equivalent(self.user)
+
+    def test_user_without_social_profiles(self):
+        user = self.make_user("grace@example.com")
+        self.assert_list_equivalent(user)
+        self.assert_detail_equivalent(user)
+
+    def test_user_without_bio(self):
+        user = self.make_user("alan@example.com", bio=False)
+        self.assert_list_equivalent(user)
+        self.assert_detail_equivalent(user)
+
+    def test_recent_applications(self):
+        queryset = (
+            Resume.objects.filter(user=self.user, associated_job_post__isnull=False)
+            .select_related("associated_job_post")
+            .order_by("-updated_at", "-id")
+        )
+        drf = RecentApplicationItemSerializer(queryset, many=True).data
+        fast = [
+            serialize_recent_application(row)
+            for row in queryset.values(*RECENT_APPLICATION_VALUES)
+        ]
+        self.assert_same_output(fast, drf)
+        response = self.client.get("/api/resumes/recent-applications/")
+        self.assertEqual(response.json()["results"], as_json(drf))
+
+
+class BaseResumePayloadCacheTests(ResumeAPITestCase):
+    """GET /api/resumes/base/ must never serve cached bytes from before a write."""
+
+    def setUp(self):
+        super().setUp()
+        self.base = self.create_resume(name="Base", is_base_resume=True, summary="v1")
+
+    def get_base(self, etag=None):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        response = self.client.get("/api/resumes/base/", **headers)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def prime(self):
+        response = self.get_base()
+        self.assertIsNotNone(cache.get(_base_payload_key(self.user.id)))
+        self.assertEqual(self.get_base().content, response.content)  # Served from cache
+        return response
+
+    def assert_invalidated_and_rebuilt(self, edit):
+        primed = self.prime()
+        edit()
+        self.assertIsNone(cache.get(_base_payload_key(self.user.id)))
+        response = self.get_base()
+        self.base.refresh_from_db()
+        self.assertEqual(
+            response.json(), as_json(OnboardingResumeCreateSerializer(self.base).data)
+        )
+        return primed, response
+
+    def test_base_resume_edit(self):
+        def edit():
+            response = self.client.patch(
+                f"/api/resumes/{self.base.id}/", {"summary": "v2"}, format="json"
+            )
+            self.assertEqual(response.status_code, 200)
+
+        primed, response = self.assert_invalidated_and_rebuilt(edit)
+        self.assertEqual(response.json()["summary"], "v2")
+        self.assertNotEqual(response["ETag"], primed["ETag"])
+        # The old ETag no longer validates
+        self.assertEqual(self.get_base(etag=primed["ETag"]).json()["summary"], "v2")
+
+    def test_bio_edit(self):
+        # The payload holds no Bio fields: the entry is dropped and rebuilt
+        # from the database, and the unchanged bytes keep their ETag
+        def edit():
+            self.user.bio.headline = "Staff engineer"
+            self.user.bio.save()
+
+        primed, response = self.assert_invalidated_and_rebuilt(edit)
+        self.assertEqual(response["ETag"], primed["ETag"])
+
+    def test_social_profile_edit(self):
+        def edit():
+            profile = self.user.bio.social_profiles.get()
+            profile.url = "https://github.com/ada-l"
+            profile.save()
+
+        primed, response = self.assert_invalidated_and_rebuilt(edit)
+        self.assertEqual(response["ETag"], primed["ETag"])
+
+    def test_edits_in_turn(self):
+        etags = {self.prime()["ETag"]}
+        for summary in ("v2", "v3"):
+            self.user.bio.headline = summary
+            self.user.bio.save()
+            self.base.summary = summary
+            self.base.save()
+            response = self.get_base()
+            self.assertEqual(response.json()["summary"], summary)
+            etags.add(response["ETag"])
+            self.assertEqual(self.get_base().content, response.content)
+        self.assertEqual(len(etags), 3)
+
+
+BASE_CONTENT = {
+    "summary": "Backend engineer",
+    "work": [
+        {
+            "name": "Acme",
+            "position": "Engineer",
+            "highlights": ["Built the ledger", "Ran on-call"],
+        },
+        {"name": "Initech", "position": "Intern", "highlights": ["Wrote reports"]},
+    ],
+    "projects": [{"name": "Ledger", "description": "Double-entry bookkeeping"}],
+    "skills": [
+        {"category": "Languages", "skills": ["Python", "Go"]},
+        {"category": "Data", "skills": ["PostgreSQL"]},
+    ],
+}
+
+
+@override_settings(
+    RESUME_STORAGE={
+        "DELTA_TAILORED_RESUMES": True,
+        "VERSION_HISTORY": True,
+        "MAX_VERSIONS": 3,
+    }
+)
+class DeltaStorageTests(ResumeAPITestCase):
+    """Delta-stored tailored resumes and their version history round-trip exactly."""
+
+    def setUp(self):
+        super().setUp()
+        self.base = self.create_resume(name="Base", is_base_resume=True, **BASE_CONTENT)
+        tailored = {
+            **BASE_CONTENT,
+            "summary": "Payments engineer",
+            "skills": list(reversed(BASE_CONTENT["skills"])),
+        }
+        self.resume = self.create_resume(
+            **tailored, **get_tailored_storage_kwargs(self.base)
+        )
+        self.contents = [tailored]  # Content after creation and after each edit
+
+    def load(self):
+        return Resume.objects.get(pk=self.resume.pk)
+
+    def content(self, resume):
+        return {field: getattr(resume, field) for field in DELTA_FIELDS}
+
+    def edit(self, **changes):
+        resume = self.load()
+        for field, value in changes.items():
+            setattr(resume, field, value)
+        resume.save()
+        self.contents.append({**self.contents[-1], **changes})
+
+    def assert_history(self):
+        """Current content, then the content before each kept version, newest first."""
+        resume = self.load()
+        self.assertEqual(self.content(resume), self.contents[-1])
+        history = get_version_history(resume)
+        numbers = [entry["number"] for entry in history]
+        self.assertEqual(
+            numbers, list(range(len(self.contents) - 1, 0, -1))[: len(history)]
+        )
+        for entry in history:
+            self.assertEqual(entry["content"], self.contents[entry["number"] - 1])
+
+    def test_stored_as_delta(self):
+        row = (
+            Resume.objects.filter(pk=self.resume.pk)
+            .values(*DELTA_FIELDS, "content_delta")
+            .get()
+        )
+        self.assertEqual(row["work"], [])
+        self.assertIn(row["summary"], (None, ""))
+        self.assertTrue(row["content_delta"])
+        self.assertEqual(self.content(self.load()), self.contents[0])
+
+    def test_save_edit_edit_load(self):
+        self.edit(summary="Staff payments engineer")
+        work = [dict(BASE_CONTENT["work"][0], highlights=["Scaled the ledger 10x"])]
+        self.edit(work=work, projects=[])
+        self.assertEqual(ResumeVersion.objects.filter(resume=self.resume).count(), 2)
+        self.assert_history()
+
+    def test_history_off_by_default(self):
+        with override_settings(RESUME_STORAGE={"DELTA_TAILORED_RESUMES": True}):
+            self.edit(summary="Staff payments engineer")
+        self.assertFalse(ResumeVersion.objects.filter(resume=self.resume).exists())
+        self.assertEqual(self.content(self.load()), self.contents[-1])
+
+    def test_history_survives_base_resume_edits(self):
+        self.edit(summary="Staff payments engineer")
+        self.base.work = []
+        self.base.summary = "Changed"
+        self.base.save()
+        self.assert_history()
+
+    def test_max_versions_boundary(self):
+        for number in range(1, 4):  # Exactly MAX_VERSIONS edits: nothing pruned
+            self.edit(summary=f"Edit {number}")
+        self.assertEqual(len(get_version_history(self.load())), 3)
+        self.assert_history()
+        self.edit(summary="Edit 4")  # One past the limit prunes the oldest
+        history = get_version_history(self.load())
+        self.assertEqual([entry["number"] for entry in history], [4, 3, 2])
+        self.assert_history()
+
+    def test_deferred_load(self):
+        self.edit(summary="Staff payments engineer")
+        resume = Resume.objects.only("id").get(pk=self.resume.pk)
+        self.assertEqual(resume.work, self.contents[-1]["work"])
+        self.assertEqual(resume.summary, "Staff payments engineer")
+
+    def test_section_regeneration(self):
+        skills = [{"category": "Payments", "skills": ["Stripe", "ISO 20022"]}]
+        ai_gateway.set_backend(
+            ai_gateway.FakeAIBackend(
+                [orjson.dumps({"summary": "Regenerated", "skills": skills}).decode()]
+            )
+        )
+        self.addCleanup(ai_gateway.reset)
+        self.edit(summary="Edited before regeneration")
+        Resume.objects.filter(pk=self.resume.pk).update(
+            source_job_description="Payments JD"
+        )
+        response = self.client.post(
+            f"/api/generate/{self.resume.id}/sections/",
+            {"sections": ["summary", "skills"]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.contents.append(
+            {**self.contents[-1], "summary": "Regenerated", "skills": skills}
+        )
+        resume = self.load()
+        self.assertEqual(resume.storage_mode, Resume.STORAGE_DELTA)
+        self.assertEqual(
+            Resume.objects.filter(pk=resume.pk).values_list("work", flat=True).get(), []
+        )
+        self.assert_history()
+
+
+class JsonPatchTests(ResumeAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.resume = self.create_resume(
+            work=[
+                {"name": "Acme", "highlights": ["Built the ledger", "Ran on-call"]},
+                {"name": "Initech", "highlights": ["Wrote TPS reports"]},
+            ]
+        )
+        self.url = f"/api/resumes/{self.resume.id}/"
+
+    def patch(self, operations, **headers):
+        return self.client.patch(
+            self.url,
+            orjson.dumps(operations),
+            content_type="application/json-patch+json",
+            headers=headers,
+        )
+
+    def assert_patched(self, operations, field, expected):
+        response = self.patch(operations)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()[field], expected)
+        self.resume.refresh_from_db()
+        self.assertEqual(getattr(self.resume, field), expected)
+
+    def assert_rejected(self, operations, status=400, **headers):
+        before = Resume.objects.values().get(pk=self.resume.pk)
+        response = self.patch(operations, **headers)
+        self.assertEqual(response.status_code, status, response.content)
+        self.assertEqual(Resume.objects.values().get(pk=self.resume.pk), before)
+        return response
+
+    def test_add(self):
+        self.assert_patched(
+            [{"op": "add", "path": "/work/0/highlights/1", "value": "Cut costs"}],
+            "work",
+            [
+                {
+                    "name": "Acme",
+                    "highlights": ["Built the ledger", "Cut costs", "Ran on-call"],
+                },
+                {"name": "Initech", "highlights": ["Wrote TPS reports"]},
+            ],
+        )
+
+    def test_add_appends_with_dash(self):
+        self.assert_patched(
+            [{"op": "add", "path": "/work/1/highlights/-", "value": "Fixed a bug"}],
+            "work",
+            [
+                {"name": "Acme", "highlights": ["Built the ledger", "Ran on-call"]},
+                {"name": "Initech", "highlights": ["Wrote TPS reports", "Fixed a bug"]},
+            ],
+        )
+
+    def test_remove(self):
+        self.assert_patched(
+            [{"op": "remove", "path": "/work/0/highlights/0"}],
+            "work",
+            [
+                {"name": "Acme", "highlights": ["Ran on-call"]},
+                {"name": "Initech", "highlights": ["Wrote TPS reports"]},
+            ],
+        )
+
+    def test_replace(self):
+        self.assert_patched(
+            [{"op": "replace", "path": "/summary", "value": "Payments engineer"}],
+            "summary",
+            "Payments engineer",
+        )
+
+    def test_move(self):
+        self.assert_patched(
+            [{"op": "move", "from": "/work/1", "path": "/work/0"}],
+            "work",
+            [
+                {"name": "Initech", "highlights": ["Wrote TPS reports"]},
+                {"name": "Acme", "highlights": ["Built the ledger", "Ran on-call"]},
+            ],
+        )
+
+    def test_copy(self):
+        self.assert_patched(
+            [{"op": "copy", "from": "/work/0/highlights/0", "path": "/projects/-"}],
+            "projects",
+            ["Built the ledger"],
+        )
+
+    def test_test(self):
+        self.assert_patched(
+            [
+                {"op": "test", "path": "/work/0/name", "value": "Acme"},
+                {"op": "replace", "path": "/work/0/name", "value": "Acme Corp"},
+            ],
+            "work",
+            [
+                {
+                    "name": "Acme Corp",
+                    "highlights": ["Built the ledger", "Ran on-call"],
+                },
+                {"name": "Initech", "highlights": ["Wrote TPS reports"]},
+            ],
+        )
+
+    def test_failed_test_writes_nothing(self):
+        self.assert_rejected(
+            [
+                {"op": "replace", "path": "/summary", "value": "Changed"},
+                {"op": "test", "path": "/work/0/name", "value": "Initech"},
+            ],
+            status=409,
+        )
+
+    def test_leading_zero_index(self):
+        self.assert_rejected([{"op": "remove", "path": "/work/01"}])
+
+    def test_non_ascii_digit_index(self):
+        for index in ("١", "²", "１"):  # Arabic-Indic 1, ², fullwidth 1
+            with self.subTest(index):
+                response = self.assert_rejected(
+                    [{"op": "remove", "path": f"/work/{index}"}]
+                )
+                self.assertIn("Invalid array index", response.json()["error"])
+
+    def test_stale_if_match(self):
+        etag = self.client.get(self.url).headers["ETag"]
+        self.assertEqual(
+            self.patch(
+                [{"op": "replace", "path": "/summary", "value": "First"}],
+                if_match=etag,
+            ).status_code,
+            200,
+        )
+        self.assert_rejected(
+            [{"op": "replace", "path": "/summary", "value": "Second"}],
+            status=412,
+            if_match=etag,
+        )
+
+    def test_body_rejected_by_serializer(self):
+        response = self.assert_rejected(
+            [{"op": "replace", "path": "/name", "value": "x" * 201}]
+        )
+        self.assertIn("name", response.json())
+
+
+class FakeExecutor:
+    """Stands in for the render pool: `submit` returns or raises `outcome`."""
+
+    def __init__(self, outcome):
+        self.outcome = outcome
+        self.shut_down = False
+
+    def submit(self, fn, *args):
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return self.outcome
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+POOLED_PDF_RENDER = {
+    "USE_PROCESS_POOL": True,
+    "ACQUIRE_TIMEOUT": 0.01,
+    "RENDER_TIMEOUT": 0.01,
+}
+
+
+@override_settings(PDF_RENDER={"USE_PROCESS_POOL": False})
+class PdfDownloadTests(ResumeAPITestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.resume = self.create_resume()
+        render = mock.patch.object(
+            pdf, "render_resume_pdf", wraps=pdf.render_resume_pdf
+        )
+        self.render = render.start()
+        self.addCleanup(render.stop)
+
+    def download(self, resume=None):
+        return self.client.get(f"/api/resumes/{(resume or self.resume).id}/pdf/")
+
+    def use_pool(self, executor, busy=False):
+        """Installs `executor` as the render pool, so no real workers are spawned."""
+        pdf.shutdown_pool()
+        pdf._executor = executor
+        pdf._pending = threading.BoundedSemaphore(1)
+        if busy:
+            pdf._pending.acquire()
+        self.addCleanup(pdf.shutdown_pool)
+
+    def test_cache_miss_then_hit(self):
+        first = self.download()
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first.content.startswith(b"%PDF"))
+        self.assertEqual(self.render.call_count, 1)
+
+        second = self.download()
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["X-Content-Hash"], first["X-Content-Hash"])
+        self.assertEqual(self.render.call_count, 1)
+
+    def test_changed_content_is_rendered(self):
+        first = self.download()
+        Resume.objects.filter(pk=self.resume.pk).update(summary="Payments engineer")
+        second = self.download()
+        self.assertNotEqual(second["X-Content-Hash"], first["X-Content-Hash"])
+        self.assertEqual(self.render.call_count, 2)
+
+    def test_same_content_shares_a_render(self):
+        first = self.download()
+        second = self.download(self.create_resume(name="Copy"))
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second["X-Content-Hash"], first["X-Content-Hash"])
+        self.assertEqual(self.render.call_count, 1)
+
+    def test_template_version_invalidates(self):
+        first = self.download()
+        with mock.patch.object(pdf, "PDF_TEMPLATE_VERSION", "2"):
+            second = self.download()
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second["X-Content-Hash"], first["X-Content-Hash"])
+        self.assertEqual(self.render.call_count, 2)
+
+    @override_settings(PDF_RENDER=POOLED_PDF_RENDER)
+    def test_busy(self):
+        self.use_pool(FakeExecutor(Future()), busy=True)
+        response = self.download()
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("busy", response.json()["error"])
+
+    @override_settings(PDF_RENDER=POOLED_PDF_RENDER)
+    def test_timeout(self):
+        self.use_pool(FakeExecutor(Future()))  # Never completes
+        response = self.download()
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.json()["error"], "PDF rendering timed out.")
+        self.assertTrue(pdf._pending.acquire(blocking=False))  # Slot released
+
+    @override_settings(PDF_RENDER=POOLED_PDF_RENDER)
+    def test_broken_pool_is_rebuilt(self):
+        executor = FakeExecutor(BrokenProcessPool("worker died"))
+        self.use_pool(executor)
+        response = self.download()
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.json()["error"], "PDF rendering failed.")
+        self.assertTrue(executor.shut_down)
+        self.assertIsNone(pdf._executor)
+
+
+class OrphanCleanupTests(ResumeAPITestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def orphan(self, age_hours, user=None):
+        resume = Resume.objects.create(user=user, name="Demo upload")
+        Resume.objects.filter(pk=resume.pk).update(
+            created_at=timezone.now() - timedelta(hours=age_hours)
+        )
+        return resume.pk
+
+    def remaining(self, pks):
+        return set(Resume.objects.filter(pk__in=pks).values_list("pk", flat=True))
+
+    def test_ttl_cutoff(self):
+        old = self.orphan(73)
+        young = self.orphan(71)
+        stats = reap_orphaned_resumes(ttl_hours=72)
+        self.assertEqual(stats["deleted"], 1)
+        self.assertEqual(self.remaining([old, young]), {young})
+
+    def test_claimed_resumes_are_kept(self):
+        claimed = self.orphan(100, user=self.user)
+        orphan = self.orphan(100)
+        reap_orphaned_resumes(ttl_hours=72)
+        self.assertEqual(self.remaining([claimed, orphan]), {claimed})
+
+    def test_dry_run(self):
+        pks = [self.orphan(100) for _ in range(3)]
+        stats = reap_orphaned_resumes(ttl_hours=72, batch_size=2, dry_run=True)
+        self.assertEqual((stats["scanned"], stats["deleted"]), (3, 0))
+        self.assertEqual(stats["batches"], 2)
+        self.assertEqual(self.remaining(pks), set(pks))
+
+    def test_batches_walk_the_primary_key(self):
+        pks = sorted(self.orphan(100) for _ in range(5))
+        progress = []
+
+        def on_batch(stats):
+            progress.append((stats["scanned"], self.remaining(pks)))
+
+        stats = reap_orphaned_resumes(ttl_hours=72, batch_size=2, on_batch=on_batch)
+        self.assertEqual((stats["batches"], stats["deleted"]), (3, 5))
+        self.assertEqual(
+            progress,
+            [(2, set(pks[2:])), (4, set(pks[4:])), (5, set())],
+        )
+
+    def test_archive_is_written_after_commit(self):
+        pks = sorted(self.orphan(100) for _ in range(3))
+        with self.captureOnCommitCallbacks() as callbacks:
+            stats = reap_orphaned_resumes(ttl_hours=72, batch_size=2, archive=True)
+        self.assertEqual(stats["archives"], [])  # Nothing before the commit
+        self.assertEqual(len(callbacks), 2)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(len(stats["archives"]), 2)
+        archived = []
+        for name in stats["archives"]:
+            with default_storage.open(name) as archive:
+                archived += [orjson.loads(line)["id"] for line in archive]
+        self.assertEqual(sorted(archived), sorted(str(pk) for pk in pks))
+        self.assertEqual(self.remaining(pks), set())
+
+
+class ExportTests(ResumeAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.other = CustomUser.objects.create_user(
+            email="bob@example.com", password="pw12345!x"
+        )
+        job_posts = [
+            JobPost.objects.create(source_url=f"https://example.com/jobs/{index}")
+            for index in range(3)
+        ]
+        self.job_post = job_posts[0]
+        self.resumes = [
+            self.create_resume(name="Base", is_base_resume=True),
+            self.create_resume(associated_job_post=self.job_post),
+            self.create_resume(associated_job_post=self.job_post),
+        ]
+        self.create_resume(user=self.other, associated_job_post=job_posts[1])
+        Resume.objects.create(user=None, name="Demo upload")
+
+    def export(self, output):
+        response = self.client.get("/api/resumes/export/", {"output": output})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response
+
+    def expected_records(self):
+        return {
+            ("bio", str(self.user.bio.id)),
+            *(("resume", str(resume.id)) for resume in self.resumes),
+            ("job_post", str(self.job_post.id)),
+        }
+
+    def test_ndjson(self):
+        response = self.export("ndjson")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).splitlines()
+        records = [orjson.loads(line) for line in lines]
+        self.assertEqual(len(records), 5)
+        self.assertEqual(
+            {(record["type"], str(record["data"]["id"])) for record in records},
+            self.expected_records(),
+        )
+        bio = next(record["data"] for record in records if record["type"] == "bio")
+        self.assertEqual(bio["social_profiles"][0]["network"], "GitHub")
+        for record in records:
+            self.assertNotIn("content_delta", record["data"])
+
+    def test_zip(self):
+        response = self.export("zip")
+        self.assertEqual(response["Content-Type"], "application/zip")
+        chunks = list(response.streaming_content)
+        self.assertGreater(len(chunks), 1)  # One per entry, then the directory
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+            names = set(archive.namelist())
+            resume = orjson.loads(archive.read(f"resumes/{self.resumes[1].id}.json"))
+        self.assertEqual(
+            names,
+            {
+                (
+                    "bio.json"
+                    if record_type == "bio"
+                    else f"{record_type}s/{record_id}.json"
+                )
+                for record_type, record_id in self.expected_records()
+            },
+        )
+        self.assertEqual(resume["associated_job_post_id"], str(self.job_post.id))
+
+    def test_invalid_output(self):
+        response = self.client.get("/api/resumes/export/", {"output": "csv"})
+        self.assertEqual(response.status_code, 400)
+
+
+class KeysetPaginationTests(ResumeAPITestCase):
+    def page_through(self, url, on_page=None):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+            ids += [
+                row.get("id", row.get("resume_id"))
+                for row in response.json()["results"]
+            ]
+            url = response.json()["next"]
+            if on_page is not None:
+                on_page()
+        return ids
+
+    def test_ties_are_broken_by_primary_key(self):
+        resumes = [self.create_resume() for _ in range(7)]
+        Resume.objects.update(updated_at=timezone.now())  # All tied
+        expected = sorted((str(resume.id) for resume in resumes), reverse=True)
+        self.assertEqual(self.page_through("/api/resumes/?page_size=3"), expected)
+
+    def test_no_duplicates_or_gaps_while_rows_are_inserted(self):
+        job_post = JobPost.objects.create(source_url="https://example.com/jobs/1")
+        existing = {
+            str(self.create_resume(associated_job_post=job_post).id) for _ in range(6)
+        }
+
+        def insert():
+            self.create_resume(associated_job_post=job_post)
+
+        for url in (
+            "/api/resumes/?page_size=2",
+            "/api/resumes/recent-applications/?page_size=2",
+        ):
+            with self.subTest(url):
+                ids = self.page_through(url, on_page=insert)
+                self.assertEqual(len(ids), len(set(ids)))
+                self.assertLessEqual(existing, set(ids))
+
+    def test_base_resume_comes_first(self):
+        base = self.create_resume(is_base_resume=True)
+        Resume.objects.filter(pk=base.pk).update(
+            updated_at=timezone.now() - timedelta(days=1)
+        )
+        self.create_resume()
+        self.assertEqual(
+            self.page_through("/api/resumes/?page_size=1")[0], str(base.id)
+        )
+
+    def test_invalid_cursor(self):
+        self.create_resume()
+
+        def encode(value):
+            return base64.urlsafe_b64encode(orjson.dumps(value)).decode()
+
+        cursors = {
+            "not base64": "%%%",
+            "not json": encode("x")[:-2],
+            "wrong length": encode([True, "2024-01-01T00:00:00Z"]),
+            "not a list": encode(7),
+            "bad uuid": encode([True, "2024-01-01T00:00:00Z", "nope"]),
+            "bad datetime": encode([True, "yesterday", str(self.user.pk)]),
+            "nulls": encode([None, None, None]),
+        }
+        for name, cursor in cursors.items():
+            with self.subTest(name):
+                response = self.client.get("/api/resumes/", {"cursor": cursor})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {"cursor": "Invalid cursor"})
@@ -9,13 +9,12 @@ from .views import ResumeViewSet, RecentApplicationsListView
 router = DefaultRouter()
 router.register(r"resumes", ResumeViewSet, basename="resume")
 
-urlpatterns = router.urls
-
-# Add the path for the recent applications list view
-urlpatterns.append(
+# Add the path for the recent applications list view.
+# It must come before the router URLs, otherwise "resumes/<pk>/" captures it.
+urlpatterns = [
     path(
         "resumes/recent-applications/",
         RecentApplicationsListView.as_view(),
         name="recent-applications-list",
-    )
-)
+    ),
+] + router.urls
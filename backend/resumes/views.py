@@ -2,11 +2,14 @@
 from rest_framework import viewsets, permissions, generics, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.text import slugify
 from django.db import transaction  # Import transaction
-from rest_framework.pagination import PageNumberPagination  # Import for pagination
 import logging
 
+from backend.fast_json import OrjsonRenderer
+
 from .models import Resume
 from .serializers import (
     ResumeSerializer,
@@ -15,6 +18,34 @@ from .serializers import (
     RecentApplicationItemSerializer,  # Import new serializer
     OnboardingResumeCreateSerializer,  # Add this import
 )
+from .fast_serializers import (
+    RECENT_APPLICATION_VALUES,
+    RESUME_LIST_VALUES,
+    serialize_recent_application,
+    serialize_resume,
+    serialize_resume_list_item,
+)
+from .pagination import ResumeKeysetPagination, RecentApplicationsKeysetPagination
+from .etags import (
+    build_etag,
+    get_base_resume_freshness,
+    get_not_modified_response,
+    get_precondition_failed_response,
+    get_resume_freshness,
+    set_etag_headers,
+)
+from .jsonpatch import (
+    JsonPatchError,
+    JsonPatchParser,
+    JsonPatchTestFailed,
+    is_json_patch,
+    patch_resume_fields,
+)
+from .cache import get_cached_base_payload, set_cached_base_payload
+from .pdf import PdfRenderBusy, PdfRenderError, PdfRenderer, get_or_render_pdf
+from .pdf_template import PDF_TEMPLATE_VERSION
+from .storage import get_version_history
+from .export import EXPORT_FORMATS
 from bio.models import Bio  # Import Bio for create_base action
 
 logger = logging.getLogger(__name__)
@@ -30,6 +61,8 @@ class ResumeViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     # Default serializer for retrieve/update/partial_update/destroy
     serializer_class = ResumeSerializer
+    # Keyset pagination on (is_base_resume, updated_at, id); applies to list only
+    pagination_class = ResumeKeysetPagination
 
     def get_serializer_class(self):
         # Use different serializers based on the action
@@ -40,26 +73,154 @@ class ResumeViewSet(viewsets.ModelViewSet):
             return BaseResumeCreateSerializer  # Or handle in action directly
         return ResumeSerializer  # Default for retrieve, update, partial_update
 
+    # Columns loaded per action; everything else (multi-KB JD text and JSON
+    # sections the serializer never reads) stays deferred.
+    LIST_FIELDS = (
+        "id",
+        "user",
+        "name",
+        "is_base_resume",
+        "source_company_name",
+        "updated_at",
+    )
+    DETAIL_FIELDS = (
+        "id",
+        "user",
+        "name",
+        "is_base_resume",
+        "source_job_description",
+        "source_job_url",
+        "source_company_name",
+        "summary",
+        "work",
+        "projects",
+        "skills",
+        "storage_mode",
+        "base_snapshot",
+        "content_delta",
+        "created_at",
+        "updated_at",
+    )
+    BASE_RESUME_FIELDS = (
+        ("id", "user", "is_base_resume", "updated_at")
+        + ("storage_mode", "base_snapshot", "content_delta")
+        + tuple(OnboardingResumeCreateSerializer.Meta.fields)
+    )
+    ACTION_FIELDS = {
+        "list": LIST_FIELDS,
+        "destroy": LIST_FIELDS,
+        "create_base_resume": LIST_FIELDS,
+        "get_base_resume": BASE_RESUME_FIELDS,
+    }
+
     def get_queryset(self):
-        """Filter resumes for user, prefetch Bio needed by ResumeSerializer."""
+        """
+        Filter resumes for user. Only actions serialized with ResumeSerializer
+        join Bio and prefetch social profiles; each action loads just its columns.
+        """
+        queryset = Resume.objects.filter(user=self.request.user).order_by(
+            "-is_base_resume", "-updated_at", "-id"
+        )
+        if self.action in self.ACTION_FIELDS:
+            return queryset.only(*self.ACTION_FIELDS[self.action])
+        if self.action == "partial_update" and is_json_patch(self.request):
+            # Row lock for the read-patch-write cycle; "self" keeps it off the Bio join
+            queryset = queryset.select_for_update(of=("self",))
         return (
-            Resume.objects.select_related("user__bio")
+            queryset.select_related("user__bio")
             .prefetch_related(
                 "user__bio__social_profiles"  # Prefetch through user to bio to socials
             )
-            .filter(user=self.request.user)
-            .order_by("-is_base_resume", "-updated_at")
+            .only(*self.DETAIL_FIELDS)
         )
 
-    # We inherit standard list, retrieve, update, partial_update, destroy
+    # We inherit standard update, partial_update, destroy
     # Ownership is ensured by get_queryset filtering by request.user
 
+    def list(self, request, *args, **kwargs):
+        # Plain .values() rows through the fast path (resumes/fast_serializers.py);
+        # same output as ResumeListSerializer
+        page = self.paginate_queryset(
+            self.filter_queryset(self.get_queryset()).values(*RESUME_LIST_VALUES)
+        )
+        return self.get_paginated_response(
+            [serialize_resume_list_item(row) for row in page]
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        # Conditional GET: one cheap freshness query decides between 304 and a full load
+        freshness = get_resume_freshness(request.user, kwargs.get(self.lookup_field))
+        if freshness is None:
+            return super().retrieve(request, *args, **kwargs)  # Regular 404 path
+        etag = build_etag(freshness, variant="detail")
+        not_modified = get_not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+        # Same output as ResumeSerializer, without building a serializer
+        data = serialize_resume(self.get_object(), self.get_serializer_context())
+        return set_etag_headers(Response(data), etag)
+
+    def get_parsers(self):
+        # PATCH also accepts RFC 6902 bodies (application/json-patch+json)
+        return super().get_parsers() + [JsonPatchParser()]
+
+    def partial_update(self, request, *args, **kwargs):
+        if not is_json_patch(request):
+            return super().partial_update(request, *args, **kwargs)
+        return self._apply_json_patch(request)
+
+    def _apply_json_patch(self, request):
+        """
+        Applies a JSON Patch to the resume's editable JSON (see resumes/jsonpatch.py).
+        An If-Match ETag from a previous GET/PATCH guards against lost updates:
+        the row is locked, and a stale ETag gets 412 instead of overwriting.
+        """
+        with transaction.atomic():
+            resume = self.get_object()
+            etag = build_etag(
+                get_resume_freshness(request.user, resume.pk), variant="detail"
+            )
+            precondition_failed = get_precondition_failed_response(request, etag)
+            if precondition_failed is not None:
+                return precondition_failed
+            try:
+                patched = patch_resume_fields(resume, request.data)
+            except JsonPatchTestFailed as e:
+                return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
+            except JsonPatchError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            serializer = self.get_serializer(resume, data=patched, partial=True)
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+
+        etag = build_etag(
+            get_resume_freshness(request.user, resume.pk), variant="detail"
+        )
+        # "Prefer: return=minimal" skips echoing the whole resume back
+        if "return=minimal" in request.headers.get("Prefer", ""):
+            return set_etag_headers(Response(status=status.HTTP_204_NO_CONTENT), etag)
+        return set_etag_headers(Response(serializer.data), etag)
+
     # Custom action to get ONLY the base resume easily
     @action(detail=False, methods=["get"], url_path="base")
     def get_base_resume(self, request):
         logger.info(
             f"[get_base_resume] Called by user: {request.user} (ID: {request.user.id if request.user else 'Anonymous'})"
         )
+        # Conditional GET: the base payload holds no Bio data, so the resume's
+        # own updated_at is enough to validate it
+        freshness = get_base_resume_freshness(request.user)
+        etag = build_etag(freshness, variant="base") if freshness else None
+        if etag:
+            not_modified = get_not_modified_response(request, etag)
+            if not_modified is not None:
+                return not_modified
+            # Cache hit: pre-encoded bytes rendered for this exact ETag
+            cached_body = get_cached_base_payload(request.user.id, etag)
+            if cached_body is not None and self._accepts_json(request):
+                return set_etag_headers(
+                    HttpResponse(cached_body, content_type="application/json"), etag
+                )
         # Use the filtered queryset
         base_resume = self.get_queryset().filter(is_base_resume=True).first()
         if not base_resume:
@@ -76,7 +237,84 @@ class ResumeViewSet(viewsets.ModelViewSet):
         serializer = OnboardingResumeCreateSerializer(
             base_resume, context=self.get_serializer_context()
         )
-        return Response(serializer.data)
+        response = Response(serializer.data)
+        if etag and freshness["id"] == base_resume.id:
+            set_etag_headers(response, etag)
+            set_cached_base_payload(
+                request.user.id, etag, OrjsonRenderer().render(serializer.data)
+            )
+        return response
+
+    def _accepts_json(self, request) -> bool:
+        # Cached bytes are JSON; other renderers (e.g. browsable API) take the slow path
+        return getattr(request, "accepted_renderer", None) is not None and (
+            request.accepted_renderer.format == "json"
+        )
+
+    # Server-rendered PDF, cached by content hash (see resumes/pdf.py)
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="pdf",
+        renderer_classes=[OrjsonRenderer, PdfRenderer],
+    )
+    def download_pdf(self, request, pk=None):
+        freshness = get_resume_freshness(request.user, pk)
+        if freshness is None:
+            return Response(
+                {"detail": "Resume not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+        etag = build_etag(freshness, variant=f"pdf-v{PDF_TEMPLATE_VERSION}")
+        not_modified = get_not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        resume = self.get_object()
+        resume_data = serialize_resume(resume, self.get_serializer_context())
+        try:
+            content_hash, pdf_bytes = get_or_render_pdf(resume_data)
+        except PdfRenderBusy:
+            return Response(
+                {"error": "PDF rendering is busy. Please retry shortly."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        except PdfRenderError as e:
+            return Response(
+                {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        response = HttpResponse(pdf_bytes, content_type="application/pdf")
+        filename = slugify(resume.name or "resume") or "resume"
+        response["Content-Disposition"] = f'inline; filename="{filename}.pdf"'
+        response["X-Content-Hash"] = content_hash
+        return set_etag_headers(response, etag)
+
+    # Streams the user's Bio, resumes and job posts (see resumes/export.py).
+    # ?output=ndjson (default) or ?output=zip
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        output = request.query_params.get("output", "ndjson")
+        if output not in EXPORT_FORMATS:
+            return Response(
+                {
+                    "error": f"Invalid output. Allowed: {', '.join(sorted(EXPORT_FORMATS))}."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        stream, content_type, extension = EXPORT_FORMATS[output]
+        response = StreamingHttpResponse(
+            stream(request.user), content_type=content_type
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="resume-maker-export.{extension}"'
+        )
+        return response
+
+    # Edit history of a resume, newest first (see resumes/storage.py)
+    @action(detail=True, methods=["get"], url_path="versions")
+    def versions(self, request, pk=None):
+        resume = self.get_object()
+        return Response(get_version_history(resume))
 
     # Custom action to create the initial base resume
     @action(detail=False, methods=["post"], url_path="create-base")
@@ -194,7 +432,8 @@ class RecentApplicationsListView(generics.ListAPIView):
 
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = RecentApplicationItemSerializer
-    pagination_class = PageNumberPagination  # Use standard DRF pagination
+    # Keyset pagination on (updated_at, id): no COUNT(*) and no OFFSET scans
+    pagination_class = RecentApplicationsKeysetPagination
 
     def get_queryset(self):
         user = self.request.user
@@ -205,6 +444,16 @@ class RecentApplicationsListView(generics.ListAPIView):
             Resume.objects.filter(user=user, associated_job_post__isnull=False)
             .select_related("associated_job_post")
             .order_by(
-                "-updated_at"
+                "-updated_at", "-id"
             )  # Or perhaps by job_post.created_at or resume.created_at
         )
+
+    def list(self, request, *args, **kwargs):
+        # One joined .values() query, rendered by the fast path; same output as
+        # RecentApplicationItemSerializer
+        page = self.paginate_queryset(
+            self.filter_queryset(self.get_queryset()).values(*RECENT_APPLICATION_VALUES)
+        )
+        return self.get_paginated_response(
+            [serialize_recent_application(row) for row in page]
+        )
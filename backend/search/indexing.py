@@ -0,0 +1,116 @@
+# backend/search/indexing.py
+# Keeps SearchDocument rows in sync with Resume and JobPost. Each save upserts
+# the one affected document (a single INSERT ... ON CONFLICT DO UPDATE); the
+# database then updates its full-text index for that row only.
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from jobposts.models import JobPost
+from resumes.models import Resume
+from resumes.storage import get_live_content
+
+from .models import SearchDocument
+
+# Saves that touch none of these fields leave the index alone
+RESUME_INDEXED_FIELDS = {
+    "user",
+    "name",
+    "source_company_name",
+    "summary",
+    "work",
+    "projects",
+    "skills",
+    "storage_mode",
+    "content_delta",
+}
+JOB_POST_INDEXED_FIELDS = {"job_title", "company_name", "job_description"}
+
+
+def _collect_text(value, parts: list) -> None:
+    """Flattens the string leaves of resume JSON (work items, skills, ...)."""
+    if isinstance(value, str):
+        if value:
+            parts.append(value)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _collect_text(item, parts)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_text(item, parts)
+
+
+def build_resume_document(resume: Resume) -> SearchDocument:
+    parts = [resume.source_company_name or ""]
+    for field in ("summary", "work", "projects", "skills"):
+        _collect_text(get_live_content(resume, field), parts)
+    return SearchDocument(
+        kind=SearchDocument.KIND_RESUME,
+        object_id=resume.id,
+        user_id=resume.user_id,
+        title=(resume.name or "")[:255],
+        body="\n".join(part for part in parts if part),
+    )
+
+
+def build_job_post_document(job_post: JobPost) -> SearchDocument:
+    title = " - ".join(
+        part for part in (job_post.job_title, job_post.company_name) if part
+    )
+    return SearchDocument(
+        kind=SearchDocument.KIND_JOB_POST,
+        object_id=job_post.id,
+        user_id=None,
+        title=title[:255],
+        body=job_post.job_description or "",
+    )
+
+
+def upsert_documents(documents: list) -> None:
+    """Inserts or refreshes documents in one statement, keyed by (kind, object_id)."""
+    if not documents:
+        return
+    SearchDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=["kind", "object_id"],
+        update_fields=["user", "title", "body", "updated_at"],
+    )
+
+
+def remove_document(kind: str, object_id) -> None:
+    SearchDocument.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+def _touches(update_fields, indexed_fields: set) -> bool:
+    return update_fields is None or bool(set(update_fields) & indexed_fields)
+
+
+# --- Incremental maintenance ---
+# Anonymous (user-less) resumes are never searchable, so they get no document;
+# that also spares the orphan reaper a DELETE per resume.
+@receiver(post_save, sender=Resume)
+def index_resume(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw or not _touches(update_fields, RESUME_INDEXED_FIELDS):
+        return
+    if instance.user_id is None:
+        remove_document(SearchDocument.KIND_RESUME, instance.id)
+        return
+    upsert_documents([build_resume_document(instance)])
+
+
+@receiver(post_delete, sender=Resume)
+def unindex_resume(sender, instance, **kwargs):
+    if instance.user_id is not None:
+        remove_document(SearchDocument.KIND_RESUME, instance.id)
+
+
+@receiver(post_save, sender=JobPost)
+def index_job_post(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw or not _touches(update_fields, JOB_POST_INDEXED_FIELDS):
+        return
+    upsert_documents([build_job_post_document(instance)])
+
+
+@receiver(post_delete, sender=JobPost)
+def unindex_job_post(sender, instance, **kwargs):
+    remove_document(SearchDocument.KIND_JOB_POST, instance.id)
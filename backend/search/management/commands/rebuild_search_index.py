@@ -0,0 +1,61 @@
+# backend/search/management/commands/rebuild_search_index.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobposts.models import JobPost
+from resumes.models import Resume
+from search.indexing import (
+    build_job_post_document,
+    build_resume_document,
+    upsert_documents,
+)
+from search.models import SearchDocument
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfills SearchDocument rows for all resumes and job posts. Saves keep "
+        "the index current afterwards; run this once after installing the search app."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete all search documents before rebuilding.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if options["clear"]:
+            deleted, _ = SearchDocument.objects.all().delete()
+            self.stdout.write(f"Deleted {deleted} search documents.")
+
+        for label, queryset, build in (
+            (
+                "resumes",
+                Resume.objects.filter(user__isnull=False).order_by("pk"),
+                build_resume_document,
+            ),
+            ("job posts", JobPost.objects.order_by("pk"), build_job_post_document),
+        ):
+            started = time.monotonic()
+            indexed = 0
+            batch = []
+            for instance in queryset.iterator(chunk_size=batch_size):
+                batch.append(build(instance))
+                if len(batch) >= batch_size:
+                    upsert_documents(batch)
+                    indexed += len(batch)
+                    batch = []
+            upsert_documents(batch)
+            indexed += len(batch)
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Indexed {indexed} {label} in {elapsed:.1f}s"
+                    f" ({indexed / elapsed if elapsed else 0:.0f}/s)."
+                )
+            )
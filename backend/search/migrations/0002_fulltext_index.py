@@ -0,0 +1,88 @@
+# Full-text index over SearchDocument, specific to the database backend.
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE search_searchdocument ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX search_doc_vector_gin ON search_searchdocument USING GIN (search_vector)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS search_doc_vector_gin",
+    "ALTER TABLE search_searchdocument DROP COLUMN IF EXISTS search_vector",
+]
+
+# External-content FTS5 table: the text lives once, in search_searchdocument;
+# triggers keep the FTS index in step with every insert/update/delete.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE search_searchdocument_fts USING fts5(
+        title, body, user_id, kind,
+        content='search_searchdocument', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER search_searchdocument_fts_ai AFTER INSERT ON search_searchdocument BEGIN
+        INSERT INTO search_searchdocument_fts(rowid, title, body, user_id, kind)
+        VALUES (new.id, new.title, new.body, new.user_id, new.kind);
+    END
+    """,
+    """
+    CREATE TRIGGER search_searchdocument_fts_ad AFTER DELETE ON search_searchdocument BEGIN
+        INSERT INTO search_searchdocument_fts(search_searchdocument_fts, rowid, title, body, user_id, kind)
+        VALUES ('delete', old.id, old.title, old.body, old.user_id, old.kind);
+    END
+    """,
+    """
+    CREATE TRIGGER search_searchdocument_fts_au AFTER UPDATE ON search_searchdocument BEGIN
+        INSERT INTO search_searchdocument_fts(search_searchdocument_fts, rowid, title, body, user_id, kind)
+        VALUES ('delete', old.id, old.title, old.body, old.user_id, old.kind);
+        INSERT INTO search_searchdocument_fts(rowid, title, body, user_id, kind)
+        VALUES (new.id, new.title, new.body, new.user_id, new.kind);
+    END
+    """,
+    "INSERT INTO search_searchdocument_fts(search_searchdocument_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS search_searchdocument_fts_ai",
+    "DROP TRIGGER IF EXISTS search_searchdocument_fts_ad",
+    "DROP TRIGGER IF EXISTS search_searchdocument_fts_au",
+    "DROP TABLE IF EXISTS search_searchdocument_fts",
+]
+
+STATEMENTS = {
+    "postgresql": (POSTGRES_FORWARD, POSTGRES_BACKWARD),
+    "sqlite": (SQLITE_FORWARD, SQLITE_BACKWARD),
+}
+
+
+def _run(schema_editor, direction: int):
+    statements = STATEMENTS.get(schema_editor.connection.vendor)
+    if statements is None:
+        return  # Other backends use the icontains fallback in search/services.py
+    for statement in statements[direction]:
+        schema_editor.execute(statement)
+
+
+def create_fulltext_index(apps, schema_editor):
+    _run(schema_editor, 0)
+
+
+def drop_fulltext_index(apps, schema_editor):
+    _run(schema_editor, 1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
@@ -0,0 +1,43 @@
+# backend/search/models.py
+from django.conf import settings
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    Denormalized, searchable text for one Resume or JobPost, kept in sync on save
+    (search/indexing.py). The full-text index over it is database specific and
+    created in migrations: a generated tsvector column with a GIN index on
+    PostgreSQL, an FTS5 external-content table on SQLite.
+    """
+
+    KIND_RESUME = "resume"
+    KIND_JOB_POST = "job_post"
+    KIND_CHOICES = [(KIND_RESUME, "Resume"), (KIND_JOB_POST, "Job post")]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.UUIDField()
+    # Owner of a resume document; job posts are shared, so theirs is empty
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="search_documents",
+    )
+    title = models.CharField(max_length=255, blank=True)
+    body = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "object_id"], name="unique_search_document"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["user", "kind"], name="search_doc_user_kind_idx")
+        ]
@@ -0,0 +1,135 @@
+# backend/search/services.py
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from .models import SearchDocument
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+MAX_TERMS = 8
+SNIPPET_RADIUS = 80  # Characters of context on each side of the first hit
+
+FTS_TABLE = "search_searchdocument_fts"  # SQLite FTS5 table (migration 0002)
+# bm25 weights per FTS5 column (title, body, user_id, kind): title hits count
+# ten times a body hit, like the A/B tsvector weights on PostgreSQL, and the
+# scoping columns don't count at all
+FTS_RANK = f"bm25({FTS_TABLE}, 10.0, 1.0, 0.0, 0.0)"
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def get_query_terms(query: str) -> list:
+    return _TERM_RE.findall(query or "")[:MAX_TERMS]
+
+
+def search_documents(user, query: str, kinds=None, limit: int = DEFAULT_LIMIT) -> list:
+    """
+    Matches among the user's resumes and the shared job posts, using the
+    database's full-text index (PostgreSQL tsvector/GIN or SQLite FTS5) and
+    falling back to icontains on other backends.
+    A user's resumes are few, so they are ranked by relevance. Job posts are
+    shared and a common term can match a large share of them, so they come
+    newest first, an order the index serves without scoring every match.
+    """
+    terms = get_query_terms(query)
+    if not terms:
+        return []
+    kinds = kinds or [SearchDocument.KIND_RESUME, SearchDocument.KIND_JOB_POST]
+    limit = max(1, min(limit, MAX_LIMIT))
+
+    if connection.vendor == "postgresql":
+        search = _search_postgresql
+    elif connection.vendor == "sqlite":
+        search = _search_sqlite
+    else:
+        search = _search_fallback
+    matches = {kind: search(user, query, terms, kind, limit) for kind in kinds}
+    return _merge(matches, kinds, limit)
+
+
+def _merge(matches: dict, kinds: list, limit: int) -> list:
+    """Gives every kind an equal share of `limit`, then fills up with leftovers."""
+    share = max(1, limit // len(kinds))
+    results = []
+    for kind in kinds:
+        results += matches[kind][:share]
+    for kind in kinds:
+        results += matches[kind][share:][: limit - len(results)]
+    return results[:limit]
+
+
+def _scope(user, kind: str) -> Q:
+    if kind == SearchDocument.KIND_RESUME:
+        return Q(kind=kind, user=user)
+    return Q(kind=kind)
+
+
+def _search_postgresql(user, query: str, terms: list, kind: str, limit: int) -> list:
+    # websearch_to_tsquery accepts raw user input ("quoted phrases", -exclusions)
+    tsquery = "websearch_to_tsquery('english', %s)"
+    queryset = (
+        SearchDocument.objects.filter(_scope(user, kind))
+        .alias(
+            matched=RawSQL(
+                f"search_vector @@ {tsquery}", [query], output_field=BooleanField()
+            )
+        )
+        .filter(matched=True)
+    )
+    if kind == SearchDocument.KIND_JOB_POST:
+        return list(queryset.order_by("-id")[:limit])
+    return list(
+        queryset.annotate(
+            rank=RawSQL(
+                f"ts_rank(search_vector, {tsquery})", [query], output_field=FloatField()
+            )
+        ).order_by("-rank", "-updated_at")[:limit]
+    )
+
+
+def _fts5_quote(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _search_sqlite(user, query: str, terms: list, kind: str, limit: int) -> list:
+    # Terms are quoted (no FTS5 syntax from user input) and AND-ed. Owner and
+    # kind are FTS5 columns too, so scoping happens inside the index. Only job
+    # posts need the kind term: the owner token already implies a resume, and
+    # intersecting with the (huge) resume kind list would dominate the cost.
+    text_match = "{title body} : (" + " AND ".join(map(_fts5_quote, terms)) + ")"
+    if kind == SearchDocument.KIND_RESUME:
+        match = f"{text_match} AND user_id : {_fts5_quote(user.pk.hex)}"
+        order = FTS_RANK
+    else:
+        match = f"{text_match} AND kind : {_fts5_quote(kind)}"
+        order = "rowid DESC"
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+            f" ORDER BY {order} LIMIT %s",
+            [match, limit],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+    documents = SearchDocument.objects.in_bulk(ids)
+    return [documents[pk] for pk in ids if pk in documents]
+
+
+def _search_fallback(user, query: str, terms: list, kind: str, limit: int) -> list:
+    queryset = SearchDocument.objects.filter(_scope(user, kind))
+    for term in terms:
+        queryset = queryset.filter(Q(title__icontains=term) | Q(body__icontains=term))
+    return list(queryset.order_by("-id")[:limit])
+
+
+def make_snippet(body: str, terms: list) -> str:
+    """A short excerpt around the first occurrence of any query term."""
+    lowered = body.lower()
+    positions = [lowered.find(term.lower()) for term in terms]
+    positions = [position for position in positions if position != -1]
+    first = min(positions) if positions else 0
+    start = max(0, first - SNIPPET_RADIUS)
+    snippet = body[start : start + SNIPPET_RADIUS * 2].replace("\n", " ")
+    return ("..." if start else "") + snippet
@@ -0,0 +1,100 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from jobposts.models import JobPost
+from resumes.models import Resume
+
+from .models import SearchDocument
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            email="ada@example.com", password="pw12345!x"
+        )
+        self.other = CustomUser.objects.create_user(
+            email="bob@example.com", password="pw12345!x"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_resume(self, user=None, name="Tailored", summary="", **fields):
+        return Resume.objects.create(
+            user=user or self.user, name=name, summary=summary, **fields
+        )
+
+    def search(self, query, **params):
+        response = self.client.get("/api/search/", {"q": query, **params})
+        self.assertEqual(response.status_code, 200, response.content)
+        return [(result["type"], result["id"]) for result in response.json()["results"]]
+
+    def test_only_the_callers_resumes(self):
+        mine = self.create_resume(summary="Ran Kubernetes clusters")
+        self.create_resume(user=self.other, summary="Ran Kubernetes clusters")
+        job_post = JobPost.objects.create(
+            source_url="https://example.com/jobs/1",
+            job_title="Platform engineer",
+            job_description="Kubernetes and Terraform",
+        )
+        self.assertEqual(
+            self.search("kubernetes"),
+            [("resume", str(mine.id)), ("job_post", str(job_post.id))],
+        )
+        self.assertEqual(
+            self.search("kubernetes", type="resume"), [("resume", str(mine.id))]
+        )
+
+    def test_index_follows_updates_and_deletes(self):
+        resume = self.create_resume(summary="Ran Kubernetes clusters")
+        resume.summary = "Wrote Terraform modules"
+        resume.save()
+        self.assertEqual(self.search("kubernetes"), [])
+        self.assertEqual(self.search("terraform"), [("resume", str(resume.id))])
+
+        # The FTS5 triggers fire for writes that skip the model too
+        SearchDocument.objects.filter(object_id=resume.id).update(
+            body="Ansible playbooks"
+        )
+        self.assertEqual(self.search("terraform"), [])
+        self.assertEqual(self.search("ansible"), [("resume", str(resume.id))])
+
+        resume.delete()
+        self.assertEqual(self.search("ansible"), [])
+        self.assertFalse(SearchDocument.objects.exists())
+
+    def test_all_terms_must_match(self):
+        resume = self.create_resume(summary="Ran Kubernetes clusters on AWS")
+        self.create_resume(summary="Ran Kubernetes clusters on GCP")
+        self.assertEqual(self.search("kubernetes aws"), [("resume", str(resume.id))])
+
+    def test_title_hits_rank_above_body_hits(self):
+        # A short body that is all hit must not outrank a longer title
+        body_hit = self.create_resume(name="Backend engineer", summary="Kafka")
+        title_hit = self.create_resume(
+            name="Senior Kafka platform engineer for payments",
+            summary="Python services on PostgreSQL, with on-call for the ledger",
+        )
+        self.assertEqual(
+            self.search("kafka", type="resume"),
+            [("resume", str(title_hit.id)), ("resume", str(body_hit.id))],
+        )
+
+    def test_icontains_fallback(self):
+        mine = self.create_resume(summary="Ran Kubernetes clusters")
+        self.create_resume(user=self.other, summary="Ran Kubernetes clusters")
+        job_post = JobPost.objects.create(
+            source_url="https://example.com/jobs/1",
+            job_description="Kubernetes and Terraform",
+        )
+        with mock.patch("search.services.connection", SimpleNamespace(vendor="mysql")):
+            self.assertEqual(
+                self.search("KUBERNETES"),
+                [("resume", str(mine.id)), ("job_post", str(job_post.id))],
+            )
+            self.assertEqual(
+                self.search("kubernetes terraform"), [("job_post", str(job_post.id))]
+            )
@@ -0,0 +1,57 @@
+# backend/search/views.py
+from rest_framework import views, permissions, status
+from rest_framework.response import Response
+
+from .models import SearchDocument
+from .services import DEFAULT_LIMIT, get_query_terms, make_snippet, search_documents
+
+SEARCH_TYPES = {
+    "all": [SearchDocument.KIND_RESUME, SearchDocument.KIND_JOB_POST],
+    "resume": [SearchDocument.KIND_RESUME],
+    "job_post": [SearchDocument.KIND_JOB_POST],
+}
+
+
+class SearchView(views.APIView):
+    """
+    Full-text search over the user's resumes and the shared job posts.
+    GET /api/search/?q=kubernetes&type=all|resume|job_post&limit=20
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get("q", "").strip()
+        if not get_query_terms(query):
+            return Response(
+                {"error": "A search query 'q' is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        search_type = request.query_params.get("type", "all")
+        if search_type not in SEARCH_TYPES:
+            return Response(
+                {"error": f"Invalid type. Allowed: {', '.join(SEARCH_TYPES)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = int(request.query_params.get("limit", DEFAULT_LIMIT))
+        except ValueError:
+            limit = DEFAULT_LIMIT
+
+        terms = get_query_terms(query)
+        documents = search_documents(
+            request.user, query, kinds=SEARCH_TYPES[search_type], limit=limit
+        )
+        return Response(
+            {
+                "results": [
+                    {
+                        "type": document.kind,
+                        "id": document.object_id,
+                        "title": document.title,
+                        "snippet": make_snippet(document.body, terms),
+                    }
+                    for document in documents
+                ]
+            }
+        )
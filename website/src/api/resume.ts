@@ -71,20 +71,23 @@ export const getBaseResume = async (): Promise<EnhancedResumeData> => {
 };
 
 /**
- * Fetches a paginated list of recent applications (resumes associated with job posts).
+ * Fetches a page of recent applications (resumes associated with job posts).
+ * Pages are cursor-based: pass the `next` URL's cursor to get the following page.
  *
- * @param {number} [page=1] - The page number to fetch.
+ * @param {string | null} [cursor=null] - Cursor of the page to fetch, or null for the first page.
  * @param {number} [pageSize=10] - The number of items per page.
- * @returns {Promise<PaginatedRecentApplicationsResponse>} A promise that resolves to the paginated list of recent applications.
+ * @returns {Promise<PaginatedRecentApplicationsResponse>} A promise that resolves to the page of recent applications.
  */
 export const getRecentApplications = async (
-  page: number = 1,
+  cursor: string | null = null,
   pageSize: number = 10
 ): Promise<PaginatedRecentApplicationsResponse> => {
   const queryParams = new URLSearchParams({
-    page: page.toString(),
     page_size: pageSize.toString(),
   });
+  if (cursor) {
+    queryParams.set('cursor', cursor);
+  }
   return fetcher<PaginatedRecentApplicationsResponse>(`/api/resumes/recent-applications/?${queryParams.toString()}`, {
     method: 'GET',
   });
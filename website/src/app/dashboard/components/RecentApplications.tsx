@@ -10,19 +10,20 @@ import { type RecentApplicationItem } from '@/types/applications'; // Import the
 const RecentApplications = () => {
     const [applications, setApplications] = useState<RecentApplicationItem[]>([]);
     const [isLoading, setIsLoading] = useState(true); // Start true, first load is in progress
-    const [page, setPage] = useState(1);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
     const [hasMore, setHasMore] = useState(false); // Initialize hasMore to false
 
-    const fetchApplications = useCallback(async (currentPage: number) => {
+    const fetchApplications = useCallback(async (cursor: string | null) => {
         setIsLoading(true); // Set loading true for any fetch operation
         try {
-            const response = await getRecentApplications(currentPage, 5);
-            setApplications(prev => currentPage === 1 ? response.results : [...prev, ...response.results]);
+            const response = await getRecentApplications(cursor, 5);
+            setApplications(prev => cursor === null ? response.results : [...prev, ...response.results]);
             setHasMore(response.next !== null);
+            setNextCursor(response.next ? new URL(response.next).searchParams.get('cursor') : null);
         } catch (error) {
             console.error("Error fetching recent applications:", error);
             setHasMore(false); // On error, assume no more data can be loaded
-            if (currentPage === 1) {
+            if (cursor === null) {
                 setApplications([]); // Clear applications on initial load error to show "No applications"
             }
             // Optionally, display an error message to the user here
@@ -34,15 +35,13 @@ const RecentApplications = () => {
     useEffect(() => {
         // isLoading is already true from initial useState(true)
         // fetchApplications will manage isLoading internally for its duration
-        fetchApplications(1); // Fetch initial page
+        fetchApplications(null); // Fetch initial page
     }, [fetchApplications]);
 
     const handleLoadMore = () => {
         // Button is only rendered if !isLoading && hasMore
-        if (hasMore) { // isLoading check is implicitly handled by button visibility
-            const nextPage = page + 1;
-            setPage(nextPage);
-            fetchApplications(nextPage);
+        if (hasMore && nextCursor) { // isLoading check is implicitly handled by button visibility
+            fetchApplications(nextCursor);
         }
     };
 
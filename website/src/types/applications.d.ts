@@ -15,8 +15,6 @@ export interface RecentApplicationItem {
 }
 
 export interface PaginatedRecentApplicationsResponse {
-  count: number;
-  next: string | null; // URL for the next page
-  previous: string | null; // URL for the previous page
+  next: string | null; // URL for the next page (carries the `cursor` query param)
   results: RecentApplicationItem[];
 } 
\ No newline at end of file